@@ -2,6 +2,8 @@
 
 from fastmcp import FastMCP
 from fastmcp.prompts.prompt import PromptMessage
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 import logging
 
 from prompts.twse_stock_trend_prompt import twse_stock_trend_prompt
@@ -15,6 +17,7 @@ from prompts.company_fundamental_healthcheck_prompt import company_fundamental_h
 from prompts.pre_trade_risk_scan_prompt import pre_trade_risk_scan_prompt
 from tools import register_all_tools
 from utils.api_client import TWSEAPIClient
+from utils.config import APIConfig
 
 # Configure logging (similar to .NET ILogger)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
@@ -27,6 +30,17 @@ mcp = FastMCP("TWSE Stock Trend Analysis 🚀")
 # This is the root of our Dependency Injection tree
 api_client = TWSEAPIClient()
 
+# Pre-open pooled keep-alive connections so the first tool call skips the TCP+TLS handshake
+if APIConfig.POOL_WARMUP:
+    api_client.warm_up(background=True)
+
+@mcp.custom_route("/stats", methods=["GET"])
+async def stats(request: Request) -> JSONResponse:
+    """Runtime client statistics for monitoring: connection pools, rate limits, single-flight
+    coalescing, the memory and disk caches, the security master, the quote store and the
+    snapshot archive."""
+    return JSONResponse(api_client.stats())
+
 # Register prompts
 @mcp.prompt
 def stock_trend_analysis_prompt(stock_symbol: str, period: str) -> PromptMessage:
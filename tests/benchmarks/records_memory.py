@@ -0,0 +1,119 @@
+"""Memory benchmark: cached OpenAPI lists as dicts vs compact records.
+
+Each dataset is loaded in a fresh subprocess per representation and the growth in
+resident set size (Linux ``VmRSS``) and in Python-allocated bytes (``tracemalloc``)
+is reported.
+
+    python -m tests.benchmarks.records_memory                 # live TWSE OpenAPI
+    python -m tests.benchmarks.records_memory --synthetic 20  # offline, 20x-sized copies
+
+The default endpoints are the largest cached lists: company profiles (t187ap03_L),
+the ESG disclosures (t187ap46_L_*) and warrants (t187ap37_L).
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tracemalloc
+
+DEFAULT_ENDPOINTS = [
+    "/opendata/t187ap03_L",
+    "/opendata/t187ap37_L",
+    *(f"/opendata/t187ap46_L_{i}" for i in range(1, 21)),
+]
+
+# Row shape used offline, modelled on the ESG disclosures (t187ap46_L_*): a report
+# date and year shared by every row, a unique code and name, then short figures,
+# "N/A" and yes/no answers that repeat across companies.
+SYNTHETIC_FIELDS = [
+    "出表日期", "報告年度", "公司代號", "公司名稱",
+    "範疇一排放量(公噸CO2e)", "範疇二排放量(公噸CO2e)", "範疇三排放量(公噸CO2e)", "溫室氣體排放密集度",
+    "使用率(再生能源)", "用水量(公噸)", "用水密集度", "有害廢棄物量(公噸)", "非有害廢棄物量(公噸)",
+    "總重量(有害+非有害)(公噸)", "廢棄物密集度", "員工福利平均數(仟元/人)", "員工薪資平均數(仟元/人)",
+    "非擔任主管職務之全時員工薪資平均數(仟元/人)", "女性主管占比(%)", "職業災害人數及比率-人數",
+    "職業災害人數及比率-比率(%)", "董事會席次(席)", "獨立董事席次(席)", "女性董事席次及比率-席",
+    "女性董事席次及比率-比率(%)", "董事出席董事會出席率(%)", "董監事進修時數符合進修要點比率(%)",
+    "資訊安全事件數", "是否取得第三方驗證", "揭露永續報告書",
+]
+
+
+def _rss_kib() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _synthetic_body(copies: int) -> bytes:
+    rng = random.Random(0)
+    rows = []
+    for i in range(1000 * copies):
+        row = {"出表日期": "1150617", "報告年度": "114", "公司代號": str(1101 + i), "公司名稱": f"公司{i}"}
+        for field in SYNTHETIC_FIELDS[4:-2]:
+            roll = rng.random()
+            row[field] = "N/A" if roll < 0.2 else ("0" if roll < 0.3 else f"{rng.randint(0, 10000) / 100:.2f}")
+        row["是否取得第三方驗證"] = rng.choice(("是", "否"))
+        row["揭露永續報告書"] = rng.choice(("是", "否"))
+        rows.append(row)
+    return json.dumps(rows, ensure_ascii=False).encode("utf-8")
+
+
+def _measure(mode: str, source: str) -> None:
+    """Child process: parse the bodies, keep the result alive and print the growth."""
+    from utils.records import RecordBuilder
+
+    if source.startswith("synthetic:"):
+        bodies = [_synthetic_body(int(source.split(":", 1)[1]))]
+    else:
+        from utils import TWSEAPIClient
+        client = TWSEAPIClient(request_interval=0.5)
+        bodies = [client.fetch_bytes(f"{client.base_url}{endpoint}") for endpoint in source.split(",")]
+
+    rss_before = _rss_kib()
+    tracemalloc.start()
+    kept = []
+    for body in bodies:
+        # Same decoding as TWSEAPIClient._parse_list with TWSE_COMPACT_ROWS on / off.
+        kept.append(json.loads(body, object_hook=RecordBuilder()) if mode == "records" else json.loads(body))
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(json.dumps({"rows": sum(len(k) for k in kept), "traced": traced, "rss_kib": _rss_kib() - rss_before}))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("endpoints", nargs="*", default=DEFAULT_ENDPOINTS)
+    parser.add_argument("--synthetic", type=int, metavar="N",
+                        help="measure N x 1,000 synthetic ESG-shaped rows instead of fetching")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "SOURCE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _measure(*args.child)
+        return 0
+
+    source = f"synthetic:{args.synthetic}" if args.synthetic else ",".join(args.endpoints)
+    results = {}
+    for mode in ("dicts", "records"):
+        out = subprocess.run([sys.executable, "-m", "tests.benchmarks.records_memory", "--child", mode, source],
+                             check=True, capture_output=True, text=True).stdout
+        results[mode] = json.loads(out.strip().splitlines()[-1])
+
+    dicts, records = results["dicts"], results["records"]
+    print(f"rows: {dicts['rows']:,}")
+    print(f"{'':10}{'dicts':>14}{'records':>14}{'saved':>8}")
+    for label, key, unit in (("traced", "traced", 1024 * 1024), ("RSS", "rss_kib", 1024)):
+        saved = 1 - records[key] / dicts[key] if dicts[key] else 0.0
+        print(f"{label:10}{dicts[key] / unit:>11.1f} MiB{records[key] / unit:>10.1f} MiB{saved:>8.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
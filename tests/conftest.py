@@ -38,3 +38,20 @@ def rate_limit_delay():
     if TEST_DELAY > 0:
         logging.info(f"Rate limiting: waiting {TEST_DELAY} seconds before next test")
         time.sleep(TEST_DELAY)
+
+@pytest.fixture
+def stub_server():
+    """本機 HTTP stub server，供不需連線上游的 client 測試使用."""
+    from tests.helpers import StubServer
+    with StubServer() as server:
+        yield server
+
+@pytest.fixture
+def make_client(stub_server):
+    """建立指向 stub server 的 TWSEAPIClient（預設不間隔請求），其餘參數原樣傳入."""
+    from utils.api_client import TWSEAPIClient
+
+    def make(**kwargs):
+        kwargs.setdefault("request_interval", 0.0)
+        return TWSEAPIClient(base_url=stub_server.url, **kwargs)
+    return make
@@ -13,7 +13,7 @@ class TestOTCDailyCloseAPI:
         result = fetch_or_skip(f"{TPEX_BASE}/tpex_mainboard_daily_close_quotes")
         assert isinstance(result, list) and len(result) > 0
         first = result[0]
-        required = ["SecuritiesCompanyCode", "CompanyName", "Close", "Change", "Open", "High", "Low", "TradingShares"]
+        required = ["Date", "SecuritiesCompanyCode", "CompanyName", "Close", "Change", "Open", "High", "Low", "TradingShares"]
         missing = [f for f in required if f not in first]
         assert not missing, (
             f"tpex_mainboard_daily_close_quotes removed fields that get_otc_daily uses.\n"
@@ -30,6 +30,7 @@ class TestOTCInstitutionalAPI:
         assert isinstance(result, list) and len(result) > 0
         first = result[0]
         required = [
+            "Date",
             "SecuritiesCompanyCode",
             "CompanyName",
             "ForeignInvestorsInclude MainlandAreaInvestors-Difference",
@@ -72,7 +73,7 @@ class TestOTCMarginBalanceAPI:
         assert isinstance(result, list) and len(result) > 0
         first = result[0]
         required = [
-            "SecuritiesCompanyCode", "CompanyName",
+            "Date", "SecuritiesCompanyCode", "CompanyName",
             "MarginPurchaseBalance", "ShortSaleBalance", "MarginPurchaseUtilizationRate",
         ]
         missing = [f for f in required if f not in first]
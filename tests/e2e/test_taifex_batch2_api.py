@@ -86,7 +86,7 @@ class TestInstitutionalTradersCallsPutsAPI:
 
 class TestOptionsDeltaAPI:
     """Tool get_options_delta 寫死的欄位：
-    Contract, CallPut, ContractMonth(Week), StrikePrice, Delta, ContractSettlementDay
+    Date, Contract, CallPut, ContractMonth(Week), StrikePrice, Delta, ContractSettlementDay
     """
 
     def test_hardcoded_fields_exist(self):
@@ -94,7 +94,7 @@ class TestOptionsDeltaAPI:
         assert isinstance(data, list) and len(data) > 0
         record = data[0]
         for field in [
-            "Contract", "CallPut", "ContractMonth(Week)",
+            "Date", "Contract", "CallPut", "ContractMonth(Week)",
             "StrikePrice", "Delta", "ContractSettlementDay",
         ]:
             assert field in record, f"缺少欄位: {field}"
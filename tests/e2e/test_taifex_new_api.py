@@ -157,14 +157,14 @@ def daily_options_delta():
 
 class TestOptionsDeltaAPI:
     """Tool get_options_delta 寫死的欄位：
-    Contract, CallPut, ContractMonth(Week), StrikePrice, Delta, ContractSettlementDay
+    Date, Contract, CallPut, ContractMonth(Week), StrikePrice, Delta, ContractSettlementDay
     """
 
     def test_hardcoded_fields_exist(self, daily_options_delta):
         assert isinstance(daily_options_delta, list) and len(daily_options_delta) > 0
         record = daily_options_delta[0]
         for field in [
-            "Contract", "CallPut", "ContractMonth(Week)",
+            "Date", "Contract", "CallPut", "ContractMonth(Week)",
             "StrikePrice", "Delta", "ContractSettlementDay",
         ]:
             assert field in record, f"缺少欄位: {field}"
@@ -1,6 +1,12 @@
-"""Shared test helpers for e2e API tests."""
+"""Shared test helpers for e2e API tests and offline client tests."""
 
+import asyncio
+import collections
+import http.server
+import inspect
 import json
+import threading
+import time
 import pytest
 import requests
 from utils.api_client import TWSEAPIClient
@@ -33,3 +39,99 @@ def fetch_or_skip(url: str, **kwargs):
         if not (getattr(e, "doc", None) or "").strip():
             pytest.skip(f"Upstream returned an empty body: {url} — {e}")
         raise
+
+
+class StubServer:
+    """Local HTTP server standing in for TWSE/TPEx/TAIFEX hosts in offline unit tests.
+
+    Routes are keyed by path (query string ignored). A route body may be bytes, a
+    JSON-serialisable object, or a callable ``(handler) -> (status, body, headers)``
+    for responses that depend on the request (the request body is on
+    ``handler.request_body``). Every request is counted in ``hits``
+    (by path), appended to ``log`` as ``(method, path_with_query, headers, body)`` and
+    its arrival ``time.monotonic()`` recorded in ``times``; ``peers`` holds the client
+    address of every connection a request arrived on.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.hits = collections.Counter()
+        self.log = []
+        self.times = []
+        self.peers = set()
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def route(self, path, body, status=200, headers=None, delay=0.0):
+        self.routes[path] = (body, status, headers or {}, delay)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handle(self, handler):
+        path = handler.path.split("?", 1)[0]
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        handler.request_body = body
+        with self._lock:
+            self.hits[path] += 1
+            self.times.append(time.monotonic())
+            self.peers.add(handler.client_address)
+            self.log.append((handler.command, handler.path, dict(handler.headers), body))
+
+        if path not in self.routes:
+            status, payload, headers, delay = 404, b"not found", {}, 0.0
+        else:
+            payload, status, headers, delay = self.routes[path]
+            if callable(payload):
+                status, payload, headers = payload(handler)
+        if delay:
+            time.sleep(delay)
+        if not isinstance(payload, (bytes, bytearray)):
+            payload = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        if handler.command != "HEAD":
+            handler.wfile.write(payload)
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub._handle(self)
+
+            do_POST = do_HEAD = do_GET
+
+            def log_message(self, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def tool_fn(mcp, name: str):
+    """Tool ``name``'s function, callable synchronously whether the tool is sync or async."""
+    fn = asyncio.run(mcp.get_tool(name)).fn
+
+    def call(*args, **kwargs):
+        result = fn(*args, **kwargs)
+        return asyncio.run(result) if inspect.isawaitable(result) else result
+
+    return call
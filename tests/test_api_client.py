@@ -0,0 +1,188 @@
+"""Offline tests for TWSEAPIClient, run against a local stub server (no upstream traffic)."""
+
+import asyncio
+import time
+
+from fastmcp import FastMCP
+
+import tools.company.financials as financials
+from tests.helpers import tool_fn
+from utils import create_async_company_tool, create_async_list_tool, create_company_tool
+from utils.indexes import NameIndex, build_code_index, build_statement_families
+
+
+COMPANIES = [
+    {"公司代號": "2330", "公司名稱": "台積電"},
+    {"公司代號": "2317", "公司名稱": "鴻海"},
+]
+
+
+def test_afetch_data_shares_cache_with_fetch_data(stub_server, make_client):
+    stub_server.route("/opendata/t187ap03_L", COMPANIES)
+    client = make_client()
+
+    async def run():
+        first = await client.afetch_data("/opendata/t187ap03_L")
+        await client.aclose()
+        return first
+
+    assert asyncio.run(run()) == COMPANIES
+    assert client.fetch_data("/opendata/t187ap03_L") == COMPANIES
+    assert stub_server.hits["/opendata/t187ap03_L"] == 1
+
+
+def test_afetch_json_and_bytes(stub_server, make_client):
+    stub_server.route("/json", {"stat": "OK"})
+    stub_server.route("/csv", "日期,契約\n".encode("big5"))
+    client = make_client()
+
+    async def run():
+        try:
+            return (
+                await client.afetch_json(f"{stub_server.url}/json", params={"date": "20260601"}),
+                await client.afetch_bytes(f"{stub_server.url}/csv", method="POST", data={"a": "1"}),
+            )
+        finally:
+            await client.aclose()
+
+    payload, body = asyncio.run(run())
+    assert payload == {"stat": "OK"}
+    assert body.decode("big5") == "日期,契約\n"
+    assert stub_server.log[-1][0] == "POST"
+
+
+def test_async_throttle_spaces_concurrent_requests(stub_server, make_client):
+    stub_server.route("/json", {"stat": "OK"})
+    client = make_client(request_interval=0.05)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            await asyncio.gather(*(client.afetch_json(f"{stub_server.url}/json", params={"i": i}) for i in range(5)))
+        finally:
+            await client.aclose()
+        return loop.time() - start
+
+    assert asyncio.run(run()) >= 0.2
+
+
+def test_async_factories(stub_server, make_client):
+    stub_server.route("/opendata/t187ap03_L", COMPANIES)
+    client = make_client()
+    mcp = FastMCP("test")
+
+    company_tool = create_async_company_tool(mcp, "/opendata/t187ap03_L", "get_profile", "doc", client)
+    list_tool = create_async_list_tool(
+        mcp, "/opendata/t187ap03_L", "list_profiles", "doc", "公司", "公司",
+        lambda i: f"- {i['公司名稱']}\n", filter_field="公司名稱", client=client,
+    )
+
+    async def run():
+        try:
+            return await company_tool("2317"), await list_tool(name="台積")
+        finally:
+            await client.aclose()
+
+    profile, listing = asyncio.run(run())
+    assert "鴻海" in profile
+    assert "台積電" in listing and "鴻海" not in listing
+
+
+def test_async_http_error_is_reported_by_decorator(stub_server, make_client):
+    client = make_client()
+    mcp = FastMCP("test")
+    tool = create_async_list_tool(mcp, "/missing", "missing", "doc", "x", "x", lambda i: "", client=client)
+
+    async def run():
+        try:
+            return await tool()
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()).startswith("查詢失敗")
+
+
+def test_company_lookup_uses_index_per_dataset_version(stub_server, monkeypatch, make_client):
+    rows = [
+        {"公司代號": "2330", "期別": "1"},
+        {"Code": "2317", "Name": "鴻海"},
+        {"公司代號": "2330", "期別": "2"},
+    ]
+    stub_server.route("/opendata/t187ap05_L", lambda handler: (200, rows, {}))
+    client = make_client(cache_ttl=0.05, max_staleness=0)
+    builds = []
+    monkeypatch.setattr("utils.api_client.build_code_index",
+                        lambda data: builds.append(1) or build_code_index(data))
+
+    assert [r["期別"] for r in client.fetch_company_rows("/opendata/t187ap05_L", "2330")] == ["1", "2"]
+    assert client.fetch_company_data("/opendata/t187ap05_L", "2317")["Name"] == "鴻海"
+    assert client.fetch_company_rows("/opendata/t187ap05_L", "9999") == []
+    assert len(builds) == 1
+
+    rows.append({"公司代號": "9999"})
+    time.sleep(0.1)
+    assert client.fetch_company_rows("/opendata/t187ap05_L", "9999") == [{"公司代號": "9999"}]
+    assert len(builds) == 2
+
+
+def test_name_index_matches_substring_scan():
+    names = ["台積電", "台灣積體", "台 積電", "積電台", "Apple Inc", "", None, "鴻海精密", "台積電"]
+    rows = [{"公司名稱": name} for name in names] + [{"公司代號": "2330"}]
+    index = NameIndex(rows, "公司名稱")
+
+    for needle in ["台積電", "台積", "積", "台", "電台", "pl", "Inc", "A", "海精密", "不存在", " ", ""]:
+        assert index.filter(needle) == NameIndex.scan(rows, "公司名稱", needle)
+    assert index.filter("") == rows
+    assert NameIndex([["2330", " 台積電 "], ["2317"]], 1).filter("積電") == [["2330", " 台積電 "]]
+
+
+def test_list_tool_name_filter_indexes_each_dataset_version_once(stub_server, make_client):
+    stub_server.route("/opendata/t187ap03_L", COMPANIES)
+    client = make_client()
+    data = client.fetch_data("/opendata/t187ap03_L")
+
+    assert client.filter_by_name(data, "公司名稱", "積") == [COMPANIES[0]]
+    index = client.dataset_index(data, "names:公司名稱", lambda _: None)
+    assert isinstance(index, NameIndex) and index.rows is data
+    # Objects that are not a cached response are scanned directly.
+    assert client.dataset_index(list(data), "names:公司名稱", lambda _: None) is None
+    assert client.filter_by_name(list(data), "公司名稱", "鴻") == [COMPANIES[1]]
+
+
+def test_statement_families_follow_profile_industry():
+    profiles = [
+        {"公司代號": "2330", "產業別": "半導體業"},
+        {"公司代號": "2881", "產業別": "金融保險業"},
+        {"公司代號": "2882", "產業別": "金控業"},
+        {"公司代號": "2330", "產業別": "金控業"},
+        {"公司代號": "6005", "產業別": None},
+    ]
+
+    assert build_statement_families(profiles) == {"2330": "_ci", "2881": "_ins", "2882": "_fh", "6005": "_ci"}
+    assert build_statement_families([{"公司代號": "5880", "產業別": "金融業"}]) == {"5880": "_basi"}
+
+
+def test_bulk_statement_tool_routes_each_company_to_its_family(stub_server, make_client):
+    stub_server.route("/opendata/t187ap03_L", [{"公司代號": "2330", "產業別": "半導體業"},
+                                               {"公司代號": "2882", "產業別": "金控業"}])
+    stub_server.route("/opendata/t187ap06_L_ci", [{"公司代號": "2330", "營業收入": "1"}])
+    stub_server.route("/opendata/t187ap06_L_fh", [{"公司代號": "2882", "利息淨收益": "2"}])
+    client = make_client()
+    mcp = FastMCP("test")
+    financials.register_tools(mcp, client)
+    tool = tool_fn(mcp, "get_companies_financial_statements")
+
+    output = tool(["2330", "2882"])
+    assert "營業收入: 1" in output and "利息淨收益: 2" in output
+    tool(["2882"])
+    assert stub_server.hits["/opendata/t187ap03_L"] == 1
+
+
+def test_company_tool_renders_every_matching_row(stub_server, make_client):
+    stub_server.route("/opendata/t187ap05_L", [{"公司代號": "2330", "期別": "1"}, {"公司代號": "2330", "期別": "2"}])
+    client = make_client()
+    tool = create_company_tool(FastMCP("test"), "/opendata/t187ap05_L", "get_rows", "doc", client)
+
+    output = tool("2330")
+    assert "期別: 1" in output and "期別: 2" in output
@@ -0,0 +1,99 @@
+"""Offline tests for the incremental history backfill."""
+
+from datetime import date
+
+from fastmcp import FastMCP
+
+import tools.history.all_stocks_daily_close as all_stocks_daily_close
+import tools.history.block_trades_detail as block_trades_detail
+import tools.history.foreign_holdings_history as foreign_holdings_history
+import tools.history.institutional as institutional
+import tools.history.institutional_amounts as institutional_amounts
+import tools.history.margin_balance as margin_balance
+import tools.history.short_sale_lending as short_sale_lending
+import tools.taifex.futures_daily_history as futures_daily_history
+import tools.taifex.put_call_ratio_history as put_call_ratio_history
+from tests.helpers import tool_fn
+from tests.test_taifex_range import fut_down
+from utils.backfill import Ledger, build_datasets, run
+from utils.disk_cache import DiskCache
+from utils.quote_store import QuoteStore
+
+TWSE_PATHS = {
+    all_stocks_daily_close: ("MI_INDEX_URL", "/rwd/zh/afterTrading/MI_INDEX"),
+    institutional: ("T86_URL", "/rwd/zh/fund/T86"),
+    margin_balance: ("MI_MARGN_URL", "/exchangeReport/MI_MARGN"),
+    short_sale_lending: ("TWT93U_URL", "/rwd/zh/marginTrading/TWT93U"),
+    foreign_holdings_history: ("MI_QFIIS_URL", "/rwd/zh/fund/MI_QFIIS"),
+    block_trades_detail: ("BFIAUU_URL", "/rwd/zh/block/BFIAUU"),
+    institutional_amounts: ("BFI82U_URL", "/rwd/zh/fund/BFI82U"),
+}
+
+
+def twse_report(handler):
+    # 2025-06-06 stands in for a typhoon closure: the report has no data.
+    if "20250606" in handler.path:
+        return 200, {"stat": "很抱歉，沒有符合條件的資料!"}, {}
+    return 200, {"stat": "OK", "tables": [{"title": "每日收盤行情", "data": [
+        ["2330", "台積電", "1,000", "10", "50,000", "100.00", "100.00", "100.00", "100.00",
+         "<p> </p>", "0.00", "", "", "", "", "10.00"]]}], "data": [["外資及陸資", "2,000", "1,000", "1,000"]]}, {}
+
+
+def pc_down(handler):
+    return 200, ("交易日期,賣權成交量\r\n2025/6/2,1\r\n2025/6/3,1\r\n2025/6/4,1\r\n2025/6/5,1\r\n").encode("big5"), {}
+
+
+def test_backfill_fills_caches_and_resumes(stub_server, monkeypatch, tmp_path, make_client):
+    for module, (name, path) in TWSE_PATHS.items():
+        stub_server.route(path, twse_report)
+        monkeypatch.setattr(module, name, f"{stub_server.url}{path}")
+    stub_server.route("/cht/3/futDataDown", fut_down)
+    stub_server.route("/cht/3/pcRatioDown", pc_down)
+    monkeypatch.setattr(futures_daily_history, "FUT_DATA_DOWN_URL", f"{stub_server.url}/cht/3/futDataDown")
+    monkeypatch.setattr(put_call_ratio_history, "PC_RATIO_DOWN_URL", f"{stub_server.url}/cht/3/pcRatioDown")
+
+    disk_path = str(tmp_path / "responses.sqlite3")
+    client = make_client(disk_cache=DiskCache(disk_path), quote_store=QuoteStore(str(tmp_path / "quotes")))
+    ledger = Ledger(str(tmp_path / "backfill.json"))
+    assert run(client, build_datasets(), ledger, date(2025, 6, 2), date(2025, 6, 6)) == 0
+
+    for _module, (_name, path) in TWSE_PATHS.items():
+        assert stub_server.hits[path] == 5
+    assert stub_server.hits["/cht/3/futDataDown"] == stub_server.hits["/cht/3/pcRatioDown"] == 1
+    assert ledger.done("T86")["20250606"] == "empty" and ledger.done("BFI82U")["20250605"] == "ok"
+    assert ledger.done("pcRatioDown") == {"20250602": "ok", "20250603": "ok", "20250604": "ok",
+                                          "20250605": "ok", "20250606": "empty"}
+    assert "20250607" not in ledger.done("T86")
+    assert client.quotes.days("tse") == ["20250602", "20250603", "20250604", "20250605"]
+
+    # Resume: a new run over a longer range only asks for the days after the ledger.
+    hits = dict(stub_server.hits)
+    resumed = Ledger(str(tmp_path / "backfill.json"))
+    assert run(client, build_datasets(), resumed, None, date(2025, 6, 9)) == 0
+    assert stub_server.hits["/rwd/zh/fund/T86"] == hits["/rwd/zh/fund/T86"] + 1
+    assert resumed.done("futDataDown:TX")["20250607"] == "empty" and "20250609" in resumed.done("futDataDown:TX")
+
+    # The tools now answer backfilled days from disk.
+    hits = dict(stub_server.hits)
+    fresh = make_client(disk_cache=DiskCache(disk_path))
+    mcp = FastMCP("test")
+    for module in (institutional_amounts, futures_daily_history):
+        module.register_tools(mcp, fresh)
+    assert "查無" not in tool_fn(mcp, "get_market_institutional_amounts_history")("20250603")
+    assert "2025/06/04" in tool_fn(mcp, "get_futures_daily_history")("20250602", "20250609")
+    assert all(stub_server.hits[path] == hits[path] for path in hits if path != "/holidaySchedule/holidaySchedule")
+
+
+def test_throttled_days_are_retried_not_recorded_empty(stub_server, make_client, monkeypatch, tmp_path):
+    def t86(handler):
+        if "20250603" in handler.path:
+            return 200, {"stat": "查詢過於頻繁，請稍後再試"}, {}
+        return twse_report(handler)
+    stub_server.route("/rwd/zh/fund/T86", t86)
+    monkeypatch.setattr(institutional, "T86_URL", f"{stub_server.url}/rwd/zh/fund/T86")
+    client = make_client(disk_cache=DiskCache(str(tmp_path / "responses.sqlite3")))
+    ledger = Ledger(str(tmp_path / "backfill.json"))
+    datasets = [d for d in build_datasets() if d.name == "T86"]
+
+    assert run(client, datasets, ledger, date(2025, 6, 2), date(2025, 6, 6)) == 1
+    assert ledger.done("T86") == {"20250602": "ok", "20250604": "ok", "20250605": "ok", "20250606": "empty"}
@@ -0,0 +1,204 @@
+"""Offline tests for the response cache behind fetch_data / fetch_json / fetch_bytes."""
+
+import asyncio
+import time
+from datetime import datetime
+
+from utils.cache import ResponseCache, TTLPolicy, estimate_size, parse_ttl_rules
+from utils.expiry import TAIPEI_TZ, ExpiryPolicy, TradingCalendar
+
+
+def test_fetch_json_is_cached_per_params(stub_server, make_client):
+    stub_server.route("/rwd/zh/fund/T86", {"stat": "OK"})
+    client = make_client()
+    url = f"{stub_server.url}/rwd/zh/fund/T86"
+
+    for _ in range(3):
+        client.fetch_json(url, params={"date": "20260601", "selectType": "ALL"})
+    client.fetch_json(url, params={"selectType": "ALL", "date": "20260601"})
+    client.fetch_json(url, params={"date": "20260602", "selectType": "ALL"})
+
+    assert stub_server.hits["/rwd/zh/fund/T86"] == 2
+
+
+def test_fetch_bytes_key_includes_method_and_form_data(stub_server, make_client):
+    stub_server.route("/futDataDown", b"csv")
+    client = make_client()
+    url = f"{stub_server.url}/futDataDown"
+
+    async def run():
+        try:
+            await client.afetch_bytes(url, method="POST", data={"commodity_id": "TX"})
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
+    client.fetch_bytes(url, method="POST", data={"commodity_id": "TX"})
+    client.fetch_bytes(url, method="POST", data={"commodity_id": "MTX"})
+    client.fetch_bytes(url, data={"commodity_id": "TX"})
+
+    assert stub_server.hits["/futDataDown"] == 3
+
+
+def test_cache_ttl_zero_disables_caching(stub_server, make_client):
+    stub_server.route("/json", {"stat": "OK"})
+    client = make_client(cache_ttl=0)
+
+    client.fetch_json(f"{stub_server.url}/json")
+    client.fetch_json(f"{stub_server.url}/json")
+
+    assert stub_server.hits["/json"] == 2
+    assert client.stats()["cache"]["entries"] == 0
+
+
+def test_ttl_policy_longest_match_wins():
+    policy = TTLPolicy(default_ttl=60, rules=parse_ttl_rules("taifex.com.tw=300,www.taifex.com.tw/cht/3=0,bad"))
+
+    assert policy.ttl_for("https://mis.twse.com.tw/stock/api/getStockInfo.jsp") == TTLPolicy.DEFAULT_RULES[0][1]
+    assert policy.ttl_for("https://openapi.taifex.com.tw/v1/x") == 300
+    assert policy.ttl_for("https://www.taifex.com.tw/cht/3/futDataDown") == 0
+    assert policy.ttl_for("https://www.twse.com.tw/rwd/zh/fund/T86") == 60
+
+
+def test_lru_eviction_keeps_within_budget():
+    row = {"公司代號": "2330", "公司名稱": "台積電", "收盤價": "1000.00"}
+    size = estimate_size([row] * 100)
+    cache = ResponseCache(stripes=4, max_bytes=size * 3, max_entry_bytes=0)
+
+    for key in "abc":
+        cache.set(key, [row] * 100)
+    cache.get("a")
+    cache.set("d", [row] * 100)
+
+    stats = cache.stats()
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in "acd")
+    assert stats["evictions"] == 1 and stats["entries"] == 3
+    assert stats["bytes"] <= stats["max_bytes"]
+
+
+def test_oversized_entry_is_not_cached():
+    cache = ResponseCache(max_bytes=0, max_entry_bytes=1024)
+
+    assert cache.set("small", b"x" * 100)
+    assert not cache.set("big", b"x" * 4096)
+    assert cache.get("big") is None
+    assert cache.stats()["rejected"] == 1
+
+    cache.pop("small")
+    assert cache.stats()["bytes"] == 0
+
+
+def _versioned(stub_server, path):
+    def body(handler):
+        return 200, [{"version": stub_server.hits[path]}], {}
+    stub_server.route(path, body)
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_stale_list_is_served_while_refreshing(stub_server, make_client):
+    _versioned(stub_server, "/opendata/t187ap03_L")
+    client = make_client(cache_ttl=0.05, max_staleness=10)
+
+    assert client.fetch_data("/opendata/t187ap03_L") == [{"version": 1}]
+    time.sleep(0.1)
+    assert client.fetch_data("/opendata/t187ap03_L") == [{"version": 1}]
+    assert _wait_for(lambda: client.stats()["cache"]["refreshing"] == 0 and stub_server.hits["/opendata/t187ap03_L"] == 2)
+    assert client.fetch_data("/opendata/t187ap03_L") == [{"version": 2}]
+    assert client.stats()["cache"]["stale_served"] == 1
+
+
+def test_async_stale_serve_and_staleness_bound(stub_server, make_client):
+    _versioned(stub_server, "/opendata/t187ap04_L")
+    client = make_client(cache_ttl=0.05, max_staleness=0.1)
+
+    async def run():
+        try:
+            first = await client.afetch_data("/opendata/t187ap04_L")
+            await asyncio.sleep(0.07)
+            stale = await client.afetch_data("/opendata/t187ap04_L")
+            _wait_for(lambda: client.stats()["cache"]["refreshing"] == 0)
+            await asyncio.sleep(0.2)
+            # Past ttl + max_staleness: fetched inline, not served stale.
+            fresh = await client.afetch_data("/opendata/t187ap04_L")
+            return first, stale, fresh
+        finally:
+            await client.aclose()
+
+    first, stale, fresh = asyncio.run(run())
+    assert first == stale == [{"version": 1}]
+    assert fresh == [{"version": 3}]
+
+
+def _taipei(*args) -> float:
+    return datetime(*args, tzinfo=TAIPEI_TZ).timestamp()
+
+
+def test_calendar_expiry_until_next_publication():
+    # 2026-06-19 is a Friday; pretend Monday 2026-06-22 is a market holiday.
+    calendar = TradingCalendar()
+    calendar.load([
+        {"Name": "端午節", "Date": "1150622", "Weekday": "一", "Description": "放假"},
+        {"Name": "端午節前最後交易日", "Date": "1150618", "Weekday": "四", "Description": ""},
+    ])
+    expiry = ExpiryPolicy(calendar)
+    policy = TTLPolicy(default_ttl=60, rules=[], expiry=expiry)
+    quotes = "https://openapi.twse.com.tw/v1/exchangeReport/STOCK_DAY_ALL"
+    mis = "https://mis.twse.com.tw/stock/api/getStockInfo.jsp"
+
+    # Friday evening: valid until Tuesday's publication window opens.
+    friday_night = _taipei(2026, 6, 19, 20, 0)
+    assert policy.ttl_for(quotes, friday_night) == _taipei(2026, 6, 23, 13, 30) - friday_night
+    # Inside the publication window: short default TTL, upstream may update any moment.
+    assert policy.ttl_for(quotes, _taipei(2026, 6, 23, 14, 0)) == 60
+    # Realtime quotes: short TTL in session, held overnight.
+    assert policy.ttl_for(mis, _taipei(2026, 6, 23, 10, 0)) == TTLPolicy.DEFAULT_RULES[0][1]
+    assert policy.ttl_for(mis, _taipei(2026, 6, 23, 20, 0)) == _taipei(2026, 6, 24, 8, 30) - _taipei(2026, 6, 23, 20, 0)
+    # Unknown endpoints keep the flat TTL; explicit overrides beat the calendar.
+    assert policy.ttl_for("https://openapi.twse.com.tw/v1/opendata/t187ap03_L", friday_night) == 60
+    assert TTLPolicy(default_ttl=60, rules=[("STOCK_DAY_ALL", 5)], expiry=expiry).ttl_for(quotes, friday_night) == 5
+
+
+def test_expired_entry_is_revalidated_with_etag(stub_server, make_client):
+    def body(handler):
+        if handler.headers.get("If-None-Match") == '"v1"':
+            return 304, b"", {"ETag": '"v1"'}
+        return 200, [{"公司代號": "2330"}], {"ETag": '"v1"'}
+    stub_server.route("/opendata/t187ap03_L", body)
+    client = make_client(cache_ttl=0.05, max_staleness=0)
+
+    first = client.fetch_data("/opendata/t187ap03_L")
+    time.sleep(0.1)
+
+    async def run():
+        try:
+            return await client.afetch_data("/opendata/t187ap03_L")
+        finally:
+            await client.aclose()
+
+    second = asyncio.run(run())
+    assert second is first
+    assert stub_server.log[-1][2].get("If-None-Match") == '"v1"'
+    assert client.stats()["cache"]["not_modified"] == 1
+
+
+def test_unchanged_body_without_validators_skips_parsing(stub_server, make_client):
+    payload = {"version": 1}
+    stub_server.route("/json", lambda handler: (200, dict(payload), {}))
+    client = make_client(cache_ttl=0.05)
+
+    first = client.fetch_json(f"{stub_server.url}/json")
+    time.sleep(0.1)
+    assert client.fetch_json(f"{stub_server.url}/json") is first
+    payload["version"] = 2
+    time.sleep(0.1)
+
+    assert client.fetch_json(f"{stub_server.url}/json") == {"version": 2}
+    assert client.stats()["cache"]["unchanged"] == 1
+    assert stub_server.hits["/json"] == 3
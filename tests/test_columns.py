@@ -0,0 +1,93 @@
+"""Offline tests for typed columnar tables and the tools ranking on them."""
+
+import math
+
+from fastmcp import FastMCP
+
+import tools.company.financials as financials
+import tools.history.institutional as institutional
+from tests.helpers import tool_fn
+from utils.columns import ColumnTable, parse_number
+
+
+def test_parse_number_handles_upstream_formats():
+    assert parse_number("1,234,567") == 1234567
+    assert parse_number(" +12.50 ") == 12.5
+    assert parse_number("-3,000") == -3000
+    for placeholder in ("--", "N/A", "", None, "台積電"):
+        assert parse_number(placeholder) is None
+
+
+def test_columns_are_typed_once_and_rank_with_missing_last():
+    rows = [
+        {"公司代號": "0050", "營業收入(百萬元)": "1,200", "毛利率(%)": "12.5"},
+        {"公司代號": "2330", "營業收入(百萬元)": "900", "毛利率(%)": "N/A"},
+        {"公司代號": "2317", "營業收入(百萬元)": "3,000", "毛利率(%)": "55.1"},
+    ]
+    table = ColumnTable(rows)
+
+    assert table.column("公司代號").kind == "text" and table.text("公司代號")[0] == "0050"
+    assert table.column("營業收入(百萬元)").kind == "int"
+    assert table.column("毛利率(%)").kind == "float" and math.isnan(table.numbers("毛利率(%)")[1])
+    assert table.rank("營業收入(百萬元)", descending=True) == [2, 0, 1]
+    assert table.rank("毛利率(%)") == [0, 2, 1]
+    assert table.rank("毛利率(%)", descending=True) == [2, 0, 1]
+    assert table.where("公司代號", lambda c: c.startswith("23")) == [1, 2]
+
+
+def test_t86_summary_ranks_on_parsed_columns(stub_server, monkeypatch, make_client):
+    def row(code, total):
+        return [code, f"名稱{code}"] + ["0"] * 16 + [total]
+    stub_server.route("/rwd/zh/fund/T86", {
+        "stat": "OK", "title": "T86",
+        "data": [row("1101", "1,000"), row("2330", "-25,000"), row("0050", "0"), ["00679B", "債券ETF"],
+                 row("2317", "3,000")],
+    })
+    monkeypatch.setattr(institutional, "T86_URL", f"{stub_server.url}/rwd/zh/fund/T86")
+    client = make_client()
+    mcp = FastMCP("test")
+    institutional.register_tools(mcp, client)
+    tool = tool_fn(mcp, "get_twse_institutional_investors_summary")
+
+    lines = [line for line in tool("20260605").splitlines()[1:] if line]
+    assert [line.split()[0] for line in lines] == ["2330", "2317", "1101"]
+    resp = client.fetch_json(institutional.T86_URL,
+                             params={"response": "json", "date": "20260605", "selectType": "ALL"})
+    assert client.columns(resp, rows=resp["data"]) is client.columns(resp, rows=resp["data"])
+
+
+def test_t86_summary_skips_blank_and_malformed_totals(stub_server, monkeypatch, make_client):
+    def row(code, total):
+        return [code, f"名稱{code}"] + ["0"] * 16 + [total]
+    stub_server.route("/rwd/zh/fund/T86", {
+        "stat": "OK", "title": "T86",
+        "data": [row("1101", "1,000"), row("2330", ""), row("2317", "-3,000"), row("2454", "暫停")],
+    })
+    monkeypatch.setattr(institutional, "T86_URL", f"{stub_server.url}/rwd/zh/fund/T86")
+    client = make_client()
+    mcp = FastMCP("test")
+    institutional.register_tools(mcp, client)
+
+    lines = [line for line in tool_fn(mcp, "get_twse_institutional_investors_summary")("20260605").splitlines()[1:]
+             if line]
+    assert [line.split()[0] for line in lines] == ["2317", "1101"]
+    table = ColumnTable([row("1101", "1,000"), row("2330", "")])
+    assert table.column(18).kind == "float" and math.isnan(table.numbers(18)[1])
+    table = ColumnTable([row("1101", "1,000"), row("2454", "暫停"), row("2317", "-3,000")])
+    assert table.column(18).kind == "text" and math.isnan(table.numbers(18)[1])
+    assert table.rank(18, numeric=True) == [2, 0, 1]
+
+
+def test_profitability_summary_sorts_numerically_despite_a_stray_cell(stub_server, make_client):
+    margin = "稅後純益率(%)(稅後純益)/(營業收入)"
+    stub_server.route("/opendata/t187ap17_L", [
+        {"公司代號": code, "公司名稱": f"名稱{code}", margin: value}
+        for code, value in (("1101", "12.5"), ("1102", "abc"), ("1103", "9.1"), ("1104", "100.2"))])
+    mcp = FastMCP("test")
+    financials.register_tools(mcp, make_client())
+    summary = tool_fn(mcp, "get_company_profitability_analysis_summary")
+
+    def codes(direction):
+        return [line.split()[1] for line in summary(order_direction=direction).splitlines() if line.startswith("- ")]
+    assert codes("desc") == ["1104", "1101", "1103", "1102"]
+    assert codes("asc") == ["1103", "1101", "1104", "1102"]
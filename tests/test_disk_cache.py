@@ -0,0 +1,74 @@
+"""Offline tests for the persistent cache of historical responses."""
+
+import asyncio
+from datetime import date
+
+from utils.disk_cache import DiskCache, is_historical
+from utils.expiry import taipei_today
+
+
+def test_is_historical_respects_report_period():
+    today = date(2026, 6, 15)
+    twse = "https://www.twse.com.tw"
+
+    assert is_historical(f"{twse}/rwd/zh/fund/T86", {"date": "20260614"}, today=today)
+    assert not is_historical(f"{twse}/rwd/zh/fund/T86", {"date": "20260615"}, today=today)
+    assert is_historical(f"{twse}/rwd/zh/fund/BFI82U", {"dayDate": "20260612", "type": "day"}, today=today)
+    assert not is_historical(f"{twse}/exchangeReport/STOCK_DAY", {"date": "20260601"}, today=today)
+    assert is_historical(f"{twse}/exchangeReport/STOCK_DAY", {"date": "20260531"}, today=today)
+    assert not is_historical(f"{twse}/rwd/zh/afterTrading/FMNPTK", {"date": "20200101"}, today=today)
+    assert not is_historical("https://www.tpex.org.tw/openapi/v1/tpex_index", today=today)
+    assert is_historical("https://www.taifex.com.tw/cht/3/futDataDown",
+                         data={"queryStartDate": "2026/05/01", "queryEndDate": "2026/05/29"}, today=today)
+
+
+def test_past_responses_survive_a_new_client(stub_server, tmp_path, make_client):
+    stub_server.route("/rwd/zh/fund/T86", {"stat": "OK", "data": [["2330", "台積電"]]})
+    stub_server.route("/cht/3/futDataDown", "交易日期,契約\n".encode("big5"))
+    path = str(tmp_path / "responses.sqlite3")
+    params = {"response": "json", "date": "20200102", "selectType": "ALL"}
+    form = {"commodity_id": "TX", "queryStartDate": "2020/01/02", "queryEndDate": "2020/01/31"}
+
+    first = make_client(disk_cache=DiskCache(path))
+    first.fetch_json(f"{stub_server.url}/rwd/zh/fund/T86", params=params)
+    first.fetch_bytes(f"{stub_server.url}/cht/3/futDataDown", method="POST", data=form)
+
+    second = make_client(disk_cache=DiskCache(path))
+
+    async def run():
+        try:
+            return await second.afetch_json(f"{stub_server.url}/rwd/zh/fund/T86", params=params)
+        finally:
+            await second.aclose()
+
+    assert asyncio.run(run())["data"] == [["2330", "台積電"]]
+    assert second.fetch_bytes(f"{stub_server.url}/cht/3/futDataDown", method="POST", data=form).decode("big5") == "交易日期,契約\n"
+    assert stub_server.hits["/rwd/zh/fund/T86"] == 1
+    assert stub_server.hits["/cht/3/futDataDown"] == 1
+    assert second.stats()["disk_cache"]["hits"] == 2
+
+
+def test_incomplete_and_current_responses_are_not_persisted(stub_server, tmp_path, make_client):
+    stub_server.route("/rwd/zh/fund/T86", {"stat": "很抱歉，沒有符合條件的資料!"})
+    stub_server.route("/rwd/zh/fund/BFI82U", {"stat": "OK"})
+    disk = DiskCache(str(tmp_path / "responses.sqlite3"))
+    client = make_client(disk_cache=disk)
+
+    client.fetch_json(f"{stub_server.url}/rwd/zh/fund/T86", params={"date": "20200102"})
+    client.fetch_json(f"{stub_server.url}/rwd/zh/fund/BFI82U", params={"date": taipei_today().strftime("%Y%m%d")})
+
+    assert disk.stats()["entries"] == 0
+
+
+def test_size_cap_evicts_least_recently_read(tmp_path):
+    entry_size = len(DiskCache._encode("bytes", b"a" * 100))
+    disk = DiskCache(str(tmp_path / "responses.sqlite3"), max_bytes=entry_size * 2)
+
+    disk.set("a", "bytes", b"a" * 100)
+    disk.set("b", "bytes", b"b" * 100)
+    disk.get("a")
+    disk.set("c", "bytes", b"c" * 100)
+
+    assert disk.get("b") is None
+    assert disk.get("a") == b"a" * 100 and disk.get("c") == b"c" * 100
+    assert disk.stats()["evictions"] == 1
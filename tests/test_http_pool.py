@@ -0,0 +1,82 @@
+"""Offline tests for the per-host keep-alive connection pools."""
+
+import asyncio
+import time
+
+import requests
+
+from utils.http_pool import HostPools, host_key
+
+
+def test_host_key():
+    assert host_key("https://www.twse.com.tw/rwd/zh/fund/T86?date=1") == "https://www.twse.com.tw"
+
+
+def test_sync_requests_reuse_one_connection(stub_server, make_client):
+    stub_server.route("/json", {"stat": "OK"})
+    client = make_client()
+
+    for i in range(5):
+        client.fetch_json(f"{stub_server.url}/json", params={"i": i})
+
+    stats = client.stats()["pools"][stub_server.url]
+    assert stats["requests"] == 5
+    assert stats["sessions_opened"] == 1 and stats["in_flight"] == 0
+    assert len(stub_server.peers) == 1
+
+
+def test_idle_session_is_recycled_and_closed_after_its_last_request(stub_server, monkeypatch):
+    closed = []
+    monkeypatch.setattr(requests.Session, "close", lambda self: closed.append(self))
+    pools = HostPools(idle_timeout=0.01)
+    with pools.lease(stub_server.url) as first:
+        time.sleep(0.05)
+        with pools.lease(stub_server.url) as second:
+            assert first is not second and closed == []
+        assert pools.stats()[stub_server.url]["in_flight"] == 0
+    assert closed == [first]
+
+    time.sleep(0.05)
+    with pools.lease(stub_server.url) as third:
+        assert closed == [first, second] and third is not second
+    stats = pools.stats()[stub_server.url]
+    assert (stats["idle_recycles"], stats["sessions_opened"], stats["requests"]) == (2, 3, 3)
+
+
+def test_async_client_is_shared_per_host(stub_server, make_client):
+    stub_server.route("/json", {"stat": "OK"})
+    client = make_client()
+
+    async def run():
+        try:
+            await asyncio.gather(*(client.afetch_json(f"{stub_server.url}/json", params={"i": i}) for i in range(3)))
+            return client.stats()["pools"][stub_server.url]
+        finally:
+            await client.aclose()
+
+    stats = asyncio.run(run())
+    assert stats["async_requests"] == 3
+    assert stats["async_clients"] == 1
+
+
+def test_async_clients_are_kept_per_loop_and_closed_with_it(stub_server):
+    stub_server.route("/json", {"stat": "OK"})
+    pools = HostPools()
+
+    async def use():
+        client = pools.async_client(stub_server.url)
+        await client.get(f"{stub_server.url}/json")
+        return client
+
+    first = asyncio.run(use())
+    assert first.is_closed  # asyncio.run shut its loop down without an explicit aclose()
+    second = asyncio.run(use())
+    assert second is not first and second.is_closed
+    assert pools.stats()[stub_server.url]["async_requests"] == 2
+
+
+def test_warm_up(stub_server):
+    pools = HostPools()
+    assert pools.warm_up([f"{stub_server.url}/anything"]) == {stub_server.url: True}
+    assert stub_server.log[-1][0] == "HEAD"
+    assert pools.warm_up(["http://127.0.0.1:1"], timeout=0.5) == {"http://127.0.0.1:1": False}
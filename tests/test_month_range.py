@@ -0,0 +1,81 @@
+"""Offline tests for multi-month range queries (get_stock_history and friends)."""
+
+import json
+import time
+from datetime import date
+from urllib.parse import parse_qs, urlsplit
+
+from fastmcp import FastMCP
+
+import tools.history.stock_day as stock_day
+import tools.history.stock_day_avg as stock_day_avg
+from tests.helpers import tool_fn
+from utils.month_range import check_range, month_starts
+
+
+def monthly(rows_by_month):
+    """Stub route answering STOCK_DAY-style requests by the month in ``date``."""
+    def handler(request):
+        month = parse_qs(urlsplit(request.path).query)["date"][0][:6]
+        rows = rows_by_month.get(month)
+        body = {"stat": "OK", "title": month, "data": rows} if rows else {"stat": "很抱歉，沒有符合條件的資料!"}
+        return 200, json.dumps(body, ensure_ascii=False).encode("utf-8"), {}
+    return handler
+
+
+def day_row(roc: str, close: str):
+    return [roc, "1,000", "50,000", close, close, close, close, "+0.50", "10"]
+
+
+def make_tool(module, name, stub_server, make_client, monkeypatch, attr, path):
+    monkeypatch.setattr(module, attr, f"{stub_server.url}{path}")
+    mcp = FastMCP("test")
+    module.register_tools(mcp, make_client())
+    return tool_fn(mcp, name)
+
+
+def test_month_starts_and_range_checks():
+    assert month_starts(date(2019, 11, 20), date(2020, 2, 3)) == [
+        date(2019, 11, 1), date(2019, 12, 1), date(2020, 1, 1), date(2020, 2, 1)]
+    assert check_range("20200101", "20200331")[0] == (date(2020, 1, 1), date(2020, 3, 31))
+    assert "不可晚於" in check_range("20200301", "20200101")[1]
+    assert "YYYYMMDD" in check_range("2020-01-01", "20200101")[1]
+    assert "36 個月" in check_range("20100101", "20200101")[1]
+
+
+def test_stock_history_range_merges_months_fetched_in_parallel(stub_server, make_client, monkeypatch):
+    stub_server.route("/exchangeReport/STOCK_DAY", monthly({
+        "202001": [day_row("109/01/02", "100"), day_row("109/01/20", "101")],
+        "202002": [day_row("109/02/03", "102"), day_row("109/02/03", "102"), day_row("109/02/27", "103")],
+        "202004": [day_row("109/04/01", "104"), day_row("109/04/30", "105")],
+    }), delay=0.2)
+    tool = make_tool(stock_day, "get_stock_history", stub_server, make_client, monkeypatch, "STOCK_DAY_URL",
+                     "/exchangeReport/STOCK_DAY")
+
+    started = time.perf_counter()
+    output = tool("2330", "20200115", "20200415")
+    assert time.perf_counter() - started < 0.6  # four months at 0.2 s each, fetched concurrently
+
+    dates = [line.split(" | ")[0].removeprefix("日期: ") for line in output.splitlines() if line.startswith("日期")]
+    assert dates == ["2020-01-20", "2020-02-03", "2020-02-27", "2020-04-01"]
+    assert "共 4 個交易日" in output and "查無資料的月份：2020-03" in output
+    assert stub_server.hits["/exchangeReport/STOCK_DAY"] == 4
+
+    # Months are cached individually: an overlapping range only fetches the new month.
+    tool("2330", "20200201", "20200531")
+    assert stub_server.hits["/exchangeReport/STOCK_DAY"] == 5
+
+
+def test_monthly_avg_range_keeps_each_months_summary(stub_server, make_client, monkeypatch):
+    stub_server.route("/exchangeReport/STOCK_DAY_AVG", monthly({
+        "202001": [["109/01/02", "100.00"], ["月平均收盤價", "100.50"]],
+        "202002": [["109/02/03", "102.00"], ["月平均收盤價", "102.50"]],
+    }))
+    tool = make_tool(stock_day_avg, "get_stock_monthly_avg_history", stub_server, make_client, monkeypatch,
+                     "STOCK_DAY_AVG_URL", "/exchangeReport/STOCK_DAY_AVG")
+
+    output = tool("2330", "20200101", "20200229")
+    assert "日期: 2020-01-02 | 收盤均價: 100.00" in output and "日期: 2020-02-03 | 收盤均價: 102.00" in output
+    assert "2020-01 月平均收盤價: 100.50" in output and "2020-02 月平均收盤價: 102.50" in output
+    # The single-month form is unchanged.
+    assert tool("2330", "20200101").splitlines()[0] == "【202001】"
@@ -0,0 +1,94 @@
+"""Offline tests for the local columnar daily quote store and its tools."""
+
+import math
+
+from fastmcp import FastMCP
+
+import tools.history.all_stocks_daily_close as all_stocks_daily_close
+import tools.history.local_quotes as local_quotes
+import tools.otc.daily_close as otc_daily_close
+from tests.helpers import tool_fn
+from utils.quote_store import Quote, QuoteStore, tpex_quotes, twse_quotes
+
+
+def mi_row(code, name, close, change, sign="+", volume="1,000", value="50,000"):
+    return [code, name, volume, "10", value, close, close, close, close,
+            f"<p style= color:red>{sign}</p>", change, "", "", "", "", "10.00"]
+
+
+def mi_index(rows):
+    return {"stat": "OK", "tables": [{"title": "價格指數"}, {"title": "115年06月01日 每日收盤行情(全部(不含權證、牛熊證))",
+                                                          "data": rows}]}
+
+
+def test_parsers_sign_changes_and_read_tpex_dates():
+    quotes = twse_quotes([mi_row("2330", "台積電", "1,085.00", "15.00", "-"), ["bad"]])
+    assert quotes == [Quote("2330", "台積電", 1085.0, 1085.0, 1085.0, 1085.0, -15.0, 1000.0, 50000.0)]
+    day, quotes = tpex_quotes([{"Date": "1150601", "SecuritiesCompanyCode": "6488", "CompanyName": "環球晶",
+                                "Close": "500.00", "Change": "+5.00", "TradingShares": "2,000", "Open": "---"}])
+    assert day == "20260601" and quotes[0].change == 5.0 and math.isnan(quotes[0].open)
+
+
+def test_append_is_idempotent_and_survives_reopen(tmp_path):
+    store = QuoteStore(str(tmp_path))
+    assert store.append("tse", "20260601", [Quote("2330", "台積電", close=100.0), Quote("2317", "鴻海", close=50.0)])
+    assert not store.append("tse", "20260601", [Quote("2330", "台積電", close=999.0)])
+    # A new listing widens the code axis; earlier days keep their values, NaN for the newcomer.
+    assert store.append("tse", "20260602", [Quote("2330", "台積電", close=110.0), Quote("1101", "台泥", close=30.0)])
+    assert store.append("tse", "20260701", [Quote("2330", "台積電", close=120.0)])
+
+    reopened = QuoteStore(str(tmp_path))
+    assert reopened.months("tse") == ["202606", "202607"]
+    assert reopened.days("tse", "20260602") == ["20260602", "20260701"]
+    assert [(d, q.close) for d, q in reopened.series("tse", "2330")] == [
+        ("20260601", 100.0), ("20260602", 110.0), ("20260701", 120.0)]
+    assert [d for d, _q in reopened.series("tse", "2317")] == ["20260601"]
+    day, codes, (close,) = next(reopened.rows("tse", "20260601", "20260601"))
+    assert codes == ["1101", "2317", "2330"] and math.isnan(close[0]) and list(close[1:]) == [50.0, 100.0]
+    assert reopened.has("tse", "20260602") and not reopened.has("otc", "20260602")
+
+
+def test_daily_close_tools_fill_the_store_and_local_tools_answer(stub_server, monkeypatch, tmp_path, make_client):
+    days = {"20260601": [mi_row("2330", "台積電", "100.00", "0.00", " "), mi_row("2317", "鴻海", "50.00", "0.00", " ")],
+            "20260602": [mi_row("2330", "台積電", "110.00", "10.00"), mi_row("2317", "鴻海", "45.00", "5.00", "-")]}
+
+    def mi_index_route(handler):
+        date = handler.path.split("date=", 1)[1].split("&", 1)[0]
+        return 200, mi_index(days[date]), {}
+
+    stub_server.route("/rwd/zh/afterTrading/MI_INDEX", mi_index_route)
+    stub_server.route("/openapi/v1/tpex_mainboard_daily_close_quotes", [
+        {"Date": "1150602", "SecuritiesCompanyCode": "6488", "CompanyName": "環球晶", "Close": "500.00",
+         "Change": "+25.00", "TradingShares": "1,000", "TransactionAmount": "500,000"}])
+    monkeypatch.setattr(all_stocks_daily_close, "MI_INDEX_URL", f"{stub_server.url}/rwd/zh/afterTrading/MI_INDEX")
+    monkeypatch.setattr(otc_daily_close, "TPEX_DAILY_CLOSE_URL",
+                        f"{stub_server.url}/openapi/v1/tpex_mainboard_daily_close_quotes")
+    client = make_client(quote_store=QuoteStore(str(tmp_path)))
+    mcp = FastMCP("test")
+    for module in (all_stocks_daily_close, otc_daily_close, local_quotes):
+        module.register_tools(mcp, client)
+
+    def tool(name):
+        return tool_fn(mcp, name)
+
+    tool("get_all_stocks_daily_close")("20260601")
+    tool("get_all_stocks_daily_close")("20260602")
+    tool("get_otc_daily")()
+    hits = dict(stub_server.hits)
+
+    ranking = tool("rank_local_quotes")("20260601", "20260602")
+    assert ranking.index("2330 台積電 | 區間漲跌幅: +10.00%") < ranking.index("2317 鴻海 | 區間漲跌幅: -10.00%")
+    assert "已保存 2 個交易日、2 檔" in ranking
+    losers = tool("rank_local_quotes")("20260602", metric="return", ascending=True, limit=1)
+    assert "2317 鴻海" in losers and "2330" not in losers.split("\n", 1)[1]
+    assert "環球晶" in tool("rank_local_quotes")("20260602", market="otc", metric="value")
+
+    history = tool("get_local_quote_history")("6488")
+    assert "上櫃" in history and "區間漲跌幅: +5.26%" in history
+    assert "共 2 個交易日" in tool("get_local_quote_history")("2330", "20260601", "20260630")
+    assert "上市（tse）：共 2 個交易日" in tool("get_local_quote_coverage")()
+    assert dict(stub_server.hits) == hits  # answered locally
+
+    disabled = FastMCP("disabled")
+    local_quotes.register_tools(disabled, make_client())
+    assert "TWSE_QUOTE_STORE_PATH" in tool_fn(disabled, "get_local_quote_coverage")()
@@ -0,0 +1,52 @@
+"""Offline tests for the per-host token-bucket rate limiter."""
+
+import asyncio
+import time
+
+from utils.rate_limit import RateLimiter, TokenBucket, parse_rate_limits
+
+
+def test_parse_rate_limits():
+    assert parse_rate_limits("www.taifex.com.tw=0.5:2, mis.twse.com.tw=4 ,bad") == {
+        "www.taifex.com.tw": (0.5, 2.0),
+        "mis.twse.com.tw": (4.0, 1.0),
+    }
+
+
+def test_bucket_allows_burst_then_spaces_requests():
+    bucket = TokenBucket(rate=20, burst=3)
+    waits = [bucket.reserve() for _ in range(5)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert 0.04 <= waits[3] <= 0.06
+    assert 0.09 <= waits[4] <= 0.11
+
+
+def test_hosts_are_limited_independently():
+    limiter = RateLimiter(request_interval=10.0, limits={})
+    start = time.monotonic()
+    limiter.acquire("https://www.taifex.com.tw/cht/3/futDataDown")
+    limiter.acquire("https://www.tpex.org.tw/openapi/v1/x")
+    limiter.acquire("https://mis.twse.com.tw/stock/api/getStockInfo.jsp")
+    assert time.monotonic() - start < 1.0
+    assert set(limiter.stats()) == {"www.taifex.com.tw", "www.tpex.org.tw", "mis.twse.com.tw"}
+
+
+def test_path_groups_use_longest_prefix():
+    limiter = RateLimiter(limits={"www.twse.com.tw": (1, 1), "www.twse.com.tw/rwd": (2, 2)})
+    assert limiter.group_for("https://www.twse.com.tw/rwd/zh/fund/T86") == "www.twse.com.tw/rwd"
+    assert limiter.group_for("https://www.twse.com.tw/rwdx") == "www.twse.com.tw"
+    assert limiter.group_for("https://www.twse.com.tw/exchangeReport/STOCK_DAY") == "www.twse.com.tw"
+    assert limiter.bucket_for("https://www.twse.com.tw/rwd/zh").burst == 2
+
+
+def test_queue_depth_metrics():
+    limiter = RateLimiter(limits={"a.example": (50, 1)})
+
+    async def run():
+        await asyncio.gather(*(limiter.aacquire("https://a.example/x") for _ in range(5)))
+
+    asyncio.run(run())
+    stats = limiter.stats()["a.example"]
+    assert stats["acquired"] == 5
+    assert stats["max_queue_depth"] == 4
+    assert stats["queue_depth"] == 0
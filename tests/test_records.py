@@ -0,0 +1,47 @@
+"""Offline tests for compact schema-backed rows."""
+
+import json
+import pickle
+
+from utils.cache import estimate_size
+from utils.formatters import filter_meaningful_fields, format_multiple_records
+from utils.records import Record, RecordBuilder, compact_rows
+
+ROWS = [
+    {"公司代號": "2330", "公司名稱": "台積電", "產業別": "24", "備註": "N/A"},
+    {"公司代號": "2317", "公司名稱": "鴻海", "產業別": "31", "備註": "N/A"},
+]
+
+
+def test_records_behave_like_read_only_dicts():
+    records = json.loads(json.dumps(ROWS, ensure_ascii=False), object_hook=RecordBuilder())
+
+    assert all(isinstance(r, Record) for r in records)
+    assert records == ROWS and records[0] == ROWS[0]
+    first = records[0]
+    assert first["公司名稱"] == "台積電" and first.get("缺少", "-") == "-" and "產業別" in first
+    assert list(first) == list(ROWS[0]) and dict(first.items()) == ROWS[0]
+    assert first.copy() == ROWS[0] and type(first.copy()) is dict
+    assert pickle.loads(pickle.dumps(first)) == first
+    # Rows with the same fields share one schema; equal strings are stored once.
+    assert records[0]._schema is records[1]._schema
+    assert records[0]["備註"] is records[1]["備註"]
+
+
+def test_compact_rows_keeps_non_dict_items():
+    assert compact_rows([ROWS[0], "x", 3]) == [ROWS[0], "x", 3]
+
+
+def test_records_are_smaller_than_dicts():
+    assert estimate_size(compact_rows(ROWS)) < estimate_size(ROWS)
+
+
+def test_fetch_data_returns_records_that_format_like_dicts(stub_server, make_client):
+    stub_server.route("/opendata/t187ap03_L", ROWS)
+    client = make_client()
+
+    data = client.fetch_data("/opendata/t187ap03_L")
+    assert isinstance(data[0], Record) and data == ROWS
+    assert format_multiple_records(data) == format_multiple_records(ROWS)
+    assert filter_meaningful_fields(data[0]) == filter_meaningful_fields(ROWS[0])
+    assert client.fetch_company_data("/opendata/t187ap03_L", "2317") == ROWS[1]
@@ -0,0 +1,59 @@
+"""Offline tests for the TWSE + TPEx security master and market routing."""
+
+from fastmcp import FastMCP
+
+import tools.realtime.stock_info as stock_info
+from tests.helpers import tool_fn
+from utils.security_master import SOURCES, Security, SecurityMaster, build_securities
+
+LISTS = {
+    "/opendata/t187ap03_L": [{"公司代號": "2330", "公司簡稱": "台積電", "產業別": "24"}],
+    "/exchangeReport/STOCK_DAY_ALL": [{"Code": "2330", "Name": "台積電"}, {"Code": "0050", "Name": "元大台灣50"}],
+    "/opendata/t187ap37_L": [{"權證代號": "030001", "權證簡稱": "台積電元大01購01"}],
+    SOURCES[3].url: [{"SecuritiesCompanyCode": "6547", "CompanyAbbreviation": "高端疫苗",
+                      "SecuritiesIndustryCode": "22"}],
+    SOURCES[4].url: [{"SecuritiesCompanyCode": "6547", "CompanyName": "高端疫苗"},
+                     {"SecuritiesCompanyCode": "006201", "CompanyName": "元大富櫃50"}],
+}
+
+
+def fetch(url):
+    if url == "/opendata/t187ap37_L":
+        raise ConnectionError("warrant list unavailable")
+    return LISTS[url]
+
+
+def test_master_merges_markets_and_persists(tmp_path):
+    path = str(tmp_path / "securities.json")
+    master = SecurityMaster(path)
+    master.refresh(fetch)
+
+    assert master.get("2330") == Security("2330", "tse", "台積電", "24", "stock")
+    assert master.get("0050") == Security("0050", "tse", "元大台灣50", "", "etf")
+    assert master.get("6547") == Security("6547", "otc", "高端疫苗", "22", "stock")
+    assert master.get("006201").market == "otc" and master.get("006201").type == "etf"
+    # A failing source is skipped; the rest still load.
+    assert master.get("030001") is None
+    assert build_securities([(SOURCES[2], LISTS["/opendata/t187ap37_L"])])["030001"].type == "warrant"
+
+    restored = SecurityMaster(path)
+    assert len(restored) == len(master) == 4
+    assert restored.get(" 6547 ") == master.get("6547")
+
+
+def test_realtime_quote_routes_otc_symbols_on_first_request(stub_server, monkeypatch, make_client):
+    def body(handler):
+        return 200, {"msgArray": [{"c": "6547", "n": "高端疫苗", "ex": "otc", "z": "40.0", "y": "41.0"}]}, {}
+    stub_server.route("/stock/api/getStockInfo.jsp", body)
+    monkeypatch.setattr(stock_info, "MIS_URL", f"{stub_server.url}/stock/api/getStockInfo.jsp")
+    master = SecurityMaster()
+    master.load({"6547": Security("6547", "otc", "高端疫苗")})
+    client = make_client(securities=master)
+
+    mcp = FastMCP("test")
+    stock_info.register_tools(mcp, client)
+    output = tool_fn(mcp, "get_realtime_quote")(["6547"])
+
+    assert "6547 高端疫苗 [上櫃]" in output
+    assert stub_server.hits["/stock/api/getStockInfo.jsp"] == 1
+    assert "otc_6547.tw" in stub_server.log[0][1]
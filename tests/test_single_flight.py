@@ -0,0 +1,113 @@
+"""Offline tests for single-flight coalescing of identical upstream requests."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from utils.single_flight import SingleFlight
+
+
+def test_sync_callers_share_one_request(stub_server, make_client):
+    stub_server.route("/fund/T86", {"stat": "OK"}, delay=0.2)
+    client = make_client(cache_ttl=0)
+    url = f"{stub_server.url}/fund/T86"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: client.fetch_json(url, params={"date": "20260505"}), range(8)))
+
+    assert results == [{"stat": "OK"}] * 8
+    assert stub_server.hits["/fund/T86"] == 1
+    assert client.stats()["single_flight"]["coalesced"] == 7
+
+
+def test_different_params_are_not_coalesced(stub_server, make_client):
+    stub_server.route("/fund/T86", {"stat": "OK"}, delay=0.1)
+    client = make_client(cache_ttl=0)
+    url = f"{stub_server.url}/fund/T86"
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(lambda d: client.fetch_json(url, params={"date": d}), ["20260504", "20260505"]))
+
+    assert stub_server.hits["/fund/T86"] == 2
+
+
+def test_async_and_sync_callers_share_one_request(stub_server, make_client):
+    stub_server.route("/opendata/t187ap03_L", [{"公司代號": "2330"}], delay=0.2)
+    client = make_client()
+
+    async def run():
+        thread = threading.Thread(target=client.fetch_data, args=("/opendata/t187ap03_L",))
+        try:
+            results = await asyncio.gather(*(client.afetch_data("/opendata/t187ap03_L") for _ in range(5)))
+            thread.start()
+            thread.join()
+            return results
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == [[{"公司代號": "2330"}]] * 5
+    assert stub_server.hits["/opendata/t187ap03_L"] == 1
+
+
+def test_leader_error_is_shared_with_followers(stub_server, make_client):
+    stub_server.route("/broken", b"oops", status=503, delay=0.2)
+    client = make_client(cache_ttl=0)
+
+    def call(_):
+        with pytest.raises(requests.HTTPError):
+            client.fetch_json(f"{stub_server.url}/broken")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(call, range(4)))
+    assert stub_server.hits["/broken"] == 1
+
+
+def test_sync_caller_on_loop_does_not_wait_for_async_leader_on_same_loop():
+    flight = SingleFlight()
+
+    async def run():
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "async"
+
+        leader = asyncio.create_task(flight.ado("k", slow))
+        await asyncio.sleep(0)
+        # Would deadlock if the sync call waited for the leader on this loop.
+        assert flight.do("k", lambda: "sync") == "sync"
+        release.set()
+        return await leader
+
+    assert asyncio.run(run()) == "async"
+
+
+def test_cancelled_leader_hands_over_to_a_follower():
+    flight = SingleFlight()
+    calls = []
+
+    async def run():
+        release = asyncio.Event()
+
+        async def fetch():
+            calls.append(len(calls))
+            await release.wait()
+            return f"result {len(calls)}"
+
+        leader = asyncio.create_task(flight.ado("k", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.ado("k", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    # The follower is not cancelled: it becomes the new leader and fetches itself.
+    assert asyncio.run(run()) == "result 2"
+    assert calls == [0, 1] and flight.stats()["in_flight"] == 0
@@ -0,0 +1,91 @@
+"""Offline tests for the dated archive of latest-only datasets."""
+
+from fastmcp import FastMCP
+
+import tools.otc.institutional as otc_institutional
+import tools.taifex.daily_market_report as daily_market_report
+import tools.trading.valuation as valuation
+from tests.helpers import tool_fn
+from utils import APIConfig
+from utils.records import Record
+from utils.snapshots import SNAPSHOTS_DISABLED, SnapshotArchive, snapshot_day
+
+
+def insti_rows(day, net):
+    return [{"Date": day, "SecuritiesCompanyCode": "6488", "CompanyName": "環球晶", "TotalDifference": net},
+            {"Date": day, "SecuritiesCompanyCode": "8299", "CompanyName": "群聯", "TotalDifference": "0"}]
+
+
+def test_capture_dedupes_by_day_and_content(tmp_path):
+    assert snapshot_day("1150601") == snapshot_day("115/06/01") == snapshot_day("2026-06-01") == "20260601"
+    assert snapshot_day("1150231") is None and snapshot_day("?") is None
+
+    path = str(tmp_path / "snapshots.sqlite3")
+    archive = SnapshotArchive(path)
+    first = insti_rows("1150601", "1,000")
+    assert archive.capture("tpex_3insti_daily_trading", first) == "20260601"
+    assert archive.capture("tpex_3insti_daily_trading", [dict(r) for r in first]) == "20260601"
+    # An upstream correction replaces the day; the same payload under another name is stored once.
+    assert archive.capture("tpex_3insti_daily_trading", insti_rows("1150601", "2,000")) == "20260601"
+    assert archive.capture("copy", insti_rows("1150601", "2,000")) == "20260601"
+    assert archive.capture("tpex_3insti_daily_trading", [{"Code": "no date"}]) is None
+    stats = archive.stats()
+    assert (stats["captured"], stats["unchanged"], stats["payloads"]) == (3, 1, 1)
+
+    reopened = SnapshotArchive(path)
+    assert reopened.days("tpex_3insti_daily_trading") == ["20260601"]
+    assert reopened.get("tpex_3insti_daily_trading", "20260601") == insti_rows("1150601", "2,000")
+    assert reopened.get("tpex_3insti_daily_trading", "20260602") is None
+
+
+def test_tools_answer_past_dates_from_snapshots(stub_server, monkeypatch, tmp_path, make_client):
+    live = {"insti": insti_rows("1150601", "1,000"),
+            "fut": [{"Date": "20260601", "Contract": "TX", "ContractMonth(Week)": "202606", "Last": "22000"}]}
+    stub_server.route("/openapi/v1/tpex_3insti_daily_trading", lambda handler: (200, live["insti"], {}))
+    stub_server.route("/v1/DailyMarketReportFut", lambda handler: (200, live["fut"], {}))
+    monkeypatch.setattr(otc_institutional, "TPEX_3INSTI_URL", f"{stub_server.url}/openapi/v1/tpex_3insti_daily_trading")
+    monkeypatch.setattr(daily_market_report, "TAIFEX_FUT_REPORT_URL", f"{stub_server.url}/v1/DailyMarketReportFut")
+    client = make_client(cache_ttl=0, snapshots=SnapshotArchive(str(tmp_path / "snapshots.sqlite3")))
+    mcp = FastMCP("test")
+    for module in (otc_institutional, daily_market_report):
+        module.register_tools(mcp, client)
+
+    def tool(name):
+        return tool_fn(mcp, name)
+
+    assert "合計: 1,000" in tool("get_otc_institutional")("6488")
+    tool("get_daily_futures_market_report")()
+    live["insti"] = insti_rows("1150602", "-500")
+    live["fut"] = [{**live["fut"][0], "Date": "20260602", "Last": "22100"}]
+
+    # The next day's lists are fetched live and captured; the earlier day comes from the archive.
+    assert "合計: -500" in tool("get_otc_institutional")("6488", date="20260602")
+    hits = dict(stub_server.hits)
+    assert "合計: 1,000" in tool("get_otc_institutional")("6488", date="20260601")
+    report = tool("get_daily_futures_market_report")("TX", date="20260601")
+    assert "20260601" in report and "收:22000" in report
+    missing = tool("get_otc_institutional")(date="20260529")
+    assert "20260529" in missing and "20260601、20260602" in missing
+    assert dict(stub_server.hits) == hits
+
+    disabled = FastMCP("disabled")
+    otc_institutional.register_tools(disabled, make_client())
+    assert tool_fn(disabled, "get_otc_institutional")(date="20260601") == SNAPSHOTS_DISABLED
+
+
+def test_record_rows_from_fetch_data_are_captured(stub_server, monkeypatch, tmp_path, make_client):
+    monkeypatch.setattr(APIConfig, "COMPACT_ROWS", True)
+    live = {"rows": [{"Date": "1150601", "Code": "2330", "Name": "台積電", "PEratio": "20.00",
+                      "DividendYield": "1.50", "PBratio": "6.00"}]}
+    stub_server.route("/exchangeReport/BWIBBU_ALL", lambda handler: (200, live["rows"], {}))
+    client = make_client(cache_ttl=0, snapshots=SnapshotArchive(str(tmp_path / "snapshots.sqlite3")))
+    assert isinstance(client.fetch_data("/exchangeReport/BWIBBU_ALL")[0], Record)
+    mcp = FastMCP("test")
+    valuation.register_tools(mcp, client)
+    ratios = tool_fn(mcp, "get_stock_valuation_ratios")
+
+    assert "本益比 (P/E): 20.00" in ratios("2330")
+    assert client.snapshots.days("BWIBBU_ALL") == ["20260601"]
+    live["rows"] = [{**live["rows"][0], "Date": "1150602", "PEratio": "21.00"}]
+    assert "本益比 (P/E): 21.00" in ratios("2330")
+    assert "本益比 (P/E): 20.00" in ratios("2330", date="20260601")
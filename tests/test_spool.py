@@ -0,0 +1,83 @@
+"""Offline tests for spooled (streamed, memory-mapped) download bodies."""
+
+import asyncio
+import mmap
+import zlib
+
+import pytest
+
+from tools.taifex.futures_daily_history import decode_and_parse_csv
+from utils.cache import estimate_size
+from utils.disk_cache import DiskCache
+from utils.spool import BodyTooLarge, chunks_of, deflate, inflate, spool
+
+
+def csv_body(rows: int) -> bytes:
+    lines = ["交易日期,契約,到期月份(週別)"] + [f"2020/01/02,TX,2020{i % 12 + 1:02d}" for i in range(rows)]
+    return "\r\n".join(lines).encode("big5")
+
+
+def test_spool_keeps_small_bodies_in_memory_and_maps_large_ones():
+    assert spool([b"ab", b"", b"c"], memory_limit=8) == b"abc"
+
+    body = spool(chunks_of(b"x" * 100, 7), memory_limit=16)
+    assert isinstance(body, mmap.mmap) and len(body) == 100 and body[:] == b"x" * 100
+
+    with pytest.raises(BodyTooLarge):
+        spool(chunks_of(b"x" * 100, 7), max_bytes=50)
+
+
+def test_inflate_streams_a_zlib_body():
+    raw = csv_body(5000)
+    assert b"".join(inflate(zlib.compress(raw), size=1000)) == raw
+
+
+def test_deflate_compresses_a_mapped_body_chunk_by_chunk():
+    raw = csv_body(5000)
+    body = spool(chunks_of(raw, 4096), memory_limit=1024)
+    assert isinstance(body, mmap.mmap)
+    assert zlib.decompress(deflate(body, size=1000)) == raw
+    assert b"".join(inflate(deflate(chunks_of(raw, 333)))) == raw
+
+
+def test_fetch_spooled_maps_large_downloads_and_caches_them(stub_server, make_client):
+    raw = csv_body(200_000)  # ~4.6 MB, past the 1 MiB in-memory limit
+    stub_server.route("/cht/3/optDataDown", raw)
+    client = make_client()
+    url = f"{stub_server.url}/cht/3/optDataDown"
+
+    body = client.fetch_spooled(url, method="POST", data={"commodity_id": "TXO"})
+    assert isinstance(body, mmap.mmap) and body[:] == raw
+    assert estimate_size(body) >= len(raw)
+    header, rows = decode_and_parse_csv(body)
+    assert header[0] == "交易日期" and len(rows) == 200_000
+
+    assert client.fetch_spooled(url, method="POST", data={"commodity_id": "TXO"}) is body
+    assert asyncio.run(client.afetch_spooled(url, method="POST", data={"commodity_id": "TXO"})) is body
+    assert stub_server.hits["/cht/3/optDataDown"] == 1
+
+
+def test_async_fetch_spooled_and_max_body_guard(stub_server, make_client):
+    stub_server.route("/cht/3/futDataDown", csv_body(10))
+    client = make_client()
+    url = f"{stub_server.url}/cht/3/futDataDown"
+
+    assert asyncio.run(client.afetch_spooled(url, data={"commodity_id": "TX"})) == csv_body(10)
+    with pytest.raises(BodyTooLarge):
+        client.fetch_spooled(url, data={"commodity_id": "MTX"}, max_bytes=64)
+    with pytest.raises(BodyTooLarge):
+        asyncio.run(client.afetch_spooled(url, data={"commodity_id": "TE"}, max_bytes=64))
+
+
+def test_spooled_bodies_persist_in_the_disk_cache(stub_server, tmp_path, make_client):
+    raw = csv_body(100_000)
+    stub_server.route("/cht/3/futDataDown", raw)
+    path = str(tmp_path / "responses.sqlite3")
+    form = {"commodity_id": "TX", "queryStartDate": "2020/01/02", "queryEndDate": "2020/01/31"}
+    url = f"{stub_server.url}/cht/3/futDataDown"
+
+    make_client(disk_cache=DiskCache(path)).fetch_spooled(
+        url, method="POST", data=form)
+    second = make_client(disk_cache=DiskCache(path))
+    assert second.fetch_spooled(url, method="POST", data=form)[:] == raw
+    assert stub_server.hits["/cht/3/futDataDown"] == 1
@@ -0,0 +1,70 @@
+"""Offline tests for the streaming TAIFEX Big5 CSV parser and the tools using it."""
+
+from fastmcp import FastMCP
+
+import tools.taifex.options_daily_history as options_daily_history
+from tools.taifex.futures_daily_history import decode_and_parse_csv, iter_csv, match_columns
+from tests.helpers import tool_fn
+
+HEADER = "交易日期,契約,到期月份(週別),履約價,買賣權,開盤價,最高價,最低價,收盤價,成交量,結算價,未沖銷契約數," \
+         "最後最佳買價,最後最佳賣價,歷史最高價,歷史最低價,是否因訊息面暫停交易,交易時段,"
+
+
+def opt_row(month: str, strike: int, cp: str, session: str = "一般") -> str:
+    return f"2026/06/01,TXO,{month},{strike},{cp},1,2,1,2,10,2,100,-,-,-,-,,{session}"
+
+
+def opt_body(rows) -> bytes:
+    return ("\r\n".join([HEADER, *rows]) + "\r\n\r\n").encode("big5")
+
+
+def test_stream_matches_whole_body_parse_across_chunk_boundaries():
+    body = opt_body([opt_row("202606", 20000 + i, "買權" if i % 2 else "賣權") for i in range(50)]
+                    + ['2026/06/02,TXO,"202607",21000,買權,1,2,1,2,10,2,100,-,-,-,-,,盤後'])
+    expected = decode_and_parse_csv(body)
+    # 1- and 3-byte chunks split CRLFs and double-byte Big5 characters.
+    for size in (1, 3, 4096):
+        header, rows = iter_csv(body, chunk_size=size)
+        assert (header, list(rows)) == expected
+    assert len(expected[1]) == 51 and expected[1][-1][2] == "202607" and expected[1][-1][17] == "盤後"
+
+
+def test_error_pages_and_empty_bodies_are_none():
+    assert iter_csv(b"\r\n<html><script>alert('DateTime error')</script></html>") is None
+    assert iter_csv(b"") is None
+    assert decode_and_parse_csv(opt_body([])) is None
+
+
+def test_filters_apply_while_parsing_and_limit_stops_early():
+    body = opt_body([opt_row("202606", 20000, "買權"), opt_row("202607", 20000, "買權"),
+                     opt_row("202606", 20100, "賣權", "盤後"), opt_row("202606", 20200, "買權")])
+    where = match_columns({2: "202606", 4: "買權", 17: ""})
+    _header, rows = decode_and_parse_csv(body, where=where)
+    assert [r[3] for r in rows] == ["20000", "20200"]
+    assert match_columns({2: "", 4: " "}) is None
+
+    _header, rows = decode_and_parse_csv(body, limit=2)
+    assert [r[2] for r in rows] == ["202606", "202607"]
+
+    # A chunk stream is read only as far as the rows consumed.
+    read = []
+    chunks = (read.append(i) or body[i:i + 16] for i in range(0, len(body), 16))
+    _header, stream = iter_csv(chunks)
+    assert next(stream)[3] == "20000" and len(read) < len(body) // 16
+
+def test_options_history_tool_filters_and_lists_months(stub_server, monkeypatch, make_client):
+    limit = options_daily_history.ROW_LIMIT_WITHOUT_MONTH_FILTER
+    rows = [opt_row("202606" if i % 2 else "202607", 20000 + i, "買權", "盤後" if i % 3 == 0 else "一般")
+            for i in range(limit + 10)]
+    stub_server.route("/cht/3/optDataDown", opt_body(rows))
+    monkeypatch.setattr(options_daily_history, "OPT_DATA_DOWN_URL", f"{stub_server.url}/cht/3/optDataDown")
+    mcp = FastMCP("test")
+    options_daily_history.register_tools(mcp, make_client())
+    tool = tool_fn(mcp, "get_options_daily_history")
+
+    listing = tool("20260601", "20260602")
+    assert f"共有 {limit + 10} 筆資料" in listing and "202606、202607" in listing
+
+    output = tool("20260601", "20260602", contract_month="202606", session="盤後")
+    expected = sum(1 for i in range(limit + 10) if i % 2 and i % 3 == 0)
+    assert f"共 {expected} 筆" in output and "一般" not in output.split("\n", 1)[1]
@@ -0,0 +1,119 @@
+"""Offline tests for TAIFEX *Down ranges: day-level caching and window planning."""
+
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs
+
+from fastmcp import FastMCP
+
+import tools.taifex.futures_daily_history as futures_daily_history
+import tools.taifex.options_daily_history as options_daily_history
+from tools.taifex.futures_daily_history import check_span, fetch_csv_range, match_columns, plan_windows
+from tests.helpers import tool_fn
+from utils.disk_cache import DiskCache
+from utils.expiry import taipei_today
+
+HEADER = "交易日期,契約,到期月份(週別),開盤價,最高價,最低價,收盤價,漲跌價,漲跌%,成交量,結算價,未沖銷契約數," \
+         "最後最佳買價,最後最佳賣價,歷史最高價,歷史最低價,是否因訊息面暫停交易,交易時段,價差對單式委託成交量"
+
+
+def day(text: str) -> datetime:
+    return datetime.strptime(text, "%Y%m%d")
+
+
+def fut_down(handler):
+    """futDataDown stand-in: one row per weekday of the posted window, plus the day after."""
+    form = {k: v[0] for k, v in parse_qs(handler.request_body.decode()).items()}
+    start = datetime.strptime(form["queryStartDate"], "%Y/%m/%d")
+    end = datetime.strptime(form["queryEndDate"], "%Y/%m/%d")
+    lines = [HEADER]
+    for i in range((end - start).days + 2):  # the extra day must not leak into the result
+        d = start + timedelta(days=i)
+        if d.weekday() < 5:
+            lines.append(f"{d:%Y/%m/%d},{form['commodity_id']},202512,1,2,1,2,0,0%,10,2,100,-,-,-,-,,一般,0")
+    return 200, ("\r\n".join(lines) + "\r\n").encode("big5"), {}
+
+
+def posted_windows(stub_server):
+    return [tuple(parse_qs(body.decode())[f][0] for f in ("queryStartDate", "queryEndDate"))
+            for _method, _path, _headers, body in stub_server.log]
+
+
+def test_plan_windows_covers_missing_days_with_few_windows():
+    days = [day("20250101") + timedelta(days=i) for i in range(90)]
+    windows = plan_windows(days, 31)
+    assert [(f"{s:%m%d}", f"{e:%m%d}") for s, e in windows] == [("0101", "0201"), ("0202", "0305"), ("0306", "0331")]
+
+    # A gap of cached days is bridged only when none of them had trading.
+    missing = [day(d) for d in ("20250602", "20250603", "20250609", "20250610", "20250616")]
+    assert plan_windows(missing, 31, {"20250604", "20250605", "20250606", "20250607", "20250608"}) == [
+        (day("20250602"), day("20250610")), (day("20250616"), day("20250616"))]
+    assert plan_windows(missing, 3, {"20250604", "20250605", "20250606", "20250607", "20250608"}) == [
+        (day("20250602"), day("20250603")), (day("20250609"), day("20250610")), (day("20250616"), day("20250616"))]
+
+    assert check_span("20250101", "20260601")[0] is None
+    assert check_span("20260601", "20260101")[0] is None
+
+
+def test_overlapping_ranges_fetch_only_missing_days(stub_server, make_client):
+    stub_server.route("/cht/3/futDataDown", fut_down)
+    client = make_client()
+    url = f"{stub_server.url}/cht/3/futDataDown"
+    form = {"down_type": "1", "commodity_id": "TX", "commodity_id2": ""}
+
+    rows = fetch_csv_range(client, url, form, day("20250601"), day("20250620"), 31)
+    assert [r[0] for r in rows] == [f"2025/06/{d:02d}" for d in range(1, 21) if day(f"202506{d:02d}").weekday() < 5]
+
+    rows = fetch_csv_range(client, url, form, day("20250610"), day("20250630"), 31)
+    assert posted_windows(stub_server) == [("2025/06/01", "2025/06/20"), ("2025/06/21", "2025/06/30")]
+    dates = [r[0] for r in rows]
+    assert dates[0] == "2025/06/10" and dates[-1] == "2025/06/30" and len(dates) == len(set(dates)) == 15
+
+    # Fully cached: no request. A different filter or contract is a separate day set.
+    assert len(fetch_csv_range(client, url, form, day("20250605"), day("20250625"), 31)) == 15
+    assert stub_server.hits["/cht/3/futDataDown"] == 2
+    fetch_csv_range(client, url, form, day("20250605"), day("20250625"), 31, where=match_columns({17: "盤後"}))
+    assert stub_server.hits["/cht/3/futDataDown"] == 3
+
+
+def test_only_closed_days_are_kept(stub_server, make_client):
+    stub_server.route("/cht/3/futDataDown", fut_down)
+    client = make_client()
+    url = f"{stub_server.url}/cht/3/futDataDown"
+    form = {"down_type": "1", "commodity_id": "TX", "commodity_id2": ""}
+    today = datetime.combine(taipei_today(), datetime.min.time())
+
+    fetch_csv_range(client, url, form, today - timedelta(days=3), today, 31)
+    fetch_csv_range(client, url, form, today - timedelta(days=3), today, 31)
+    assert posted_windows(stub_server)[1] == (f"{today:%Y/%m/%d}", f"{today:%Y/%m/%d}")
+
+
+def test_tools_split_long_ranges(stub_server, monkeypatch, make_client):
+    stub_server.route("/cht/3/futDataDown", fut_down)
+    url = f"{stub_server.url}/cht/3/futDataDown"
+    monkeypatch.setattr(futures_daily_history, "FUT_DATA_DOWN_URL", url)
+    monkeypatch.setattr(options_daily_history, "OPT_DATA_DOWN_URL", url)
+    client = make_client()
+    mcp = FastMCP("test")
+    futures_daily_history.register_tools(mcp, client)
+    options_daily_history.register_tools(mcp, client)
+    futures = tool_fn(mcp, "get_futures_daily_history")
+    options = tool_fn(mcp, "get_options_daily_history")
+
+    assert "共 64 筆" in futures("20250101", "20250331")
+    assert "contract_month" in options("20250101", "20250331")
+    assert "不可超過 366 天" in futures("20250101", "20260601")
+
+
+def test_day_rows_persist_to_the_disk_cache(stub_server, tmp_path, make_client):
+    stub_server.route("/cht/3/futDataDown", fut_down)
+    url = f"{stub_server.url}/cht/3/futDataDown"
+    form = {"down_type": "1", "commodity_id": "TX", "commodity_id2": ""}
+    disk = DiskCache(str(tmp_path / "cache.sqlite3"))
+
+    first = fetch_csv_range(make_client(disk_cache=disk), url, form, day("20250601"), day("20250620"), 31)
+    restarted = make_client(disk_cache=disk)
+    assert fetch_csv_range(restarted, url, form, day("20250601"), day("20250620"), 31) == first
+    assert stub_server.hits["/cht/3/futDataDown"] == 1
+    # Only the per-day rows are stored; the window body they were parsed from is not.
+    keys = [key for (key,) in disk._conn.execute("SELECT key FROM responses")]
+    assert keys and all(key.startswith("('days',") for key in keys)
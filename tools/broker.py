@@ -2,7 +2,7 @@
 
 from typing import Optional
 from fastmcp import FastMCP
-from utils import TWSEAPIClient, create_list_tool, create_simple_list_formatter
+from utils import TWSEAPIClient, create_async_list_tool, create_simple_list_formatter
 
 
 def _doc(summary: str, name_hint: Optional[str] = None) -> str:
@@ -78,7 +78,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     """Register broker tools with the MCP instance."""
 
     for endpoint, name, summary, label, empty_type, filter_field, name_hint, formatter in BROKER_TOOLS:
-        create_list_tool(
+        create_async_list_tool(
             mcp, endpoint, name, _doc(summary, name_hint), label, empty_type,
             formatter, filter_field=filter_field, client=client,
         )
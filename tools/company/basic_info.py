@@ -1,5 +1,6 @@
 """Company basic information tools."""
 
+from collections.abc import Mapping
 from typing import Optional
 from fastmcp import FastMCP
 from utils import (
@@ -10,8 +11,8 @@ from utils import (
     MSG_NO_DATA,
     DEFAULT_DISPLAY_LIMIT,
     format_list_response,
-    create_company_tool,
-    create_list_tool,
+    create_async_company_tool,
+    create_async_list_tool,
     truncate,
 )
 
@@ -145,10 +146,10 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     for endpoint, name, doc in SIMPLE_BASIC_INFO_TOOLS:
-        create_company_tool(mcp, endpoint, name, doc, client)
+        create_async_company_tool(mcp, endpoint, name, doc, client)
 
     for endpoint, name, summary, label, empty_type, filter_field, name_label, formatter in SIMPLE_LIST_TOOLS:
-        create_list_tool(
+        create_async_list_tool(
             mcp, endpoint, name,
             _list_doc(summary, name_label, has_name=filter_field is not None),
             label, empty_type, formatter, filter_field=filter_field, client=client,
@@ -157,7 +158,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     # --- Complex tools with custom logic ---
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_company_board_insufficient_shares(name: str = "", limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
         """查詢上市公司董事、監察人持股不足法定成數彙總表。
 
@@ -190,7 +191,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return format_list_response(deficient, "董監事持股不足法定成數資料", formatter, limit=limit, offset=offset)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_companies_with_independent_directors(name: str = "", limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
         """查詢上市公司獨立董監事兼任情形彙總表。
 
@@ -232,7 +233,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return result
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_companies_with_csr_reports_103(limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
         """查詢民國103年應編製及申報企業社會責任報告書之公司。
 
@@ -247,7 +248,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
                 "建議改查近年永續報告（ESG）相關端點，或至公司官網/公告查詢。"
             )
 
-        valid = [it for it in data if isinstance(it, dict) and has_meaningful_data(it, ["公司代號", "公司名稱"])]
+        valid = [it for it in data if isinstance(it, Mapping) and has_meaningful_data(it, ["公司代號", "公司名稱"])]
         if not valid:
             return "查無有效的公司名單（欄位皆為空或 N/A）。\n請稍後再試或改查其他相關來源。"
 
@@ -257,7 +258,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return format_list_response(valid, "103年度需編製CSR報告書公司", formatter, limit=limit, offset=offset)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_company_board_insufficient_shares_consecutive() -> str:
         """查詢上市公司董事、監察人持股不足法定成數連續達3個月以上彙總表。"""
         data = _client.fetch_data("/opendata/t187ap10_L")
@@ -276,7 +277,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return result
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_company_shareholder_meeting_announcements(name: str = "", limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
         """查詢上市公司股東會公告-召集股東常(臨時)會公告資料彙總表(95年度起適用)。
 
@@ -291,7 +292,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
 
         filtered = [
             it for it in data
-            if isinstance(it, dict) and has_meaningful_data(it, [
+            if isinstance(it, Mapping) and has_meaningful_data(it, [
                 "公司代號", "公司名稱", "股東常(臨時)會日期-日期", "股東常(臨時)會日期-常或臨時"
             ])
         ]
@@ -314,7 +315,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return format_list_response(filtered, "上市公司股東會公告資料", formatter, limit=limit, offset=offset)
 
     @mcp.tool
-    @handle_api_errors(use_code_param=True)
+    @handle_api_errors(use_code_param=True, offload=True)
     def get_company_shareholder_meeting_announcements_by_code(code: str) -> str:
         """根據股票代號查詢上市公司股東會公告-召集股東常(臨時)會公告資料彙總表。"""
         data = _client.fetch_company_data("/opendata/t187ap38_L", code)
@@ -334,7 +335,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return result
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_company_shareholder_meeting_dates(name: str = "", limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
         """查詢上市公司召開股東常(臨時)會日期、地點及採用電子投票情形等資料彙總表。
 
@@ -349,7 +350,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
 
         filtered = [
             it for it in data
-            if isinstance(it, dict) and has_meaningful_data(it, [
+            if isinstance(it, Mapping) and has_meaningful_data(it, [
                 "公司代號", "公司名稱", "開會日期", "開會地點", "是否採電子投票"
             ])
         ]
@@ -371,7 +372,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return format_list_response(filtered, "上市公司股東會日期地點電子投票資料", formatter, limit=limit, offset=offset)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_companies_with_business_scope_changes(name: str = "", limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
         """查詢上市公司經營權及營業範圍異(變)動專區-營業範圍重大變更公司。
 
@@ -405,7 +406,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return format_list_response(valid_data, "上市公司營業範圍重大變更資料", formatter, limit=limit, offset=offset)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_company_board_pledged_shares() -> str:
         """查詢上市公司董事、監察人質權設定占董事及監察人實際持有股數彙總表。"""
         data = _client.fetch_data("/opendata/t187ap09_L")
@@ -1,9 +1,10 @@
 """Company ESG and governance tools."""
 
+from collections.abc import Mapping
 from typing import Optional
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors, format_properties_with_values_multiline, has_meaningful_data
-from utils.tool_factory import create_company_tool
+from utils.tool_factory import create_async_company_tool
 
 # Simple company data tools: (endpoint, name, docstring)
 SIMPLE_ESG_TOOLS = [
@@ -58,18 +59,18 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     
     # Register simple tools via factory
     for endpoint, name, doc in SIMPLE_ESG_TOOLS:
-        create_company_tool(mcp, endpoint, name, doc, client)
+        create_async_company_tool(mcp, endpoint, name, doc, client)
     
     # Complex tools with custom logic below
     
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_companies_with_anticompetitive_losses() -> str:
         """查詢所有已申報反競爭行為法律訴訟損失的上市公司（排除零值及N/A）。"""
         data = _client.fetch_data("/opendata/t187ap46_L_20")
         filtered_data = [
             item for item in data 
-            if isinstance(item, dict) and 
+            if isinstance(item, Mapping) and 
             has_meaningful_data(item, "因與反競爭行為條例相關的法律訴訟而造成的金錢損失總額(仟元)")
         ]
         
@@ -87,13 +88,13 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return result
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_companies_with_inclusive_finance_data() -> str:
         """查詢所有已申報普惠金融活動的上市公司（排除零值及N/A）。"""
         data = _client.fetch_data("/opendata/t187ap46_L_17")
         filtered_data = [
             item for item in data
-            if isinstance(item, dict) and
+            if isinstance(item, Mapping) and
             has_meaningful_data(item, [
                 "對促進小型企業及社區發展的貸放件數(件)",
                 "對促進小型企業及社區發展的貸放餘額(仟元)",
@@ -121,13 +122,13 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return result
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_companies_with_refineries_in_populated_areas() -> str:
         """查詢所有已申報在人口密集區設有煉油廠的上市公司（排除零值及N/A）。"""
         data = _client.fetch_data("/opendata/t187ap46_L_15")
         filtered_data = [
             item for item in data
-            if isinstance(item, dict) and
+            if isinstance(item, Mapping) and
             has_meaningful_data(item, "在人口密集地區的煉油廠數量(座)")
         ]
 
@@ -1,8 +1,17 @@
 """Company financial statements tools."""
 
-from typing import Optional
+from typing import Dict, List, Optional
 from fastmcp import FastMCP
-from utils import TWSEAPIClient, handle_api_errors, format_properties_with_values_multiline, create_company_tool
+from utils import TWSEAPIClient, handle_api_errors, format_properties_with_values_multiline, create_async_company_tool
+from utils.indexes import DEFAULT_STATEMENT_FAMILY, build_statement_families
+
+PROFILE_ENDPOINT = "/opendata/t187ap03_L"
+
+# statement keyword → (endpoint prefix, label) for the bulk statement tool.
+STATEMENT_ENDPOINTS = {
+    "income": ("/opendata/t187ap06_L", "綜合損益表"),
+    "balance": ("/opendata/t187ap07_L", "資產負債表"),
+}
 
 # Simple tools: fetch_company_data(endpoint, code) → format as properties.
 SIMPLE_FINANCIAL_TOOLS = [
@@ -25,35 +34,25 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     for endpoint, name, doc in SIMPLE_FINANCIAL_TOOLS:
-        create_company_tool(mcp, endpoint, name, doc, client)
+        create_async_company_tool(mcp, endpoint, name, doc, client)
+
+    def _statement_families() -> Dict[str, str]:
+        """Code → statement suffix, built once per cached version of the company profiles."""
+        profiles = _client.fetch_data(PROFILE_ENDPOINT)
+        return (_client.dataset_index(profiles, "statement_family", build_statement_families)
+                or build_statement_families(profiles))
 
     def _get_industry_api_suffix(code: str) -> str:
         """Return API suffix for the company's industry; defaults to '_ci'."""
         try:
-            profile_data = _client.fetch_company_data("/opendata/t187ap03_L", code)
-            if not profile_data:
-                return "_ci"
-
-            industry = profile_data.get("產業別", "")
-            industry_mapping = {
-                "金融業": "_basi",
-                "證券期貨業": "_bd",
-                "金控業": "_fh",
-                "保險業": "_ins",
-                "異業": "_mim",
-                "一般業": "_ci",
-            }
-            for key, suffix in industry_mapping.items():
-                if key in industry or industry == key:
-                    return suffix
-            return "_ci"
+            return _statement_families().get(code, DEFAULT_STATEMENT_FAMILY)
         except Exception:
-            return "_ci"
+            return DEFAULT_STATEMENT_FAMILY
 
     # --- Tools that need industry-specific endpoints ---
 
     @mcp.tool
-    @handle_api_errors(use_code_param=True)
+    @handle_api_errors(use_code_param=True, offload=True)
     def get_company_income_statement(code: str) -> str:
         """根據股票代號查詢上市公司綜合損益表。
         自動偵測公司所屬產業並使用對應的財務報表格式（一般業、金融業、證券期貨業、金控業、保險業、異業）。
@@ -63,7 +62,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return format_properties_with_values_multiline(data) if data else ""
 
     @mcp.tool
-    @handle_api_errors(use_code_param=True)
+    @handle_api_errors(use_code_param=True, offload=True)
     def get_company_balance_sheet(code: str) -> str:
         """根據股票代號查詢上市公司資產負債表。
         自動偵測公司所屬產業並使用對應的財務報表格式（一般業、金融業、證券期貨業、金控業、保險業、異業）。
@@ -73,7 +72,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return format_properties_with_values_multiline(data) if data else ""
 
     @mcp.tool
-    @handle_api_errors(use_code_param=True)
+    @handle_api_errors(use_code_param=True, offload=True)
     def get_public_company_balance_sheet(code: str) -> str:
         """根據股票代號查詢公開發行公司資產負債表。
         自動偵測公司所屬產業並使用對應的財務報表格式。
@@ -83,7 +82,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return format_properties_with_values_multiline(data) if data else ""
 
     @mcp.tool
-    @handle_api_errors(use_code_param=True)
+    @handle_api_errors(use_code_param=True, offload=True)
     def get_public_company_income_statement(code: str) -> str:
         """根據股票代號查詢公開發行公司綜合損益表。
         自動偵測公司所屬產業並使用對應的財務報表格式。
@@ -92,10 +91,38 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         data = _client.fetch_company_data(f"/opendata/t187ap06_X{suffix}", code)
         return format_properties_with_values_multiline(data) if data else ""
 
+    @mcp.tool
+    @handle_api_errors(offload=True)
+    def get_companies_financial_statements(codes: List[str], statement: str = "income") -> str:
+        """一次查詢多家上市公司的財務報表，各公司自動套用所屬產業的報表格式。
+
+        Args:
+            codes: 股票代號列表，例如 ["2330", "2881", "2882"]
+            statement: 報表種類，"income" 為綜合損益表（預設），"balance" 為資產負債表
+        """
+        if not codes:
+            return "請提供至少一個股票代號"
+        if statement not in STATEMENT_ENDPOINTS:
+            return f"不支援的報表種類：{statement}（可用：{', '.join(STATEMENT_ENDPOINTS)}）"
+
+        prefix, label = STATEMENT_ENDPOINTS[statement]
+        try:
+            families = _statement_families()
+        except Exception:
+            families = {}
+
+        sections = []
+        for code in (c.strip() for c in codes):
+            suffix = families.get(code, DEFAULT_STATEMENT_FAMILY)
+            data = _client.fetch_company_data(f"{prefix}{suffix}", code)
+            body = format_properties_with_values_multiline(data) if data else "查無資料"
+            sections.append(f"【{code} {label}】\n{body}")
+        return "\n\n".join(sections)
+
     # --- Tool with custom sorting/pagination ---
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_company_profitability_analysis_summary(
         page_size: int = 20,
         page_number: int = 1,
@@ -131,18 +158,15 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         if order_by not in valid_fields:
             order_by = "公司代號"
 
-        def get_sort_key(item):
-            value = item.get(order_by, "")
-            if order_by in ["營業收入(百萬元)", "毛利率(%)(營業毛利)/(營業收入)",
-                            "營業利益率(%)(營業利益)/(營業收入)", "稅前純益率(%)(稅前純益)/(營業收入)",
-                            "稅後純益率(%)(稅後純益)/(營業收入)", "年度", "季別"]:
-                try:
-                    return float(value) if value and value != "N/A" else float('-inf')
-                except (ValueError, TypeError):
-                    return float('-inf')
-            return str(value)
-
-        sorted_data = sorted(data, key=get_sort_key, reverse=(order_direction == "desc"))
+        # Sort on typed columns parsed once per dataset version (numbers numerically, codes
+        # and names as text); rows without a value ("N/A", "", or any non-number in a numeric
+        # field) come last in either direction.
+        table = _client.columns(data)
+        if order_by in table.columns:
+            numeric = order_by not in ("公司代號", "公司名稱")
+            sorted_data = table.take(table.rank(order_by, descending=(order_direction == "desc"), numeric=numeric))
+        else:
+            sorted_data = list(data)
 
         total_records = len(sorted_data)
         start_index = (page_number - 1) * page_size
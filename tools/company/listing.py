@@ -2,7 +2,7 @@
 
 from typing import Optional
 from fastmcp import FastMCP
-from utils import TWSEAPIClient, create_list_tool
+from utils import TWSEAPIClient, create_async_list_tool
 
 
 def _doc(summary: str) -> str:
@@ -52,7 +52,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     """Register company listing tools with the MCP instance."""
 
     for endpoint, name, summary, label, empty_type, formatter in LISTING_TOOLS:
-        create_list_tool(
+        create_async_list_tool(
             mcp, endpoint, name, _doc(summary), label, empty_type,
             formatter, filter_field="Company", client=client,
         )
@@ -1,5 +1,6 @@
 """News and major announcements related tools for Taiwan Stock Exchange MCP server."""
 
+from collections.abc import Mapping
 from typing import Optional
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors, format_multiple_records, format_properties_with_values_multiline
@@ -10,7 +11,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_company_major_news(code: str = "") -> str:
         """查詢上市公司每日重大訊息。
 
@@ -25,7 +26,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
             return format_multiple_records(data) if data else ""
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_twse_news(start_date: str = "", end_date: str = "") -> str:
         """查詢證交所新聞。
 
@@ -83,7 +84,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         if data and (start_date or end_date):
             filtered_data = []
             for item in data:
-                if isinstance(item, dict) and 'Date' in item:
+                if isinstance(item, Mapping) and 'Date' in item:
                     item_date = str(item['Date'])
                     if start_date and end_date:
                         if start_date <= item_date <= end_date:
@@ -99,7 +100,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return format_multiple_records(data) if data else ""
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_twse_events(top: int = 10) -> str:
         """查詢證交所活動訊息。
 
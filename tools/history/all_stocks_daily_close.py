@@ -3,22 +3,17 @@
 from typing import Optional
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors, DEFAULT_DISPLAY_LIMIT
+from utils.quote_store import mi_index_stock_table, twse_quotes
 
 MI_INDEX_URL = "https://www.twse.com.tw/rwd/zh/afterTrading/MI_INDEX"
 
-# The table with per-stock quotes ("每日收盤行情") is a specific entry within the
-# `tables` array MI_INDEX returns (the rest are index-level summary tables). Its
-# position has been stable across dates tested; located by title prefix as a
-# safety net in case TWSE reorders the tables.
-STOCK_TABLE_TITLE_PREFIX = "每日收盤行情"
-
 
 def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None:
     """Register TWSE all-stocks daily close tools."""
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_all_stocks_daily_close(date: str, stock_no: str = "", name: str = "",
                                     limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
         """查詢指定日期全部上市股票的每日收盤行情（開高低收、成交量、本益比）。
@@ -43,21 +38,21 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         if not resp or resp.get("stat") != "OK":
             return f"查無 {date} 的收盤行情資料，請確認該日期為交易日（非假日或週末）"
 
-        tables = resp.get("tables", [])
-        stock_table = next(
-            (t for t in tables if (t.get("title") or "").find(STOCK_TABLE_TITLE_PREFIX) != -1),
-            None,
-        )
+        # The per-stock quotes ("每日收盤行情") are one of several tables; the rest are
+        # index-level summaries.
+        stock_table = mi_index_stock_table(resp)
         if not stock_table or not stock_table.get("data"):
             return f"查無 {date} 的個股收盤行情資料"
 
         data = stock_table["data"]
+        if _client.quotes is not None and not _client.quotes.has("tse", date):
+            _client.quotes.append("tse", date, twse_quotes(data))
         if stock_no:
             data = [row for row in data if row[0].strip() == stock_no]
             if not data:
                 return f"查無股票代號 {stock_no} 在 {date} 的收盤行情"
         if name:
-            data = [row for row in data if name in row[1]]
+            data = _client.filter_by_name(resp, 1, name, rows=data)
             if not data:
                 return f"查無名稱包含「{name}」的股票在 {date} 的收盤行情"
 
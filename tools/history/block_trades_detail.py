@@ -12,7 +12,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_block_trades_detail(date: str, stock_no: str = "", name: str = "",
                                  limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
         """查詢集中市場鉅額交易逐筆明細（含配對交易、盤後鉅額等交易別）。
@@ -12,7 +12,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_market_valuation_by_date(date: str, stock_no: str = "") -> str:
         """查詢全市場上市股票的本益比（P/E）、殖利率、股價淨值比（P/B）。
         適合用於篩選低估值個股或比較產業估值水位。
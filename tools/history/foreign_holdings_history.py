@@ -12,7 +12,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_foreign_holdings_history(date: str, stock_no: str = "", name: str = "",
                                       limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
         """查詢指定日期全部上市股票的外資及陸資持股比率。
@@ -47,7 +47,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
             if not data:
                 return f"查無股票代號 {stock_no} 在 {date} 的外資及陸資持股資料"
         if name:
-            data = [row for row in data if name in row[1]]
+            data = _client.filter_by_name(resp, 1, name, rows=data)
             if not data:
                 return f"查無名稱包含「{name}」的股票在 {date} 的外資及陸資持股資料"
 
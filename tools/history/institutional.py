@@ -28,14 +28,6 @@ IDX_DL_NET_HEDGE = 17 # 自營商買賣超股數(避險)
 IDX_TOTAL_NET = 18    # 三大法人買賣超股數
 
 
-def _parse_num(value: str) -> int:
-    """Convert comma-separated number string to int."""
-    try:
-        return int(value.replace(",", ""))
-    except (ValueError, AttributeError):
-        return 0
-
-
 def _fmt(value: str) -> str:
     """Return value as-is (keep original formatted string)."""
     return value or "-"
@@ -46,7 +38,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_twse_institutional_investors_summary(date: str, limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
         """查詢台灣上市市場三大法人（外資、投信、自營商）買賣超日報。
         回傳指定日期所有上市股票的三大法人買賣超彙總，並依買賣超絕對值排序。
@@ -73,12 +65,17 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
 
         title = resp.get("title", f"{date} 三大法人買賣超日報")
 
+        # Typed columns, parsed once per cached response rather than inside the sort key.
+        fields = resp.get("fields")
+        table = _client.columns(resp, rows=data, fields=fields if fields and len(fields) > IDX_TOTAL_NET else None)
+
         # Filter rows where any institutional investor has non-zero net
-        # Some rows (e.g. bond ETFs) have fewer than 19 columns — skip them
-        active = [row for row in data if len(row) > IDX_TOTAL_NET and _parse_num(row[IDX_TOTAL_NET]) != 0]
+        # Some rows (e.g. bond ETFs) have fewer than 19 columns, others a blank or malformed
+        # total — both read as missing (NaN), even when they leave the column typed as text
+        active = table.where(IDX_TOTAL_NET, lambda v: v == v and v != 0, numeric=True)
 
         # Sort by absolute value of total net descending
-        active.sort(key=lambda r: abs(_parse_num(r[IDX_TOTAL_NET])), reverse=True)
+        active = table.take(table.rank(IDX_TOTAL_NET, descending=True, key=abs, positions=active, numeric=True))
 
         total = len(active)
         page_data = active[offset:offset + limit]
@@ -109,7 +106,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return "\n".join(lines)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_twse_institutional_investors_by_stock(stock_no: str, date: str) -> str:
         """查詢指定上市股票的三大法人（外資、投信、自營商）買賣超明細。
         回傳外資（含外資自營商）、投信、自營商（含自行買賣與避險）的完整買進、賣出、買賣超股數。
@@ -12,7 +12,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_market_institutional_amounts_history(date: str) -> str:
         """查詢台灣上市市場三大法人（自營商、投信、外資及陸資）買賣金額統計表（單日）。
         與 get_twse_institutional_investors_summary（個股買賣超股數）不同，此工具回傳的是
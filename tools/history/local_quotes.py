@@ -0,0 +1,181 @@
+"""Time-series and cross-sectional queries over the local daily quote store.
+
+Answered from ``utils.quote_store`` (filled as get_all_stocks_daily_close and
+get_otc_daily fetch days), without calling TWSE / TPEx.
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+from fastmcp import FastMCP
+from utils import TWSEAPIClient, handle_api_errors
+from utils.quote_store import MARKETS
+
+MARKET_LABELS = {"tse": "上市", "otc": "上櫃"}
+
+# metric -> (label, store fields it reads)
+METRICS = {
+    "return": ("區間漲跌幅", ("close", "change")),
+    "value": ("區間成交金額", ("value",)),
+    "volume": ("區間成交股數", ("volume",)),
+}
+
+STORE_DISABLED = "本機行情資料庫未啟用，請設定環境變數 TWSE_QUOTE_STORE_PATH 後，以 get_all_stocks_daily_close / get_otc_daily 查詢過的交易日即會保存"
+
+
+def _price(value: float) -> str:
+    return "-" if math.isnan(value) else f"{value:,.2f}"
+
+
+def _amount(value: float) -> str:
+    return "-" if math.isnan(value) else f"{value:,.0f}"
+
+
+def _returns(store, market: str, start: str, end: str) -> Dict[str, Tuple[float, float]]:
+    """code -> (base, last close): base is the close before the code's first day in range."""
+    base: Dict[str, float] = {}
+    last: Dict[str, float] = {}
+    for _days, codes, (close, change) in store.blocks(market, start, end, ("close", "change")):
+        n = len(codes)
+        for c, code in enumerate(codes):
+            closes = close[c::n].tolist()
+            traded = [i for i, v in enumerate(closes) if not math.isnan(v)]
+            if not traded:
+                continue
+            if code not in base:
+                first, moved = closes[traded[0]], change[traded[0] * n + c]
+                base[code] = first if math.isnan(moved) else first - moved
+            last[code] = closes[traded[-1]]
+    return {code: (base[code], last[code]) for code in last if base[code] > 0}
+
+
+def _totals(store, market: str, start: str, end: str, field: str) -> Dict[str, float]:
+    totals: Dict[str, float] = {}
+    for _days, codes, (values,) in store.blocks(market, start, end, (field,)):
+        n = len(codes)
+        for c, code in enumerate(codes):
+            traded = [v for v in values[c::n].tolist() if not math.isnan(v)]
+            if traded:
+                totals[code] = totals.get(code, 0.0) + math.fsum(traded)
+    return totals
+
+
+def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None:
+    """Register local quote store tools."""
+    _client = client or TWSEAPIClient.get_instance()
+
+    @mcp.tool
+    @handle_api_errors(offload=True)
+    def get_local_quote_history(stock_no: str, start_date: str = "", end_date: str = "", market: str = "") -> str:
+        """從本機行情資料庫查詢單一股票（上市或上櫃）的每日開高低收、漲跌、成交量值，不需連線上游。
+        資料來自曾以 get_all_stocks_daily_close / get_otc_daily 查詢過的交易日；未保存的日期不會出現，
+        需要完整區間時請先查詢那些日期的全市場收盤行情。
+
+        Args:
+            stock_no: 股票代號，例如 "2330"
+            start_date: 起始日期 YYYYMMDD（選填，留空為最早保存日）
+            end_date: 結束日期 YYYYMMDD（選填，留空為最新保存日）
+            market: "tse"（上市）或 "otc"（上櫃），留空自動判斷
+
+        Returns:
+            區間內每個已保存交易日的行情，以及區間漲跌幅
+        """
+        store = _client.quotes
+        if store is None:
+            return STORE_DISABLED
+        markets = [market] if market in MARKETS else list(MARKETS)
+        for m in markets:
+            series = store.series(m, stock_no, start_date, end_date)
+            if series:
+                break
+        else:
+            return f"本機行情資料庫中查無 {stock_no} 在 {start_date or '最早'}～{end_date or '最新'} 的資料"
+
+        first, last = series[0][1], series[-1][1]
+        base = first.close - first.change if not math.isnan(first.change) else first.close
+        lines = [f"【本機行情】{stock_no} {last.name}（{MARKET_LABELS[m]}）{series[0][0]}~{series[-1][0]}（共 {len(series)} 個交易日）"]
+        if base > 0 and not math.isnan(last.close):
+            lines.append(f"區間漲跌幅: {(last.close / base - 1) * 100:+.2f}%（{_price(base)} → {_price(last.close)}）")
+        lines.append("")
+        for day, q in series:
+            lines.append(
+                f"{day} | 開:{_price(q.open)} 高:{_price(q.high)} 低:{_price(q.low)} 收:{_price(q.close)} "
+                f"漲跌:{_price(q.change)} | 量:{_amount(q.volume)} 金額:{_amount(q.value)}"
+            )
+        return "\n".join(lines)
+
+    @mcp.tool
+    @handle_api_errors(offload=True)
+    def rank_local_quotes(start_date: str, end_date: str = "", metric: str = "return", market: str = "tse",
+                          limit: int = 20, ascending: bool = False) -> str:
+        """從本機行情資料庫做全市場橫斷面排名（例如某段期間漲幅最大、成交金額最高的股票），不需連線上游。
+        只涵蓋曾以 get_all_stocks_daily_close（上市）/ get_otc_daily（上櫃）查詢過的交易日。
+
+        Args:
+            start_date: 起始日期 YYYYMMDD
+            end_date: 結束日期 YYYYMMDD（選填，留空與 start_date 相同，即單日排名）
+            metric: "return"（區間漲跌幅，以首日前一交易日收盤為基準）、"value"（區間成交金額合計）、
+                "volume"（區間成交股數合計）
+            market: "tse"（上市，預設）或 "otc"（上櫃）
+            limit: 回傳名次數（預設 20）
+            ascending: True 時由小到大排序（例如跌幅最大）
+
+        Returns:
+            排名、代號、名稱與指標數值，並註明區間內已保存的交易日數
+        """
+        store = _client.quotes
+        if store is None:
+            return STORE_DISABLED
+        if metric not in METRICS:
+            return f"metric 僅支援 {', '.join(METRICS)}，收到：{metric}"
+        if market not in MARKETS:
+            return f"market 僅支援 tse（上市）或 otc（上櫃），收到：{market}"
+        end_date = end_date or start_date
+        if start_date > end_date:
+            return f"起始日期 {start_date} 不可晚於結束日期 {end_date}"
+
+        days = store.days(market, start_date, end_date)
+        if not days:
+            return f"本機行情資料庫中沒有{MARKET_LABELS[market]} {start_date}～{end_date} 的資料，請先以全市場收盤行情工具查詢這些日期"
+
+        label, fields = METRICS[metric]
+        if metric == "return":
+            pairs = _returns(store, market, start_date, end_date)
+            scores = {code: last / base - 1 for code, (base, last) in pairs.items()}
+        else:
+            scores = _totals(store, market, start_date, end_date, fields[0])
+        ranked: List[Tuple[str, float]] = sorted(scores.items(), key=lambda kv: kv[1], reverse=not ascending)[:limit]
+
+        lines = [
+            f"【本機行情排名】{MARKET_LABELS[market]} {days[0]}~{days[-1]} {label}"
+            f"{'由小到大' if ascending else '由大到小'}（已保存 {len(days)} 個交易日、{len(scores)} 檔）\n"
+        ]
+        for rank, (code, score) in enumerate(ranked, 1):
+            value = f"{score * 100:+.2f}%" if metric == "return" else _amount(score)
+            detail = ""
+            if metric == "return":
+                base, last = pairs[code]
+                detail = f"（{_price(base)} → {_price(last)}）"
+            lines.append(f"{rank}. {code} {store.name(market, code)} | {label}: {value}{detail}")
+        return "\n".join(lines)
+
+    @mcp.tool
+    @handle_api_errors(offload=True)
+    def get_local_quote_coverage() -> str:
+        """列出本機行情資料庫已保存的交易日（依市場、月份），用來判斷哪些日期可直接以本機工具查詢。
+
+        Returns:
+            每個市場各月份已保存的交易日數與日期範圍
+        """
+        store = _client.quotes
+        if store is None:
+            return STORE_DISABLED
+        lines = [f"【本機行情資料庫】{store.root}"]
+        for market in MARKETS:
+            days = store.days(market)
+            lines.append(f"\n{MARKET_LABELS[market]}（{market}）：共 {len(days)} 個交易日")
+            by_month: Dict[str, List[str]] = {}
+            for day in days:
+                by_month.setdefault(day[:6], []).append(day)
+            for month, month_days in by_month.items():
+                lines.append(f"  {month}: {len(month_days)} 日（{month_days[0]}~{month_days[-1]}）")
+        return "\n".join(lines)
@@ -14,7 +14,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_margin_balance(date: str, stock_no: str = "") -> str:
         """查詢全市場融資融券餘額，用於判斷市場槓桿水位與多空情緒。
         若指定日期非交易日，會自動往前尋找最近的交易日資料。
@@ -3,28 +3,50 @@
 from typing import Optional
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors
+from utils.month_range import check_range, fetch_month_range, merge_daily_rows, missing_note
 
 FMTQIK_URL = "https://www.twse.com.tw/rwd/zh/afterTrading/FMTQIK"
 
 
+def _format_row(row) -> str:
+    # row: 日期,成交股數,成交金額,成交筆數,發行量加權股價指數,漲跌點數
+    d, volume, value, tx, index, change = row
+    return f"{d} | 加權指數:{index}（{change}）| 成交量:{volume} | 成交金額:{value} | 筆數:{tx}"
+
+
 def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None:
     """Register TWSE market turnover history tools."""
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
-    def get_market_turnover_history(date: str) -> str:
+    @handle_api_errors(offload=True)
+    def get_market_turnover_history(date: str, end_date: str = "") -> str:
         """查詢台灣上市市場每日成交量值與發行量加權股價指數。
         回傳指定月份每一個交易日的市場成交股數、成交金額、成交筆數、加權指數收盤與漲跌點數。
         與 get_daily_market_trading_info（openapi 版）不同：openapi 版只回傳最近約 12 個交易日的
         滾動視窗，無法指定過去月份；此工具可查任意過去月份。
+        指定 end_date 時改為查詢 date～end_date 區間（最多 36 個月），合併為一個序列。
 
         Args:
-            date: 欲查詢的月份，格式 YYYYMMDD（日期隨意，例如 "20260601" 查 2026 年 6 月整月）
+            date: 欲查詢的月份，格式 YYYYMMDD（日期隨意，例如 "20260601" 查 2026 年 6 月整月）；
+                指定 end_date 時為區間起始日
+            end_date: 區間結束日，格式 YYYYMMDD。留空則只查 date 所在月份
 
         Returns:
-            該月份每個交易日的成交股數、成交金額、成交筆數、加權指數、漲跌點數
+            該月份（或區間內）每個交易日的成交股數、成交金額、成交筆數、加權指數、漲跌點數
         """
+        if end_date:
+            span, error = check_range(date, end_date)
+            if span is None:
+                return error
+            result = fetch_month_range(_client, FMTQIK_URL, {"response": "json"}, *span)
+            rows = merge_daily_rows(result)
+            if not rows:
+                return f"查無 {date}～{end_date} 的市場成交資訊"
+            lines = [f"【市場成交資訊 {span[0]:%Y-%m-%d}～{span[1]:%Y-%m-%d}（共 {len(rows)} 個交易日）】\n"]
+            lines.extend(_format_row(row) for row in rows)
+            return "\n".join(lines) + missing_note(result)
+
         resp = _client.fetch_json(
             FMTQIK_URL,
             params={"response": "json", "date": date},
@@ -39,11 +61,6 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
 
         title = resp.get("title", f"{date[:6]} 市場成交資訊")
         lines = [f"【{title}】\n"]
-        for row in data:
-            # row: 日期,成交股數,成交金額,成交筆數,發行量加權股價指數,漲跌點數
-            d, volume, value, tx, index, change = row
-            lines.append(
-                f"{d} | 加權指數:{index}（{change}）| 成交量:{volume} | 成交金額:{value} | 筆數:{tx}"
-            )
+        lines.extend(_format_row(row) for row in data)
 
         return "\n".join(lines)
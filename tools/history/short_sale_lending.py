@@ -17,7 +17,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_short_sale_lending_balance_history(date: str, stock_no: str = "", name: str = "",
                                                 limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
         """查詢信用額度總量管制餘額表：融券賣出餘額與借券賣出餘額。
@@ -51,7 +51,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
             if not data:
                 return f"查無股票代號 {stock_no} 在 {date} 的信用額度總量管制餘額資料"
         if name:
-            data = [row for row in data if name in row[1]]
+            data = _client.filter_by_name(resp, 1, name, rows=data)
             if not data:
                 return f"查無名稱包含「{name}」的股票在 {date} 的信用額度總量管制餘額資料"
 
@@ -85,7 +85,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return "\n".join(lines)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_short_sale_lending_trades_history(date: str, stock_no: str = "", name: str = "",
                                                limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
         """查詢當日融券賣出與借券賣出成交量值。
@@ -3,6 +3,7 @@
 from typing import Optional
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors, roc_to_ad
+from utils.month_range import check_range, fetch_month_range, merge_daily_rows, missing_note
 
 STOCK_DAY_URL = "https://www.twse.com.tw/exchangeReport/STOCK_DAY"
 
@@ -12,23 +13,53 @@ def _parse_number(value: str) -> str:
     return value.replace(",", "")
 
 
+def _format_row(row) -> str:
+    # row: [日期, 成交股數, 成交金額, 開盤價, 最高價, 最低價, 收盤價, 漲跌價差, 成交筆數]
+    return (
+        f"日期: {roc_to_ad(row[0])} | 開: {_parse_number(row[3])} | 高: {_parse_number(row[4])} | "
+        f"低: {_parse_number(row[5])} | 收: {_parse_number(row[6])} | 漲跌: {row[7]} | "
+        f"成交量: {_parse_number(row[1])} | 成交金額: {_parse_number(row[2])} | 筆數: {_parse_number(row[8])}"
+    )
+
+
 def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None:
     """Register historical stock day tools."""
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
-    def get_stock_history(stock_no: str, date: str) -> str:
+    @handle_api_errors(offload=True)
+    def get_stock_history(stock_no: str, date: str, end_date: str = "") -> str:
         """查詢台灣上市股票歷史日K資料。
         一次回傳指定月份的每日 OHLCV 資料，從 2010 年至今皆可查。
+        指定 end_date 時改為查詢 date～end_date 區間（最多 36 個月），各月份並行查詢後合併為一個序列，
+        畫一年的K線只需呼叫一次。
 
         Args:
             stock_no: 股票代號，例如 "2330"（台積電）、"0050"（元大台灣50）
-            date: 欲查詢的月份，格式 YYYYMMDD（日期隨意，例如 "20250101" 查 2025 年 1 月整月）
+            date: 欲查詢的月份，格式 YYYYMMDD（日期隨意，例如 "20250101" 查 2025 年 1 月整月）；
+                指定 end_date 時為區間起始日
+            end_date: 區間結束日，格式 YYYYMMDD，例如 "20251231"。留空則只查 date 所在月份
 
         Returns:
-            該月份每日交易資料，含日期(西元)、開盤價、最高價、最低價、收盤價、成交量、成交金額
+            該月份（或區間內）每日交易資料，含日期(西元)、開盤價、最高價、最低價、收盤價、成交量、成交金額
         """
+        security = _client.security(stock_no)
+        if security is not None and security.market == "otc":
+            # STOCK_DAY only covers TWSE-listed securities; skip a request that cannot match.
+            return f"{stock_no} {security.name} 為上櫃股票，此工具僅支援上市股票；上櫃行情請使用 get_otc_daily"
+
+        if end_date:
+            span, error = check_range(date, end_date)
+            if span is None:
+                return error
+            result = fetch_month_range(_client, STOCK_DAY_URL, {"response": "json", "stockNo": stock_no}, *span)
+            rows = merge_daily_rows(result)
+            if not rows:
+                return f"查無 {stock_no} 在 {date}～{end_date} 的交易資料"
+            lines = [f"【{stock_no} 歷史日K {span[0]:%Y-%m-%d}～{span[1]:%Y-%m-%d}（共 {len(rows)} 個交易日）】\n"]
+            lines.extend(_format_row(row) for row in rows)
+            return "\n".join(lines) + missing_note(result)
+
         resp = _client.fetch_json(
             STOCK_DAY_URL,
             params={"response": "json", "stockNo": stock_no, "date": date},
@@ -43,23 +74,6 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
 
         title = resp.get("title", f"{stock_no} 歷史日K")
         lines = [f"【{title}】\n"]
-
-        for row in data:
-            # row: [日期, 成交股數, 成交金額, 開盤價, 最高價, 最低價, 收盤價, 漲跌價差, 成交筆數]
-            ad_date = roc_to_ad(row[0])
-            volume = _parse_number(row[1])
-            trade_value = _parse_number(row[2])
-            open_price = _parse_number(row[3])
-            high = _parse_number(row[4])
-            low = _parse_number(row[5])
-            close = _parse_number(row[6])
-            change = row[7]
-            transactions = _parse_number(row[8])
-
-            lines.append(
-                f"日期: {ad_date} | 開: {open_price} | 高: {high} | "
-                f"低: {low} | 收: {close} | 漲跌: {change} | "
-                f"成交量: {volume} | 成交金額: {trade_value} | 筆數: {transactions}"
-            )
+        lines.extend(_format_row(row) for row in data)
 
         return "\n".join(lines)
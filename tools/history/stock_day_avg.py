@@ -3,6 +3,7 @@
 from typing import Optional
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors, roc_to_ad
+from utils.month_range import check_range, fetch_month_range, merge_daily_rows, missing_note
 
 STOCK_DAY_AVG_URL = "https://www.twse.com.tw/exchangeReport/STOCK_DAY_AVG"
 
@@ -12,17 +13,36 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
-    def get_stock_monthly_avg_history(stock_no: str, date: str) -> str:
+    @handle_api_errors(offload=True)
+    def get_stock_monthly_avg_history(stock_no: str, date: str, end_date: str = "") -> str:
         """查詢個股每月均價，適合快速評估月線趨勢。
+        指定 end_date 時改為查詢 date～end_date 區間（最多 36 個月），合併每日資料並列出各月平均收盤價。
 
         Args:
             stock_no: 股票代號，例如 "2330"
-            date: 查詢月份 YYYYMMDD（日期隨意，例如 "20250101" 查 2025 年 1 月）
+            date: 查詢月份 YYYYMMDD（日期隨意，例如 "20250101" 查 2025 年 1 月）；指定 end_date 時為區間起始日
+            end_date: 區間結束日，格式 YYYYMMDD。留空則只查 date 所在月份
 
         Returns:
-            該月份的每日收盤均價資料
+            該月份（或區間內）的每日收盤均價資料
         """
+        if end_date:
+            span, error = check_range(date, end_date)
+            if span is None:
+                return error
+            result = fetch_month_range(_client, STOCK_DAY_AVG_URL, {"response": "json", "stockNo": stock_no}, *span)
+            rows = merge_daily_rows(result)
+            if not rows:
+                return f"查無 {stock_no} 在 {date}～{end_date} 的月均價資料"
+            lines = [f"【{stock_no} 收盤均價 {span[0]:%Y-%m-%d}～{span[1]:%Y-%m-%d}（共 {len(rows)} 個交易日）】\n"]
+            lines.extend(f"日期: {roc_to_ad(row[0])} | 收盤均價: {row[1] if len(row) > 1 else 'N/A'}" for row in rows)
+            # Each month's summary row (e.g. "月平均收盤價") covers the whole month.
+            summaries = [(m.month, row) for m in result.months for row in m.rows if "/" not in row[0]]
+            if summaries:
+                lines.append("\n各月統計：")
+                lines.extend(f"{month:%Y-%m} {row[0]}: {row[1] if len(row) > 1 else 'N/A'}" for month, row in summaries)
+            return "\n".join(lines) + missing_note(result)
+
         resp = _client.fetch_json(
             STOCK_DAY_AVG_URL,
             params={"response": "json", "stockNo": stock_no, "date": date},
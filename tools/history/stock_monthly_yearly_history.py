@@ -13,7 +13,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors(use_code_param=True)
+    @handle_api_errors(use_code_param=True, offload=True)
     def get_stock_monthly_history(stock_no: str, date: str) -> str:
         """查詢個股月成交資訊（最高價、最低價、加權平均價、週轉率）。
         與 get_stock_monthly_avg_history（每日的月均價序列）不同，此工具是「每月一筆」的彙總。
@@ -51,7 +51,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return "\n".join(lines)
 
     @mcp.tool
-    @handle_api_errors(use_code_param=True)
+    @handle_api_errors(use_code_param=True, offload=True)
     def get_stock_yearly_history(stock_no: str) -> str:
         """查詢個股歷年成交資訊（最高價、最低價、收盤平均價），資料可回溯數十年。
         與 get_stock_monthly_history（單一年度逐月）互補，此工具是「每年一筆」的長期彙總，
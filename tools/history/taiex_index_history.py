@@ -3,28 +3,50 @@
 from typing import Optional
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors
+from utils.month_range import check_range, fetch_month_range, merge_daily_rows, missing_note
 
 MI_5MINS_HIST_URL = "https://www.twse.com.tw/rwd/zh/TAIEX/MI_5MINS_HIST"
 
 
+def _format_row(row) -> str:
+    # row: 日期,開盤指數,最高指數,最低指數,收盤指數
+    d, o, h, l, c = row
+    return f"{d} | 開:{o} 高:{h} 低:{l} 收:{c}"
+
+
 def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None:
     """Register TAIEX daily OHLC history tools."""
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
-    def get_taiex_index_history(date: str) -> str:
+    @handle_api_errors(offload=True)
+    def get_taiex_index_history(date: str, end_date: str = "") -> str:
         """查詢發行量加權股價指數（大盤）每日開高低收歷史資料。
         與個股的 get_stock_history 對應，但查的是大盤指數本身，適合大盤走勢/K線分析。
         與 get_market_historical_index（openapi 版）不同：openapi 版只回傳最近約 12 個交易日的
         滾動視窗，無法指定過去月份；此工具可查任意過去月份。
+        指定 end_date 時改為查詢 date～end_date 區間（最多 36 個月），合併為一個序列。
 
         Args:
-            date: 欲查詢的月份，格式 YYYYMMDD（日期隨意，例如 "20260601" 查 2026 年 6 月整月）
+            date: 欲查詢的月份，格式 YYYYMMDD（日期隨意，例如 "20260601" 查 2026 年 6 月整月）；
+                指定 end_date 時為區間起始日
+            end_date: 區間結束日，格式 YYYYMMDD。留空則只查 date 所在月份
 
         Returns:
-            該月份每個交易日的加權指數開盤、最高、最低、收盤指數
+            該月份（或區間內）每個交易日的加權指數開盤、最高、最低、收盤指數
         """
+        if end_date:
+            span, error = check_range(date, end_date)
+            if span is None:
+                return error
+            result = fetch_month_range(_client, MI_5MINS_HIST_URL, {"response": "json"}, *span)
+            rows = merge_daily_rows(result)
+            if not rows:
+                return f"查無 {date}～{end_date} 的加權指數歷史資料"
+            lines = [f"【發行量加權股價指數歷史資料 {span[0]:%Y-%m-%d}～{span[1]:%Y-%m-%d}（共 {len(rows)} 個交易日）】\n"]
+            lines.extend(_format_row(row) for row in rows)
+            return "\n".join(lines) + missing_note(result)
+
         resp = _client.fetch_json(
             MI_5MINS_HIST_URL,
             params={"response": "json", "date": date},
@@ -39,9 +61,6 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
 
         title = resp.get("title", f"{date[:6]} 發行量加權股價指數歷史資料")
         lines = [f"【{title}】\n"]
-        for row in data:
-            # row: 日期,開盤指數,最高指數,最低指數,收盤指數
-            d, o, h, l, c = row
-            lines.append(f"{d} | 開:{o} 高:{h} 低:{l} 收:{c}")
+        lines.extend(_format_row(row) for row in data)
 
         return "\n".join(lines)
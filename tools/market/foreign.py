@@ -10,7 +10,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_foreign_investment_by_industry() -> str:
         """查詢集中市場外資及陸資投資類股持股比率表。
 
@@ -20,7 +20,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return format_multiple_records(data) if data else ""
 
     @mcp.tool  
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_top_foreign_holdings() -> str:
         """查詢集中市場外資及陸資持股前20名彙總表。
 
@@ -11,7 +11,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
     
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_market_index_info(category: str = "major", count: int = 20, output_format: str = "detailed") -> str:
         """查詢每日收盤行情-大盤統計資訊。
 
@@ -124,28 +124,28 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_market_historical_index() -> str:
         """查詢發行量加權股價指數歷史資料。"""
         data = _client.fetch_latest_market_data("/indicesReport/MI_5MINS_HIST", count=20)
         return format_multiple_records(data)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_taiwan_island_index_history() -> str:
         """查詢寶島股價指數歷史資料。"""
         data = _client.fetch_latest_market_data("/indicesReport/FRMSA", count=20)
         return format_multiple_records(data)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_taiwan_50_index_history() -> str:
         """查詢臺灣50指數歷史資料。"""
         data = _client.fetch_latest_market_data("/indicesReport/TAI50I", count=20)
         return format_multiple_records(data)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_taiwan_total_return_index() -> str:
         """查詢發行量加權股價報酬指數。"""
         data = _client.fetch_latest_market_data("/indicesReport/MFI94U", count=20)
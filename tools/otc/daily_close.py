@@ -3,6 +3,8 @@
 from typing import Optional
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors, DEFAULT_DISPLAY_LIMIT
+from utils.quote_store import tpex_quotes
+from utils.snapshots import snapshot_rows
 
 TPEX_DAILY_CLOSE_URL = "https://www.tpex.org.tw/openapi/v1/tpex_mainboard_daily_close_quotes"
 
@@ -12,8 +14,8 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
-    def get_otc_daily(stock_no: str = "", limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
+    @handle_api_errors(offload=True)
+    def get_otc_daily(stock_no: str = "", limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0, date: str = "") -> str:
         """查詢上櫃（OTC）市場當日所有股票收盤行情。
         涵蓋台灣約 900 支上櫃股票。可指定特定股票代號只查單一個股。
 
@@ -21,14 +23,22 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
             stock_no: 股票代號（選填），若指定則只回傳該股票的收盤行情
             limit: 回傳筆數上限（預設 50）
             offset: 跳過前 N 筆（預設 0，搭配 limit 分頁；指定 stock_no 時忽略）
+            date: 資料日期 YYYYMMDD（選填，留空為最新交易日；過去日期由本機歷史快照回答）
 
         Returns:
             每支上櫃股的收盤價、漲跌、開盤、最高、最低、成交量等資料
         """
-        data = _client.fetch_json(TPEX_DAILY_CLOSE_URL)
+        data, error = snapshot_rows(_client, "tpex_mainboard_daily_close_quotes", date,
+                                    lambda: _client.fetch_json(TPEX_DAILY_CLOSE_URL))
+        if error:
+            return error
 
         if not isinstance(data, list) or not data:
             return "查無上櫃市場收盤行情資料"
+        if _client.quotes is not None:
+            day, quotes = tpex_quotes(data)
+            if day and not _client.quotes.has("otc", day):
+                _client.quotes.append("otc", day, quotes)
 
         if stock_no:
             data = [d for d in data if d.get("SecuritiesCompanyCode", "").strip() == stock_no]
@@ -39,7 +49,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         page_data = data[offset:offset + limit]
         end = min(offset + limit, total)
 
-        header = f"【上櫃市場收盤行情】（共 {total} 筆"
+        header = f"【上櫃市場收盤行情{' ' + date if date else ''}】（共 {total} 筆"
         if total > limit or offset > 0:
             header += f"，顯示第 {offset + 1}–{end} 筆"
         header += "）\n"
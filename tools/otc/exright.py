@@ -12,7 +12,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_otc_exright(stock_no: str = "") -> str:
         """查詢今日上櫃除權息股票，包含除權息基準價、股票股利、現金股利。
         可指定股票代號查詢特定股票。
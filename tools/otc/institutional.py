@@ -3,6 +3,7 @@
 from typing import Optional
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors, DEFAULT_DISPLAY_LIMIT
+from utils.snapshots import snapshot_rows
 
 TPEX_3INSTI_URL = "https://www.tpex.org.tw/openapi/v1/tpex_3insti_daily_trading"
 
@@ -18,8 +19,8 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
-    def get_otc_institutional(stock_no: str = "", limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
+    @handle_api_errors(offload=True)
+    def get_otc_institutional(stock_no: str = "", limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0, date: str = "") -> str:
         """查詢上櫃市場三大法人（外資、投信、自營商）每日買賣超資料。
         可指定特定股票代號只查單一個股。
 
@@ -27,11 +28,15 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
             stock_no: 股票代號（選填），若指定則只回傳該股票的法人買賣超
             limit: 回傳筆數上限（預設 50）
             offset: 跳過前 N 筆（預設 0，搭配 limit 分頁；指定 stock_no 時忽略）
+            date: 資料日期 YYYYMMDD（選填，留空為最新交易日；過去日期由本機歷史快照回答）
 
         Returns:
             每支上櫃股的外資/投信/自營商買進、賣出、買賣超資料
         """
-        data = _client.fetch_json(TPEX_3INSTI_URL)
+        data, error = snapshot_rows(_client, "tpex_3insti_daily_trading", date,
+                                    lambda: _client.fetch_json(TPEX_3INSTI_URL))
+        if error:
+            return error
 
         if not isinstance(data, list) or not data:
             return "查無上櫃市場三大法人買賣超資料"
@@ -45,7 +50,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         page_data = data[offset:offset + limit]
         end = min(offset + limit, total)
 
-        header = f"【上櫃三大法人買賣超】（共 {total} 筆"
+        header = f"【上櫃三大法人買賣超{' ' + date if date else ''}】（共 {total} 筆"
         if total > limit or offset > 0:
             header += f"，顯示第 {offset + 1}–{end} 筆"
         header += "）\n"
@@ -12,7 +12,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_otc_institutional_summary() -> str:
         """查詢上櫃市場三大法人（外資、投信、自營商）當日買賣超彙總，顯示整體市場層面的法人動向。
         與 get_otc_institutional（個股明細）互補。
@@ -3,6 +3,7 @@
 from typing import Optional
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors, DEFAULT_DISPLAY_LIMIT
+from utils.snapshots import snapshot_rows
 
 TPEX_MARGIN_URL = "https://www.tpex.org.tw/openapi/v1/tpex_mainboard_margin_balance"
 
@@ -12,8 +13,8 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
-    def get_otc_margin_balance(stock_no: str = "", limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
+    @handle_api_errors(offload=True)
+    def get_otc_margin_balance(stock_no: str = "", limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0, date: str = "") -> str:
         """查詢上櫃股票融資融券餘額，包含融資餘額、融券餘額、融資使用率。
         可指定股票代號只查單一個股。與上市版 get_margin_balance 對應。
 
@@ -21,11 +22,15 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
             stock_no: 股票代號（選填），若指定則只回傳該股票的融資融券資料
             limit: 回傳筆數上限（預設 50）
             offset: 跳過前 N 筆（預設 0，搭配 limit 分頁；指定 stock_no 時忽略）
+            date: 資料日期 YYYYMMDD（選填，留空為最新交易日；過去日期由本機歷史快照回答）
 
         Returns:
             每支上櫃股的融資餘額、融券餘額、融資使用率等資料
         """
-        data = _client.fetch_json(TPEX_MARGIN_URL)
+        data, error = snapshot_rows(_client, "tpex_mainboard_margin_balance", date,
+                                    lambda: _client.fetch_json(TPEX_MARGIN_URL))
+        if error:
+            return error
 
         if not isinstance(data, list) or not data:
             return "查無上櫃市場融資融券餘額資料"
@@ -39,7 +44,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         page_data = data[offset:offset + limit]
         end = min(offset + limit, total)
 
-        header = f"【上櫃融資融券餘額】（共 {total} 筆"
+        header = f"【上櫃融資融券餘額{' ' + date if date else ''}】（共 {total} 筆"
         if total > limit or offset > 0:
             header += f"，顯示第 {offset + 1}–{end} 筆"
         header += "）\n"
@@ -13,7 +13,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_otc_warning_stocks(stock_no: str = "") -> str:
         """查詢上櫃注意股票，列出當前被列為交易注意的上櫃股票及其警示原因。
         可指定股票代號查詢特定股票是否在注意名單。
@@ -45,7 +45,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return "\n".join(lines)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_otc_disposal_stocks(stock_no: str = "") -> str:
         """查詢上櫃處置股票，列出當前被列為交易處置的上櫃股票、處置期間及原因。
         可指定股票代號查詢特定股票是否在處置名單。
@@ -12,7 +12,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_realtime_quote(stock_nos: List[str]) -> str:
         """查詢台灣股票盤中即時報價，支援同時查詢多支股票。
         上市股與上櫃股皆可查，系統自動判斷前綴。
@@ -27,23 +27,24 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         if not stock_nos:
             return "請提供至少一個股票代號"
 
-        # Build ex_ch parameter: try tse_ first for all stocks
+        # Build ex_ch parameter, routing each code to its market via the security master.
         # Format: tse_2330.tw|tse_0050.tw|otc_6547.tw
-        ex_ch_parts = []
-        for code in stock_nos:
-            code = code.strip()
-            # OTC stocks typically have codes starting with certain patterns,
-            # but we'll try tse_ first and check results
-            ex_ch_parts.append(f"tse_{code}.tw")
-
-        ex_ch = "|".join(ex_ch_parts)
+        # Codes the master does not know (yet) are tried as tse_ first and checked below.
+        codes = [code.strip() for code in stock_nos]
+        markets = {}
+        for code in codes:
+            security = _client.security(code)
+            markets[code] = security.market if security else None
+
+        ex_ch = "|".join(f"{markets[code] or 'tse'}_{code}.tw" for code in codes)
         resp = _client.fetch_json(MIS_URL, params={"ex_ch": ex_ch, "json": 1, "delay": 0})
 
-        msg_array = resp.get("msgArray", [])
+        # Copy: responses are shared via the client cache and must not be mutated.
+        msg_array = list(resp.get("msgArray", []))
 
-        # Check for stocks that returned no data (might be OTC)
+        # Check for unrouted stocks that returned no data (might be OTC)
         found_codes = {item.get("c") for item in msg_array if item.get("z") != "-" or item.get("y")}
-        missing = [code.strip() for code in stock_nos if code.strip() not in found_codes]
+        missing = [code for code in codes if markets[code] is None and code not in found_codes]
 
         # Retry missing stocks with otc_ prefix
         if missing:
@@ -3,6 +3,7 @@
 from typing import Optional
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors
+from utils.snapshots import snapshot_rows
 from .futures_position import TAIFEX_HEADERS
 
 TAIFEX_FUT_REPORT_URL = "https://openapi.taifex.com.tw/v1/DailyMarketReportFut"
@@ -13,19 +14,23 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
-    def get_daily_futures_market_report(contract: str = "TX") -> str:
+    @handle_api_errors(offload=True)
+    def get_daily_futures_market_report(contract: str = "TX", date: str = "") -> str:
         """查詢期貨每日交易行情，包含開高低收、成交量、未平倉量等資訊。
         常用契約代碼：TX（臺指期貨）、MTX（小型臺指）、ZEF（電子期貨）、ZTF（金融期貨）。
         留空 contract 可列出所有可用契約代碼。
 
         Args:
             contract: 期貨契約代碼，例如 TX、MTX。留空則列出所有可用契約代碼。
+            date: 資料日期 YYYYMMDD（選填，留空為最新交易日；過去日期由本機歷史快照回答）
 
         Returns:
             指定契約的每日交易行情，包含各到期月份及一般／盤後交易時段資料
         """
-        data = _client.fetch_json(TAIFEX_FUT_REPORT_URL, headers=TAIFEX_HEADERS)
+        data, error = snapshot_rows(_client, "DailyMarketReportFut", date,
+                                    lambda: _client.fetch_json(TAIFEX_FUT_REPORT_URL, headers=TAIFEX_HEADERS))
+        if error:
+            return error
 
         if not isinstance(data, list) or not data:
             return "查無期貨每日交易行情資料"
@@ -69,11 +74,12 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return "\n".join(lines)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_daily_options_market_report(
         contract: str = "TXO",
         call_put: str = "",
         limit: int = 30,
+        date: str = "",
     ) -> str:
         """查詢選擇權每日交易行情，篩選有成交量的履約價資料，按成交量排序。
         常用契約代碼：TXO（臺指選擇權）、TEO（電子選擇權）、TFO（金融選擇權）。
@@ -83,11 +89,15 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
             contract: 選擇權契約代碼，例如 TXO。留空則列出所有可用契約代碼。
             call_put: 篩選買賣權，填「買權」或「賣權」，留空則顯示全部。
             limit: 顯示筆數上限（按成交量由大到小），預設 30。
+            date: 資料日期 YYYYMMDD（選填，留空為最新交易日；過去日期由本機歷史快照回答）
 
         Returns:
             有成交量的選擇權每日交易行情，按成交量由大到小排列
         """
-        data = _client.fetch_json(TAIFEX_OPT_REPORT_URL, headers=TAIFEX_HEADERS)
+        data, error = snapshot_rows(_client, "DailyMarketReportOpt", date,
+                                    lambda: _client.fetch_json(TAIFEX_OPT_REPORT_URL, headers=TAIFEX_HEADERS))
+        if error:
+            return error
 
         if not isinstance(data, list) or not data:
             return "查無選擇權每日交易行情資料"
@@ -97,21 +107,23 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
             return f"可用選擇權契約代碼（共 {len(contracts)} 種）：\n" + "、".join(contracts)
 
         contract = contract.upper()
-        filtered = [x for x in data if x.get("Contract") == contract]
+        # Filter and rank on typed columns parsed once per cached report.
+        table = _client.columns(data)
+        positions = table.where("Contract", lambda c: c == contract)
 
-        if not filtered:
+        if not positions:
             contracts = sorted(set(x.get("Contract", "") for x in data))
             return f"查無契約代碼 {contract} 的資料。可用代碼：{', '.join(contracts[:30])}"
 
         if call_put in ("買權", "賣權"):
-            filtered = [x for x in filtered if x.get("CallPut") == call_put]
-
-        with_volume = [x for x in filtered if x.get("Volume", "0") != "0"]
-
-        try:
-            with_volume.sort(key=lambda x: int(x.get("Volume", "0")), reverse=True)
-        except (ValueError, TypeError):
-            pass
+            positions = table.where("CallPut", lambda c: c == call_put, positions)
+        filtered = table.take(positions)
+
+        if "Volume" in table.columns:
+            traded = table.where("Volume", lambda v: v == v and v != 0, positions, numeric=True)
+            with_volume = table.take(table.rank("Volume", descending=True, positions=traded, numeric=True))
+        else:
+            with_volume = []
 
         total = len(with_volume)
         shown = with_volume[:limit]
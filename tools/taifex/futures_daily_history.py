@@ -5,12 +5,16 @@ download responses, reused by institutional_futures_history.py — the same patt
 TAIFEX_HEADERS living in futures_position.py and being imported by sibling modules.
 """
 
+import codecs
 import csv
-import io
-from datetime import datetime
-from typing import List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import chain, islice
+from typing import AbstractSet, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors
+from utils.spool import CHUNK_SIZE, Body, chunks_of
 from .futures_position import TAIFEX_HEADERS
 
 # www.taifex.com.tw's HTML-form download endpoint — distinct from openapi.taifex.com.tw's
@@ -22,44 +26,238 @@ FUT_DATA_DOWN_URL = "https://www.taifex.com.tw/cht/3/futDataDown"
 
 MAX_SPAN_DAYS = 31
 
+# Longest range the *Down history tools accept; days not cached yet are fetched in
+# server-sized windows planned by plan_windows.
+MAX_RANGE_DAYS = 366
+
+# Windows fetched at once; the www.taifex.com.tw rate limit still spaces the requests.
+RANGE_WORKERS = 4
+
+# Bytes decoded per step when streaming a download body.
+CSV_CHUNK_SIZE = CHUNK_SIZE
+
+# Column positions shared by futDataDown and optDataDown rows.
+CONTRACT_COL, MONTH_COL, CALL_PUT_COL, SESSION_COL = 1, 2, 4, 17
+
+Row = List[str]
+RowFilter = Callable[[Row], bool]
+
 
 def parse_yyyymmdd(value: str) -> datetime:
     return datetime.strptime(value, "%Y%m%d")
 
 
-def decode_and_parse_csv(body: bytes) -> Optional[Tuple[List[str], List[List[str]]]]:
-    """Decode a Big5 CSV response body from a www.taifex.com.tw download endpoint.
+def _decoded_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Big5-decode a byte stream incrementally and yield it line by line ("\n" kept).
 
-    These endpoints return an HTML alert page (not an HTTP error status) when the query is
-    rejected (bad/out-of-range dates), so that case is detected here and signaled as None
-    rather than surfaced as parsed rows. Returns (header, data_rows) on success.
+    The incremental decoder carries a double-byte character split across chunks over to
+    the next one, so only one chunk and one partial line are held at a time.
     """
-    text = body.decode("big5", errors="replace")
-    if "DateTime error" in text or text.lstrip().lower().startswith("<html"):
-        return None
+    decoder = codecs.getincrementaldecoder("big5")(errors="replace")
+    pending = ""
+    for chunk in chunks:
+        lines = (pending + decoder.decode(chunk)).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
 
-    rows = list(csv.reader(io.StringIO(text)))
-    if len(rows) < 2:
+
+def iter_csv(body: Union[Body, Iterable[bytes]],
+             chunk_size: int = CSV_CHUNK_SIZE) -> Optional[Tuple[Row, Iterator[Row]]]:
+    """Stream a Big5 CSV download: (header, lazy iterator of data rows), or None for an error page.
+
+    ``body`` is the whole response (``bytes`` or the memory map ``fetch_spooled`` returns
+    for large downloads) or an iterable of byte chunks. Rows are decoded and
+    split only as the iterator is consumed, so a caller that filters or stops early never
+    holds the decoded text or the full row list. Rows too short for the header or with
+    an empty first column (trailing blank lines) are skipped.
+    """
+    lines = _decoded_lines(chunks_of(body, chunk_size))
+    first = next((line for line in lines if line.strip()), None)
+    # These endpoints answer a rejected query (bad/out-of-range dates) with an HTML alert
+    # page rather than an HTTP error status.
+    if first is None or "DateTime error" in first or first.lstrip().startswith("<"):
         return None
 
-    header, data_rows = rows[0], rows[1:]
+    reader = csv.reader(chain([first], lines))
+    header = next(reader)
     # Tolerate a 1-column length mismatch: some endpoints (e.g. optDataDown) have a
     # trailing comma in the header row that isn't present in data rows.
     min_cols = len(header) - 1
-    data_rows = [r for r in data_rows if len(r) >= min_cols and r[0].strip()]
+    rows = (r for r in reader if r and len(r) >= min_cols and r[0].strip())
+    return header, rows
+
+
+@dataclass(frozen=True)
+class ColumnMatch:
+    """Row predicate requiring each column position to equal its value (stripped).
+
+    Hashable, so a filtered range can be cached per filter (see ``fetch_csv_range``).
+    """
+
+    criteria: Tuple[Tuple[int, str], ...]
+
+    def __call__(self, row: Row) -> bool:
+        return all(len(row) > col and row[col].strip() == value for col, value in self.criteria)
+
+
+def match_columns(criteria: Dict[int, str]) -> Optional[ColumnMatch]:
+    """Row predicate requiring each column position to equal its value (stripped).
+
+    Empty values are ignored; None when nothing is left to match.
+    """
+    wanted = tuple((col, value.strip()) for col, value in criteria.items() if value and value.strip())
+    if not wanted:
+        return None
+    return ColumnMatch(wanted)
+
+
+def decode_and_parse_csv(body: Body, where: Optional[RowFilter] = None,
+                         limit: Optional[int] = None) -> Optional[Tuple[Row, List[Row]]]:
+    """Decode a Big5 CSV response body from a www.taifex.com.tw download endpoint.
+
+    Returns (header, data_rows), keeping only rows matching ``where`` and stopping after
+    ``limit`` of them; None for an HTML error page or when no row is left.
+    """
+    parsed = iter_csv(body)
+    if parsed is None:
+        return None
+
+    header, rows = parsed
+    if where is not None:
+        rows = filter(where, rows)
+    data_rows = list(islice(rows, limit))
     if not data_rows:
         return None
 
     return header, data_rows
 
 
+Window = Tuple[datetime, datetime]
+
+
+def _day(d: datetime) -> str:
+    return d.strftime("%Y%m%d")
+
+
+def plan_windows(missing: Sequence[datetime], span_days: int, skippable: AbstractSet[str] = frozenset()) -> List[Window]:
+    """Cover the ``missing`` days (ascending) with as few server-sized windows as possible.
+
+    A window spans at most ``span_days`` ((end - start).days <= span_days) and only
+    covers missing days, except that it may run across ``skippable`` days (YYYYMMDD;
+    cached days without trading such as weekends) instead of being cut in two.
+    """
+    windows: List[Window] = []
+    for d in missing:
+        if windows:
+            first, last = windows[-1]
+            gap = (last + timedelta(days=i) for i in range(1, (d - last).days))
+            if (d - first).days <= span_days and all(_day(g) in skippable for g in gap):
+                windows[-1] = (first, d)
+                continue
+        windows.append((d, d))
+    return windows
+
+
+def _row_day(row: Row) -> str:
+    """A row's trading date as YYYYMMDD ("2026/06/01" or "2026/6/1" -> "20260601")."""
+    parts = row[0].strip().replace("-", "/").split("/")
+    try:
+        year, month, day = (int(p) for p in parts)
+    except ValueError:
+        return "".join(ch for ch in row[0] if ch.isdigit())
+    return f"{year:04d}{month:02d}{day:02d}"
+
+
+def fetch_csv_range(client: TWSEAPIClient, url: str, form: Dict[str, Any], start: datetime, end: datetime,
+                    span_days: int, where: Optional[RowFilter] = None) -> Optional[List[Row]]:
+    """Rows of ``start``..``end`` from a *Down form, in date order, fetched only where not cached.
+
+    Rows are kept per trading day, keyed by (endpoint, form, filter, day), through
+    ``client.cached_days`` / ``store_days``: a range overlapping earlier ones only
+    downloads its missing days, in as few windows as ``plan_windows`` allows (fetched
+    concurrently, each parsed as it streams and filtered by ``where``), and is served
+    from the union. Only ``match_columns`` filters are cacheable; any other ``where``
+    fetches the whole range. None when nothing was cached and no window answered with a CSV.
+    """
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    scope = None
+    if where is None or isinstance(where, ColumnMatch):
+        scope = (url, tuple(sorted((str(k), str(v)) for k, v in form.items())),
+                 where.criteria if where is not None else ())
+    known = client.cached_days(scope, [_day(d) for d in days]) if scope is not None else {}
+    missing = [d for d in days if _day(d) not in known]
+    windows = plan_windows(missing, span_days, {day for day, rows in known.items() if not rows})
+
+    def _one(window: Window) -> Optional[Dict[str, List[Row]]]:
+        # With a scope the parsed days go to the disk cache; the window body need not.
+        body = client.fetch_spooled(
+            url,
+            method="POST",
+            headers=TAIFEX_HEADERS,
+            data={**form,
+                  "queryStartDate": window[0].strftime("%Y/%m/%d"),
+                  "queryEndDate": window[1].strftime("%Y/%m/%d")},
+            persist=scope is None,
+        )
+        parsed = iter_csv(body)
+        if parsed is None:
+            return None
+        _header, rows = parsed
+        if where is not None:
+            rows = filter(where, rows)
+        # Every day of the window gets a row set, so days without trading are cached too;
+        # rows dated outside the window are dropped.
+        by_day: Dict[str, List[Row]] = {_day(window[0] + timedelta(days=i)): []
+                                        for i in range((window[1] - window[0]).days + 1)}
+        for r in rows:
+            bucket = by_day.get(_row_day(r))
+            if bucket is not None:
+                bucket.append(r)
+        return by_day
+
+    fetched: Dict[str, List[Row]] = {}
+    answered = bool(known)
+    if windows:
+        with ThreadPoolExecutor(max_workers=min(RANGE_WORKERS, len(windows))) as pool:
+            for by_day in pool.map(_one, windows):
+                if by_day is not None:
+                    answered = True
+                    fetched.update(by_day)
+    if scope is not None and fetched:
+        client.store_days(scope, fetched)
+    if not answered:
+        return None
+    rows_by_day = {**known, **fetched}
+    return [r for d in days for r in rows_by_day.get(_day(d), ())]
+
+
+def check_span(start_date: str, end_date: str,
+               max_days: int = MAX_RANGE_DAYS) -> Tuple[Optional[Window], str]:
+    """Validate a YYYYMMDD range for a *Down tool: ``((start, end), "")`` or ``(None, message)``."""
+    try:
+        start_dt = parse_yyyymmdd(start_date)
+        end_dt = parse_yyyymmdd(end_date)
+    except ValueError:
+        return None, f"日期格式錯誤，請使用 YYYYMMDD 格式（例如 20260601），收到：start_date={start_date}, end_date={end_date}"
+    if start_dt > end_dt:
+        return None, f"起始日期 {start_date} 不可晚於結束日期 {end_date}"
+    if (end_dt - start_dt).days > max_days:
+        return None, f"查詢區間不可超過 {max_days} 天（收到 {(end_dt - start_dt).days} 天），請縮小 start_date～end_date 範圍後重試"
+    return (start_dt, end_dt), ""
+
+
 def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None:
     """Register TAIFEX futures daily OHLC history tools."""
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
-    def get_futures_daily_history(start_date: str, end_date: str, contract: str = "TX") -> str:
+    @handle_api_errors(offload=True)
+    def get_futures_daily_history(start_date: str, end_date: str, contract: str = "TX",
+                                  contract_month: str = "", session: str = "") -> str:
         """查詢期貨每日OHLC歷史行情（可回溯查詢，非僅最新一日）。
         資料來源為期交所網站下載頁面（www.taifex.com.tw），非 openapi.taifex.com.tw
         （openapi 版的 get_daily_futures_market_report 僅能查最新一個交易日，無法回溯）。
@@ -67,43 +265,28 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
 
         Args:
             start_date: 起始日期，格式 YYYYMMDD，例如 "20260601"
-            end_date: 結束日期，格式 YYYYMMDD。與 start_date 區間不可超過一個月
+            end_date: 結束日期，格式 YYYYMMDD。區間超過一個月時自動分段並行查詢後合併（最長一年）
             contract: 期貨契約代碼，預設 TX（臺股期貨）。其他常用：MTX（小型臺指）、
                 TE（電子期貨）、TF（金融期貨）。與 get_institutional_traders_by_futures_history
                 的契約代碼（TXF/EXF/FXF...）為不同代碼系統，不可混用
+            contract_month: 到期月份，例如「202606」，留空則顯示全部月份
+            session: 交易時段「一般」或「盤後」，留空則兩者皆顯示
 
         Returns:
             區間內每個交易日、每個到期月份、一般與盤後時段的開高低收、成交量、未平倉資訊
         """
-        try:
-            start_dt = parse_yyyymmdd(start_date)
-            end_dt = parse_yyyymmdd(end_date)
-        except ValueError:
-            return f"日期格式錯誤，請使用 YYYYMMDD 格式（例如 20260601），收到：start_date={start_date}, end_date={end_date}"
-
-        if start_dt > end_dt:
-            return f"起始日期 {start_date} 不可晚於結束日期 {end_date}"
-        if (end_dt - start_dt).days > MAX_SPAN_DAYS:
-            return f"查詢區間不可超過一個月（收到 {(end_dt - start_dt).days} 天），請縮小 start_date～end_date 範圍後重試"
+        span, error = check_span(start_date, end_date)
+        if span is None:
+            return error
 
         contract = contract.strip().upper()
-        body = _client.fetch_bytes(
-            FUT_DATA_DOWN_URL,
-            method="POST",
-            headers=TAIFEX_HEADERS,
-            data={
-                "down_type": "1",
-                "commodity_id": contract,
-                "commodity_id2": "",
-                "queryStartDate": start_dt.strftime("%Y/%m/%d"),
-                "queryEndDate": end_dt.strftime("%Y/%m/%d"),
-            },
+        data_rows = fetch_csv_range(
+            _client, FUT_DATA_DOWN_URL, {"down_type": "1", "commodity_id": contract, "commodity_id2": ""},
+            *span, MAX_SPAN_DAYS, where=match_columns({MONTH_COL: contract_month, SESSION_COL: session}),
         )
-        parsed = decode_and_parse_csv(body)
-        if parsed is None:
+        if not data_rows:
             return f"查無契約 {contract} 在 {start_date}～{end_date} 的行情資料，請確認契約代碼是否正確、日期區間是否為交易日"
 
-        _header, data_rows = parsed
         lines = [f"【期貨每日OHLC歷史行情】契約:{contract} 區間:{start_date}~{end_date}（共 {len(data_rows)} 筆）\n"]
         for r in data_rows:
             date, _contract, month, o, h, l, c = r[0], r[1], r[2].strip(), r[3], r[4], r[5], r[6]
@@ -18,7 +18,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_futures_institutional() -> str:
         """查詢三大法人期貨與選擇權每日交易資訊，為判斷市場方向的重要指標。
         外資期貨淨部位為台股最常被引用的籌碼指標之一。
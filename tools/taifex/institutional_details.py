@@ -38,7 +38,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_institutional_traders_by_futures(contract_code: str = "") -> str:
         """查詢三大法人依各期貨契約分類的交易資料，可觀察各期貨商品的法人買賣情況。
         留空 contract_code 可列出所有可用契約名稱。
@@ -76,7 +76,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return "\n".join(lines)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_institutional_traders_by_options(contract_code: str = "") -> str:
         """查詢三大法人依各選擇權契約分類的交易資料，可觀察各選擇權商品的法人買賣情況。
         留空 contract_code 可列出所有可用契約名稱。
@@ -114,7 +114,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return "\n".join(lines)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_institutional_traders_calls_puts(
         contract_code: str = "",
         call_put: str = "",
@@ -3,8 +3,7 @@
 from typing import Optional
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors
-from .futures_position import TAIFEX_HEADERS
-from .futures_daily_history import parse_yyyymmdd, decode_and_parse_csv
+from .futures_daily_history import check_span, fetch_csv_range
 
 # Distinct from get_institutional_total_history (futures+options combined into one
 # number) and get_institutional_traders_by_futures_history (futures only): this endpoint
@@ -23,7 +22,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_institutional_fut_opt_split_history(start_date: str, end_date: str) -> str:
         """查詢三大法人期貨與選擇權分計交易歷史（期貨、選擇權並列顯示，可回溯查詢）。
         與 get_institutional_total_history（期貨+選擇權合計成一個數字）不同，此工具將期貨與
@@ -32,40 +31,23 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
 
         Args:
             start_date: 起始日期，格式 YYYYMMDD，例如 "20260401"
-            end_date: 結束日期，格式 YYYYMMDD。與 start_date 區間不可超過 92 天
+            end_date: 結束日期，格式 YYYYMMDD。區間超過 92 天時自動分段並行查詢後合併（最長一年）
 
         Returns:
             區間內每個交易日、每個身份別（自營商/投信/外資及陸資）的期貨與選擇權各自多空
             交易口數、契約金額（千元）、未平倉口數
         """
-        try:
-            start_dt = parse_yyyymmdd(start_date)
-            end_dt = parse_yyyymmdd(end_date)
-        except ValueError:
-            return f"日期格式錯誤，請使用 YYYYMMDD 格式（例如 20260401），收到：start_date={start_date}, end_date={end_date}"
+        span, error = check_span(start_date, end_date)
+        if span is None:
+            return error
 
-        if start_dt > end_dt:
-            return f"起始日期 {start_date} 不可晚於結束日期 {end_date}"
-        if (end_dt - start_dt).days > MAX_SPAN_DAYS:
-            return f"查詢區間不可超過 {MAX_SPAN_DAYS} 天（收到 {(end_dt - start_dt).days} 天），請縮小 start_date～end_date 範圍後重試"
-
-        body = _client.fetch_bytes(
-            FUT_AND_OPT_DATE_DOWN_URL,
-            method="POST",
-            headers=TAIFEX_HEADERS,
-            data={
-                "queryStartDate": start_dt.strftime("%Y/%m/%d"),
-                "queryEndDate": end_dt.strftime("%Y/%m/%d"),
-            },
-        )
-        parsed = decode_and_parse_csv(body)
-        if parsed is None:
+        data_rows = fetch_csv_range(_client, FUT_AND_OPT_DATE_DOWN_URL, {}, *span, MAX_SPAN_DAYS)
+        if not data_rows:
             return (
                 f"查無 {start_date}～{end_date} 的三大法人期貨/選擇權分計資料，"
                 f"日期區間可能超出資料保存範圍（約近 3 年內）或格式有誤"
             )
 
-        _header, data_rows = parsed
         lines = [
             f"【三大法人期貨/選擇權分計歷史】區間:{start_date}~{end_date}（共 {len(data_rows)} 筆）\n"
         ]
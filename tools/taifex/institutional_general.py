@@ -12,7 +12,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_institutional_general() -> str:
         """查詢三大法人（自營商、投信、外資）當日期貨與選擇權市場整體交易總表。
         與 get_futures_institutional 不同，本工具涵蓋期貨與選擇權合計的整體數據，
@@ -3,8 +3,7 @@
 from typing import Optional
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors
-from .futures_position import TAIFEX_HEADERS
-from .futures_daily_history import parse_yyyymmdd, decode_and_parse_csv
+from .futures_daily_history import check_span, fetch_csv_range
 
 # openapi.taifex.com.tw's get_institutional_general only returns the latest trading day.
 # This endpoint (www.taifex.com.tw download page) accepts an arbitrary date range. No
@@ -21,7 +20,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_institutional_total_history(start_date: str, end_date: str) -> str:
         """查詢三大法人期貨與選擇權合計總表歷史（可回溯查詢，非僅最新一日）。
         與 get_institutional_general（openapi 版，僅能查最新一個交易日）不同，此工具可查詢
@@ -30,40 +29,23 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
 
         Args:
             start_date: 起始日期，格式 YYYYMMDD，例如 "20260401"
-            end_date: 結束日期，格式 YYYYMMDD。與 start_date 區間不可超過 92 天
+            end_date: 結束日期，格式 YYYYMMDD。區間超過 92 天時自動分段並行查詢後合併（最長一年）
 
         Returns:
             區間內每個交易日、每個身份別（自營商/投信/外資及陸資）的期貨+選擇權合計多空交易口數、
             契約金額（百萬元）、未平倉資訊
         """
-        try:
-            start_dt = parse_yyyymmdd(start_date)
-            end_dt = parse_yyyymmdd(end_date)
-        except ValueError:
-            return f"日期格式錯誤，請使用 YYYYMMDD 格式（例如 20260401），收到：start_date={start_date}, end_date={end_date}"
+        span, error = check_span(start_date, end_date)
+        if span is None:
+            return error
 
-        if start_dt > end_dt:
-            return f"起始日期 {start_date} 不可晚於結束日期 {end_date}"
-        if (end_dt - start_dt).days > MAX_SPAN_DAYS:
-            return f"查詢區間不可超過 {MAX_SPAN_DAYS} 天（收到 {(end_dt - start_dt).days} 天），請縮小 start_date～end_date 範圍後重試"
-
-        body = _client.fetch_bytes(
-            TOTAL_TABLE_DATE_DOWN_URL,
-            method="POST",
-            headers=TAIFEX_HEADERS,
-            data={
-                "queryStartDate": start_dt.strftime("%Y/%m/%d"),
-                "queryEndDate": end_dt.strftime("%Y/%m/%d"),
-            },
-        )
-        parsed = decode_and_parse_csv(body)
-        if parsed is None:
+        data_rows = fetch_csv_range(_client, TOTAL_TABLE_DATE_DOWN_URL, {}, *span, MAX_SPAN_DAYS)
+        if not data_rows:
             return (
                 f"查無 {start_date}～{end_date} 的三大法人期貨+選擇權總表資料，"
                 f"日期區間可能超出資料保存範圍（約近 3 年內）或格式有誤"
             )
 
-        _header, data_rows = parsed
         lines = [f"【三大法人期貨+選擇權總表歷史】區間:{start_date}~{end_date}（共 {len(data_rows)} 筆）\n"]
         for r in data_rows:
             date, identity = r[0], r[1]
@@ -3,8 +3,7 @@
 from typing import Optional
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors
-from .futures_position import TAIFEX_HEADERS
-from .futures_daily_history import parse_yyyymmdd, decode_and_parse_csv
+from .futures_daily_history import check_span, fetch_csv_range, match_columns
 
 # openapi.taifex.com.tw's get_large_traders_futures_oi only returns the latest trading
 # day. This endpoint (www.taifex.com.tw download page) accepts an arbitrary date range,
@@ -23,7 +22,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_large_traders_futures_history(start_date: str, end_date: str, contract: str) -> str:
         """查詢期貨大額交易人未沖銷部位歷史資料（可回溯查詢，非僅最新一日）。
         與 get_large_traders_futures_oi（openapi 版，僅能查最新一個交易日）不同，此工具可
@@ -32,42 +31,26 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
 
         Args:
             start_date: 起始日期，格式 YYYYMMDD，例如 "20260601"
-            end_date: 結束日期，格式 YYYYMMDD。與 start_date 區間不可超過一個月
+            end_date: 結束日期，格式 YYYYMMDD。區間超過一個月時自動分段並行查詢後合併（最長一年）
             contract: 期貨契約代碼（必填），例如 "TX"（臺股期貨）、"MTX"（小型臺指）、
                 "TE"（電子期貨）、"TF"（金融期貨）
 
         Returns:
             區間內每個交易日，該契約各到期月份的前五大／前十大交易人買方、賣方部位數與全市場未沖銷部位數
         """
-        try:
-            start_dt = parse_yyyymmdd(start_date)
-            end_dt = parse_yyyymmdd(end_date)
-        except ValueError:
-            return f"日期格式錯誤，請使用 YYYYMMDD 格式（例如 20260601），收到：start_date={start_date}, end_date={end_date}"
-
-        if start_dt > end_dt:
-            return f"起始日期 {start_date} 不可晚於結束日期 {end_date}"
-        if (end_dt - start_dt).days > MAX_SPAN_DAYS:
-            return f"查詢區間不可超過一個月（收到 {(end_dt - start_dt).days} 天），請縮小 start_date～end_date 範圍後重試"
+        span, error = check_span(start_date, end_date)
+        if span is None:
+            return error
         if not contract or not contract.strip():
             return "contract 為必填參數，請指定期貨契約代碼（例如 TX、MTX、TE、TF）"
 
         contract = contract.strip().upper()
-        body = _client.fetch_bytes(
-            LARGE_TRADER_FUT_DOWN_URL,
-            method="POST",
-            headers=TAIFEX_HEADERS,
-            data={
-                "queryStartDate": start_dt.strftime("%Y/%m/%d"),
-                "queryEndDate": end_dt.strftime("%Y/%m/%d"),
-            },
+        data_rows = fetch_csv_range(
+            _client, LARGE_TRADER_FUT_DOWN_URL, {}, *span, MAX_SPAN_DAYS, where=match_columns({1: contract})
         )
-        parsed = decode_and_parse_csv(body)
-        if parsed is None:
+        if data_rows is None:
             return f"查無 {start_date}～{end_date} 的大額交易人未沖銷部位資料，日期區間可能無效或超出範圍"
 
-        _header, data_rows = parsed
-        data_rows = [r for r in data_rows if r[1].strip() == contract]
         if not data_rows:
             return f"查無契約 {contract} 在 {start_date}～{end_date} 的大額交易人未沖銷部位資料，請確認契約代碼是否正確"
 
@@ -6,6 +6,7 @@ import json
 from typing import Any, Dict, List, Optional
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors
+from utils.snapshots import snapshot_rows
 from .futures_position import TAIFEX_HEADERS
 
 TAIFEX_LT_FUT_URL = "https://openapi.taifex.com.tw/v1/OpenInterestOfLargeTradersFutures"
@@ -55,19 +56,23 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
-    def get_large_traders_futures_oi(contract: str = "TX") -> str:
+    @handle_api_errors(offload=True)
+    def get_large_traders_futures_oi(contract: str = "TX", date: str = "") -> str:
         """查詢期貨大額交易人（前五大、前十大）未沖銷部位資料，可觀察大戶持倉方向。
         前五大、前十大部位集中度越高，代表市場籌碼越集中。
         常用契約：TX（臺股期貨，含 MTX 折算）。
 
         Args:
             contract: 期貨契約代碼，預設 TX。留空則列出所有可用契約代碼。
+            date: 資料日期 YYYYMMDD（選填，留空為最新交易日；過去日期由本機歷史快照回答）
 
         Returns:
             前五大／前十大交易人的多空部位及市場總未平倉，區分所有交易人與特定法人
         """
-        data = _fetch_json_with_csv_fallback(_client, TAIFEX_LT_FUT_URL, TAIFEX_HEADERS)
+        data, error = snapshot_rows(_client, "OpenInterestOfLargeTradersFutures", date,
+                                    lambda: _fetch_json_with_csv_fallback(_client, TAIFEX_LT_FUT_URL, TAIFEX_HEADERS))
+        if error:
+            return error
 
         if not isinstance(data, list) or not data:
             return "查無期貨大額交易人未沖銷部位資料"
@@ -107,19 +112,23 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return "\n".join(lines)
 
     @mcp.tool
-    @handle_api_errors()
-    def get_large_traders_options_oi(contract: str = "TXO", call_put: str = "") -> str:
+    @handle_api_errors(offload=True)
+    def get_large_traders_options_oi(contract: str = "TXO", call_put: str = "", date: str = "") -> str:
         """查詢選擇權大額交易人（前五大、前十大）未沖銷部位資料，可觀察大戶選擇權布局。
         常用契約：TXO（臺指選擇權）。
 
         Args:
             contract: 選擇權契約代碼，預設 TXO。留空則列出所有可用契約代碼。
             call_put: 篩選買賣權，填「買權」或「賣權」，留空則顯示全部。
+            date: 資料日期 YYYYMMDD（選填，留空為最新交易日；過去日期由本機歷史快照回答）
 
         Returns:
             前五大／前十大交易人的買賣權多空部位，區分所有交易人與特定法人
         """
-        data = _client.fetch_json(TAIFEX_LT_OPT_URL, headers=TAIFEX_HEADERS)
+        data, error = snapshot_rows(_client, "OpenInterestOfLargeTradersOptions", date,
+                                    lambda: _client.fetch_json(TAIFEX_LT_OPT_URL, headers=TAIFEX_HEADERS))
+        if error:
+            return error
 
         if not isinstance(data, list) or not data:
             return "查無選擇權大額交易人未沖銷部位資料"
@@ -13,7 +13,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_index_futures_margin(contract: str = "") -> str:
         """查詢股價指數類期貨與選擇權保證金一覽表，包含結算保證金、維持保證金、原始保證金。
         留空 contract 則顯示全部商品。
@@ -53,7 +53,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return "\n".join(lines)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_stock_futures_margin(stock_code: str = "") -> str:
         """查詢股票期貨保證金一覽表，顯示各股票期貨的保證金率及分組級距。
         留空 stock_code 則顯示全部；可輸入股票代號（如 2330）或期貨契約代碼（如 TXF）。
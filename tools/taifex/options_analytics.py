@@ -3,6 +3,7 @@
 from typing import Optional
 from fastmcp import FastMCP
 from utils import TWSEAPIClient, handle_api_errors
+from utils.snapshots import snapshot_rows
 from .futures_position import TAIFEX_HEADERS
 
 _DELTA_URL = "https://openapi.taifex.com.tw/v1/DailyOptionsDelta"
@@ -13,11 +14,12 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_options_delta(
         contract: str = "TXO",
         contract_month: str = "",
         call_put: str = "",
+        date: str = "",
     ) -> str:
         """查詢選擇權每日 Delta 值，可用於了解各履約價的風險敏感度與隱含方向性。
         Delta 接近 1（或 -1）代表深度價內，接近 0 代表深度價外。
@@ -27,11 +29,15 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
             contract: 選擇權契約代碼，預設 TXO。留空則列出所有可用契約代碼。
             contract_month: 到期月份/週次，例如「202605」或「202605W1」。留空則列出可用月份。
             call_put: 篩選「買權」或「賣權」，留空則顯示全部。
+            date: 資料日期 YYYYMMDD（選填，留空為最新交易日；過去日期由本機歷史快照回答）
 
         Returns:
             指定條件下各履約價的 Delta 值與到期日
         """
-        data = _client.fetch_json(_DELTA_URL, headers=TAIFEX_HEADERS)
+        data, error = snapshot_rows(_client, "DailyOptionsDelta", date,
+                                    lambda: _client.fetch_json(_DELTA_URL, headers=TAIFEX_HEADERS))
+        if error:
+            return error
 
         if not isinstance(data, list) or not data:
             return "查無選擇權 Delta 資料"
@@ -76,7 +82,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return "\n".join(lines)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_options_oi_change() -> str:
         """查詢台指選擇權每日未平倉量增減，顯示今日與前一交易日的未平倉量及變化量。
         未平倉大幅增加代表新部位建立，大幅減少代表部位了結或到期。
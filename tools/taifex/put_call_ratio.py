@@ -13,7 +13,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_put_call_ratio() -> str:
         """查詢台指選擇權 Put/Call Ratio，為衡量市場恐慌與樂觀程度的情緒指標。
         PCR > 1.5 通常視為過度悲觀，< 0.5 通常視為過度樂觀。
@@ -13,7 +13,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_annual_trading_volume(contract: str = "") -> str:
         """查詢各期貨商品年成交量統計，包含年度總成交量、交易日數及平均日成交量。
         可用於長期趨勢分析與商品流動性比較。
@@ -53,7 +53,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return "\n".join(lines)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_monthly_trading_statistics() -> str:
         """查詢期貨市場月統計資料，依商品類別（股價指數、利率、商品、股票）分類，
         顯示各類型交易人（自營商、投信、外資、散戶等）的買賣量與月底未平倉量。
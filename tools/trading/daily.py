@@ -16,7 +16,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
     
     @mcp.tool
-    @handle_api_errors(use_code_param=True)
+    @handle_api_errors(use_code_param=True, offload=True)
     def get_stock_daily_trading(code: str) -> str:
         """根據股票代號查詢上市個股日成交資訊。
 
@@ -24,6 +24,9 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         """
         data = _client.fetch_company_data("/exchangeReport/STOCK_DAY_ALL", code)
         if not data:
+            security = _client.security(code)
+            if security is not None and security.market == "otc":
+                return f"{code} {security.name} 為上櫃股票，上櫃行情請使用 get_otc_daily"
             return MSG_NO_DATA_FOR_CODE.format(query_target=f"股票代號 {code}", data_type="日成交資訊")
         
         result = f"【{data.get('Name', 'N/A')} ({data.get('Code', code)})】日成交資訊\n\n"
@@ -10,7 +10,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_dividend_rights_schedule(code: str = "") -> str:
         """查詢上市股票除權除息預告表。
 
@@ -10,7 +10,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_etf_regular_investment_ranking() -> str:
         """查詢定期定額交易戶數統計排行月報表。"""
         data = _client.fetch_data("/ETFReport/ETFRank")
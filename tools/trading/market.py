@@ -7,7 +7,7 @@ from utils import (
     MSG_NO_DATA,
     handle_api_errors,
     format_list_response,
-    create_list_tool,
+    create_async_list_tool,
     DEFAULT_DISPLAY_LIMIT,
 )
 
@@ -140,7 +140,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     for endpoint, name, summary, label, empty_type, filter_field, formatter in SIMPLE_LIST_TOOLS:
-        create_list_tool(
+        create_async_list_tool(
             mcp, endpoint, name,
             _doc(summary, has_name=filter_field is not None),
             label, empty_type, formatter, filter_field=filter_field, client=client,
@@ -149,7 +149,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     # --- Tools with custom headers, branching, or multi-section output ---
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_top_20_volume_stocks(name: str = "", limit: int = 20, offset: int = 0) -> str:
         """查詢集中市場每日成交量前二十名證券。
 
@@ -203,7 +203,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return result.strip()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_after_hours_trading(code: str = "", limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
         """查詢集中市場盤後定價交易。
 
@@ -254,7 +254,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return format_list_response(traded_data, "集中市場盤後定價交易資料", formatter, limit=limit, offset=offset)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_market_gain_loss_statistics() -> str:
         """查詢集中市場漲跌證券數統計表。
 
@@ -284,7 +284,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return result.strip()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_abnormal_accumulated_notice_stocks(name: str = "", limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
         """查詢集中市場公布注意累計次數異常資訊。
 
@@ -313,7 +313,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return format_list_response(valid_data, "集中市場公布注意累計次數異常資訊", formatter, limit=limit, offset=offset)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_today_notice_stocks(name: str = "", limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
         """查詢集中市場當日公布注意股票。
 
@@ -352,7 +352,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return format_list_response(valid_data, "集中市場當日公布注意股票資料", formatter, limit=limit, offset=offset)
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_daily_securities_lending_volume(limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
         """查詢上市上櫃股票當日可借券賣出股數。
 
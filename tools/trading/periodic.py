@@ -16,14 +16,14 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
     
     @mcp.tool
-    @handle_api_errors(use_code_param=True)
+    @handle_api_errors(use_code_param=True, offload=True)
     def get_stock_monthly_average(code: str) -> str:
         """根據股票代號查詢上市個股日收盤價及月平均價。"""
         data = _client.fetch_company_data("/exchangeReport/STOCK_DAY_AVG_ALL", code)
         return format_properties_with_values_multiline(data) if data else ""
 
     @mcp.tool
-    @handle_api_errors(use_code_param=True)
+    @handle_api_errors(use_code_param=True, offload=True)
     def get_stock_monthly_trading(code: str) -> str:
         """根據股票代號查詢上市個股月成交資訊。
 
@@ -56,7 +56,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
         return result
 
     @mcp.tool
-    @handle_api_errors(use_code_param=True)
+    @handle_api_errors(use_code_param=True, offload=True)
     def get_stock_yearly_trading(code: str) -> str:
         """根據股票代號查詢上市個股年成交資訊。
 
@@ -8,6 +8,9 @@ from utils import (
     MSG_NO_DATA_FOR_CODE,
     handle_api_errors,
 )
+from utils.snapshots import snapshot_rows
+
+BWIBBU_ALL_ENDPOINT = "/exchangeReport/BWIBBU_ALL"
 
 def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None:
     """Register valuation tools with the MCP instance."""
@@ -16,13 +19,22 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
     
     @mcp.tool
-    @handle_api_errors(use_code_param=True)
-    def get_stock_valuation_ratios(code: str) -> str:
+    @handle_api_errors(use_code_param=True, offload=True)
+    def get_stock_valuation_ratios(code: str, date: str = "") -> str:
         """根據股票代號查詢上市個股日本益比、殖利率及股價淨值比（依代碼查詢）。
+        可指定 date（YYYYMMDD）查詢過去交易日，由本機歷史快照回答。
 
         回傳資訊包含日期、代號、名稱、本益比、殖利率(%)、股價淨值比。
         """
-        data = _client.fetch_company_data("/exchangeReport/BWIBBU_ALL", code)
+        if date:
+            rows, error = snapshot_rows(_client, "BWIBBU_ALL", date, lambda: _client.fetch_data(BWIBBU_ALL_ENDPOINT))
+            if error:
+                return error
+            data = next((row for row in rows if row.get("Code") == code), None)
+        else:
+            data = _client.fetch_company_data(BWIBBU_ALL_ENDPOINT, code)
+            if data and _client.snapshots is not None:
+                _client.snapshots.capture("BWIBBU_ALL", _client.fetch_data(BWIBBU_ALL_ENDPOINT))
         if not data:
             return MSG_NO_DATA_FOR_CODE.format(query_target=f"股票代號 {code}", data_type="本益比等評價指標資料")
         
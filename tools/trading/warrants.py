@@ -10,7 +10,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
     _client = client or TWSEAPIClient.get_instance()
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_warrant_basic_info(code: str = "") -> str:
         """查詢上市權證基本資料彙總表。
 
@@ -25,7 +25,7 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
             return format_multiple_records(data) if data else ""
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_warrant_daily_trading(code: str = "") -> str:
         """查詢上市認購(售)權證每日成交資料檔。
 
@@ -40,14 +40,14 @@ def register_tools(mcp: FastMCP, client: Optional[TWSEAPIClient] = None) -> None
             return format_multiple_records(data) if data else ""
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_warrant_trader_count() -> str:
         """查詢上市認購(售)權證交易人數檔。"""
         data = _client.fetch_data("/opendata/t187ap43_L")
         return format_multiple_records(data) if data else ""
 
     @mcp.tool
-    @handle_api_errors()
+    @handle_api_errors(offload=True)
     def get_warrant_yearly_issuance_statistics() -> str:
         """查詢上市認購(售)權證年度發行量概況統計表。"""
         data = _client.fetch_data("/opendata/t187ap36_L")
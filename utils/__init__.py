@@ -22,7 +22,12 @@ from .formatters import (
     create_simple_list_formatter,
     truncate,
 )
-from .tool_factory import create_company_tool, create_list_tool
+from .tool_factory import (
+    create_company_tool,
+    create_list_tool,
+    create_async_company_tool,
+    create_async_list_tool,
+)
 from .date_helper import roc_to_ad, ad_to_roc
 
 __all__ = [
@@ -49,6 +54,8 @@ __all__ = [
     "truncate",
     "create_company_tool",
     "create_list_tool",
+    "create_async_company_tool",
+    "create_async_list_tool",
     "roc_to_ad",
     "ad_to_roc",
 ]
\ No newline at end of file
@@ -1,15 +1,37 @@
 """TWSE API client utilities."""
 
+import asyncio
+import hashlib
 import requests
+import httpx
 import logging
+import threading
 import time
-from typing import List, Optional, Any, Dict
+from typing import List, Optional, Any, Awaitable, Callable, Dict, Iterable, Sequence, Tuple, TypeVar, Union
 
 from .types import TWSEDataItem
 from .config import APIConfig
+from .http_pool import HostPools
+from .rate_limit import RateLimiter
+from .cache import ResponseCache, TTLPolicy
+from .disk_cache import DiskCache, is_complete, is_historical
+from .expiry import HOLIDAY_SCHEDULE_ENDPOINT, ExpiryPolicy, TradingCalendar, taipei_today
+from .columns import ColumnTable
+from .indexes import NameIndex, build_code_index
+from .quote_store import QuoteStore
+from .records import RecordBuilder
+from .security_master import Security, SecurityMaster
+from .single_flight import SingleFlight
+from .snapshots import SnapshotArchive
+from .spool import CHUNK_SIZE, Body, Spool
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# What a cache loader returns: (value, cacheable, meta), meta holding HTTP validators.
+Loaded = Tuple[Any, bool, Optional[Dict[str, Any]]]
+
 class TWSEAPIClient:
     """Client for Taiwan Stock Exchange API."""
     
@@ -21,15 +43,48 @@ class TWSEAPIClient:
                  user_agent: str = APIConfig.USER_AGENT,
                  request_interval: float = APIConfig.REQUEST_INTERVAL,
                  verify_ssl: bool = APIConfig.VERIFY_SSL,
-                 cache_ttl: float = APIConfig.CACHE_TTL):
-        """Initialize the API client."""
+                 cache_ttl: float = APIConfig.CACHE_TTL,
+                 max_staleness: float = APIConfig.CACHE_MAX_STALENESS,
+                 disk_cache: Optional[DiskCache] = None,
+                 securities: Optional[SecurityMaster] = None,
+                 quote_store: Optional[QuoteStore] = None,
+                 snapshots: Optional[SnapshotArchive] = None):
+        """Initialize the API client.
+
+        ``disk_cache`` defaults to the on-disk cache configured by ``TWSE_DISK_CACHE_PATH``
+        (disabled when unset); ``securities`` to the security master persisted at
+        ``TWSE_SECURITY_MASTER_PATH``; ``quote_store`` to the daily quote store at
+        ``TWSE_QUOTE_STORE_PATH`` (None when unset); ``snapshots`` to the archive of
+        latest-only datasets at ``TWSE_SNAPSHOT_PATH`` (None when unset).
+        """
         self.base_url = base_url
         self.user_agent = user_agent
         self.request_interval = request_interval
         self.verify_ssl = verify_ssl
         self.cache_ttl = cache_ttl
-        self._last_request_time = 0.0
-        self._cache: Dict[str, tuple[float, List[TWSEDataItem]]] = {}
+        self.max_staleness = max_staleness
+        self._rate_limiter = RateLimiter(request_interval=request_interval)
+        self._cache = ResponseCache()
+        # Trading calendar (weekends + TWSE holiday schedule, loaded lazily) driving
+        # "valid until next publication" expiry for after-market and realtime endpoints.
+        self.calendar = TradingCalendar()
+        self._expiry = ExpiryPolicy(self.calendar) if APIConfig.CALENDAR_EXPIRY else None
+        self._ttl_policy = TTLPolicy(default_ttl=cache_ttl, expiry=self._expiry)
+        self._flights = SingleFlight()
+        self._pools = HostPools(verify_ssl=verify_ssl)
+        self._disk = disk_cache if disk_cache is not None else DiskCache.from_config()
+        # TWSE + TPEx symbol -> market table, rebuilt lazily once a day.
+        self.securities = securities if securities is not None else SecurityMaster.from_config()
+        # Whole-market daily quotes kept by the daily-close tools; None when disabled.
+        self.quotes = quote_store if quote_store is not None else QuoteStore.from_config()
+        # Latest-only datasets archived by data date; None when disabled.
+        self.snapshots = snapshots if snapshots is not None else SnapshotArchive.from_config()
+        # Keys with a stale-while-revalidate refresh running, plus counters for /stats.
+        self._refresh_lock = threading.Lock()
+        self._refreshing: set = set()
+        self._cache_counters = {
+            "stale_served": 0, "refreshes": 0, "refresh_failures": 0, "not_modified": 0, "unchanged": 0,
+        }
 
     @classmethod
     def get_instance(cls) -> 'TWSEAPIClient':
@@ -38,13 +93,61 @@ class TWSEAPIClient:
             cls._instance = cls()
         return cls._instance
 
-    def _throttle(self) -> None:
-        """Enforce the per-instance request interval."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.request_interval:
-            wait = self.request_interval - elapsed
-            logger.debug(f"Rate limiting: sleeping for {wait:.2f} seconds")
-            time.sleep(wait)
+    def _throttle(self, url: str) -> None:
+        """Wait for a token from ``url``'s per-host rate-limit bucket."""
+        self._rate_limiter.acquire(url)
+
+    async def _athrottle(self, url: str) -> None:
+        """Async counterpart of ``_throttle``; yields to the event loop while waiting."""
+        await self._rate_limiter.aacquire(url)
+
+    def _default_headers(self) -> Dict[str, str]:
+        return {"User-Agent": self.user_agent, "Accept": "application/json"}
+
+    def warm_up(self, urls: Iterable[str] = APIConfig.WARMUP_URLS, background: bool = False) -> None:
+        """Pre-open pooled connections to the given upstream hosts.
+
+        With ``background=True`` the handshakes run on a daemon thread so server
+        start-up is not delayed by a slow or unreachable host.
+        """
+        if background:
+            threading.Thread(target=self._pools.warm_up, args=(list(urls),), daemon=True,
+                             name="twse-pool-warmup").start()
+        else:
+            self._pools.warm_up(urls)
+
+    def stats(self) -> Dict[str, Any]:
+        """Runtime statistics for monitoring (exposed by server.py at ``/stats``)."""
+        return {
+            "pools": self._pools.stats(),
+            "rate_limits": self._rate_limiter.stats(),
+            "single_flight": self._flights.stats(),
+            "cache": {**self._cache.stats(), **self._counter_snapshot()},
+            "disk_cache": self._disk.stats() if self._disk is not None else None,
+            "securities": len(self.securities),
+            "quote_store": self.quotes.stats() if self.quotes is not None else None,
+            "snapshots": self.snapshots.stats() if self.snapshots is not None else None,
+        }
+
+    def close(self) -> None:
+        """Close the pooled sync sessions."""
+        self._pools.close()
+
+    async def aclose(self) -> None:
+        """Close the pooled async clients bound to the running event loop."""
+        await self._pools.aclose()
+
+    @staticmethod
+    def _request_key(method: str, url: str, params: Optional[Dict[str, Any]], data: Optional[Dict[str, Any]]) -> tuple:
+        """Identity of an upstream request, used to coalesce identical in-flight calls."""
+        def _norm(values: Optional[Dict[str, Any]]) -> tuple:
+            return tuple(sorted((str(k), str(v)) for k, v in (values or {}).items()))
+        return (method.upper(), url, _norm(params), _norm(data))
+
+    @staticmethod
+    def _validator_key(headers: Optional[Dict[str, str]]) -> tuple:
+        """Conditional-request headers, so a revalidation is never coalesced with a plain GET."""
+        return tuple(sorted((k, v) for k, v in (headers or {}).items() if k.startswith("If-")))
 
     def _request(
         self,
@@ -55,69 +158,524 @@ class TWSEAPIClient:
         method: str = "GET",
         data: Optional[Dict[str, Any]] = None,
     ) -> requests.Response:
-        """Throttle, send GET/POST, stamp last-request time, and return the response."""
-        self._throttle()
+        """Send a request, sharing the response with identical requests already in flight."""
+        return self._flights.do(
+            self._request_key(method, url, params, data) + self._validator_key(headers),
+            lambda: self._send(url, params, headers, timeout, method, data),
+        )
+
+    async def _arequest(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = APIConfig.DEFAULT_TIMEOUT,
+        method: str = "GET",
+        data: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        """Async counterpart of ``_request``."""
+        return await self._flights.ado(
+            self._request_key(method, url, params, data) + self._validator_key(headers),
+            lambda: self._asend(url, params, headers, timeout, method, data),
+        )
+
+    def _send(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = APIConfig.DEFAULT_TIMEOUT,
+        method: str = "GET",
+        data: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """Throttle per host, send GET/POST, and return the response (a 304 is returned as-is).
+
+        With ``stream`` the body is left unread for the caller to consume and close.
+        """
+        self._throttle(url)
+        logger.info(f"Fetching {method} {url} params={params}")
+        with self._pools.lease(url) as session:
+            resp = session.request(
+                method,
+                url,
+                params=params,
+                data=data,
+                headers=headers or self._default_headers(),
+                verify=self.verify_ssl,
+                timeout=timeout,
+                stream=stream,
+            )
+        if resp.status_code != 304:
+            resp.raise_for_status()
+        resp.encoding = "utf-8"
+        return resp
+
+    async def _asend(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = APIConfig.DEFAULT_TIMEOUT,
+        method: str = "GET",
+        data: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """Async counterpart of ``_send`` built on httpx.AsyncClient."""
+        await self._athrottle(url)
         logger.info(f"Fetching {method} {url} params={params}")
-        resp = requests.request(
+        client = self._pools.async_client(url)
+        request = client.build_request(
             method,
             url,
             params=params,
             data=data,
-            headers=headers or {"User-Agent": self.user_agent, "Accept": "application/json"},
-            verify=self.verify_ssl,
+            headers=headers or self._default_headers(),
             timeout=timeout,
         )
-        resp.raise_for_status()
-        self._last_request_time = time.time()
+        resp = await client.send(request, stream=stream)
+        if resp.status_code != 304:
+            resp.raise_for_status()
         resp.encoding = "utf-8"
         return resp
 
+    def _cache_key(self, kind: str, method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                   data: Optional[Dict[str, Any]] = None) -> tuple:
+        """Cache key: response kind + method + URL + normalised query params / form data."""
+        return (kind,) + self._request_key(method, url, params, data)
+
+    def _ttl_for(self, url: str, stored_at: Optional[float] = None) -> float:
+        """TTL for ``url``'s responses; calendar-driven TTLs are measured from ``stored_at``."""
+        if self.cache_ttl <= 0:
+            return 0.0
+        if self._expiry is not None and self._expiry.window_for(url) is not None:
+            self.calendar.refresh_async(lambda: self.fetch_data(HOLIDAY_SCHEDULE_ENDPOINT))
+        return self._ttl_policy.ttl_for(url, stored_at)
+
+    def _fresh(self, key: tuple, url: str) -> Optional[Any]:
+        entry = self._cache.get(key)
+        if entry is not None and time.time() - entry[0] < self._ttl_for(url, entry[0]):
+            return entry[1]
+        return None
+
+    def _count(self, name: str) -> None:
+        with self._refresh_lock:
+            self._cache_counters[name] += 1
+
+    def _counter_snapshot(self) -> Dict[str, int]:
+        with self._refresh_lock:
+            return dict(self._cache_counters, refreshing=len(self._refreshing))
+
+    def _lookup(self, key: tuple, url: str, refresh: Optional[Callable[[], Loaded]]) -> Optional[Any]:
+        """Return a cached value for ``key``, or None if the caller must load it.
+
+        With ``refresh`` (stale-while-revalidate), an expired entry younger than
+        ``ttl + self.max_staleness`` is still returned and a background refresh is started.
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        ttl = self._ttl_for(url, entry[0])
+        if ttl <= 0:
+            return None
+        age = time.time() - entry[0]
+        if age < ttl:
+            return entry[1]
+        if refresh is not None and age < ttl + self.max_staleness:
+            self._count("stale_served")
+            self._revalidate(key, refresh)
+            return entry[1]
+        return None
+
+    def _revalidate(self, key: tuple, refresh: Callable[[], Loaded]) -> None:
+        """Refresh ``key`` on a daemon thread unless a refresh for it is already running.
+
+        The refresh goes through ``_request``, so it is rate limited and coalesced like any
+        foreground fetch. On failure the stale entry stays until the staleness bound passes.
+        """
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self._cache_counters["refreshes"] += 1
+
+        def _run() -> None:
+            try:
+                def _load() -> Any:
+                    value, cacheable, meta = refresh()
+                    if cacheable and value is not None:
+                        self._cache.set(key, value, meta=meta)
+                    return value
+                self._flights.do(key, _load)
+            except Exception as e:
+                logger.warning(f"Background refresh failed for {key[2]}: {e}")
+                self._count("refresh_failures")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=_run, daemon=True, name="twse-cache-refresh").start()
+
+    def _persistent(self, url: str, params: Optional[Dict[str, Any]] = None,
+                    data: Optional[Dict[str, Any]] = None) -> bool:
+        """Whether a response may go to the disk cache (a dated request for a closed period)."""
+        return self._disk is not None and is_historical(url, params, data)
+
+    def _conditional(self, key: tuple, headers: Optional[Dict[str, str]]) -> Tuple[Optional[tuple], Dict[str, str]]:
+        """Return the current cache entry for ``key`` and request headers with its validators."""
+        entry = self._cache.entry(key)
+        headers = dict(headers or self._default_headers())
+        meta = entry[2] if entry is not None else None
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return entry, headers
+
+    def _reuse_or_parse(self, url: str, entry: Optional[tuple], resp: Any,
+                        parse: Callable[[str, Any], Tuple[Any, bool]]) -> Loaded:
+        """Turn a (possibly conditional) response into ``(value, cacheable, meta)``.
+
+        A 304, or a 200 whose body hashes the same as the cached one (hosts without
+        validators), renews the cached value as-is: no JSON decoding, and the same object
+        is returned so anything derived from it stays valid.
+        """
+        if entry is not None and resp.status_code == 304:
+            self._count("not_modified")
+            return entry[1], True, entry[2]
+        meta = {
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "digest": hashlib.blake2b(resp.content, digest_size=16).hexdigest(),
+        }
+        if entry is not None and entry[2] and entry[2].get("digest") == meta["digest"]:
+            self._count("unchanged")
+            return entry[1], True, meta
+        value, cacheable = parse(url, resp)
+        return value, cacheable, meta
+
+    def _load(self, key: tuple, url: str, parse: Callable[[str, Any], Tuple[Any, bool]],
+              params: Optional[Dict[str, Any]] = None, data: Optional[Dict[str, Any]] = None,
+              headers: Optional[Dict[str, str]] = None, timeout: float = APIConfig.DEFAULT_TIMEOUT,
+              method: str = "GET") -> Loaded:
+        """Fetch ``url`` (revalidating any cached copy) and parse it."""
+        entry, headers = self._conditional(key, headers)
+        resp = self._request(url, params=params, headers=headers, timeout=timeout, method=method, data=data)
+        return self._reuse_or_parse(url, entry, resp, parse)
+
+    async def _aload(self, key: tuple, url: str, parse: Callable[[str, Any], Tuple[Any, bool]],
+                     params: Optional[Dict[str, Any]] = None, data: Optional[Dict[str, Any]] = None,
+                     headers: Optional[Dict[str, str]] = None, timeout: float = APIConfig.DEFAULT_TIMEOUT,
+                     method: str = "GET") -> Loaded:
+        """Async counterpart of ``_load``."""
+        entry, headers = self._conditional(key, headers)
+        resp = await self._arequest(url, params=params, headers=headers, timeout=timeout, method=method, data=data)
+        return self._reuse_or_parse(url, entry, resp, parse)
+
+    def _spooled(self, entry: Optional[tuple], resp: Any, spool: Spool) -> Loaded:
+        """Finish a streamed body: like ``_reuse_or_parse``, an unchanged body keeps the cached value."""
+        meta = {
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "digest": spool.digest.hexdigest(),
+        }
+        if entry is not None and entry[2] and entry[2].get("digest") == meta["digest"]:
+            self._count("unchanged")
+            spool.close()
+            return entry[1], True, meta
+        return spool.finish(), True, meta
+
+    def _load_spooled(self, key: tuple, url: str, params: Optional[Dict[str, Any]] = None,
+                      data: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
+                      timeout: float = APIConfig.DEFAULT_TIMEOUT, method: str = "GET",
+                      max_bytes: int = APIConfig.MAX_BODY_BYTES) -> Loaded:
+        """Stream ``url``'s body into a ``Spool`` instead of reading ``resp.content``.
+
+        Not coalesced through ``_request``: a streamed response can only be read once,
+        and ``_cached`` already runs one load per key.
+        """
+        entry, headers = self._conditional(key, headers)
+        resp = self._send(url, params, headers, timeout, method, data, stream=True)
+        try:
+            if entry is not None and resp.status_code == 304:
+                self._count("not_modified")
+                return entry[1], True, entry[2]
+            spool = Spool(max_bytes)
+            try:
+                spool.check(int(resp.headers.get("Content-Length") or 0))
+                for chunk in resp.iter_content(CHUNK_SIZE):
+                    spool.write(chunk)
+                return self._spooled(entry, resp, spool)
+            finally:
+                spool.close()
+        finally:
+            resp.close()
+
+    async def _aload_spooled(self, key: tuple, url: str, params: Optional[Dict[str, Any]] = None,
+                             data: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
+                             timeout: float = APIConfig.DEFAULT_TIMEOUT, method: str = "GET",
+                             max_bytes: int = APIConfig.MAX_BODY_BYTES) -> Loaded:
+        """Async counterpart of ``_load_spooled``."""
+        entry, headers = self._conditional(key, headers)
+        resp = await self._asend(url, params, headers, timeout, method, data, stream=True)
+        try:
+            if entry is not None and resp.status_code == 304:
+                self._count("not_modified")
+                return entry[1], True, entry[2]
+            spool = Spool(max_bytes)
+            try:
+                spool.check(int(resp.headers.get("Content-Length") or 0))
+                async for chunk in resp.aiter_bytes(CHUNK_SIZE):
+                    spool.write(chunk)
+                return self._spooled(entry, resp, spool)
+            finally:
+                spool.close()
+        finally:
+            await resp.aclose()
+
+    def _cached(self, key: tuple, url: str, load: Callable[[], Loaded],
+                stale_while_revalidate: bool = False, persist: bool = False) -> T:
+        """Return the cached value for ``key`` or run ``load`` once (single-flight) and cache it.
+
+        ``load`` returns ``(value, cacheable, meta)`` so that degraded results (e.g. an invalid
+        JSON body turned into an empty list) are returned but not stored. With
+        ``stale_while_revalidate`` an expired entry is served while ``load`` refreshes it
+        in the background. With ``persist`` the disk cache is consulted before ``load``
+        and complete responses are written to it.
+        """
+        ttl = self._ttl_for(url)
+        cached = self._lookup(key, url, load if stale_while_revalidate and self.max_staleness > 0 else None)
+        if cached is not None:
+            return cached
+
+        def _load() -> T:
+            # Re-check: a flight for this key may have completed since the lookup above.
+            if ttl > 0:
+                cached = self._fresh(key, url)
+                if cached is not None:
+                    return cached
+            if persist:
+                stored = self._disk.get(key)
+                if stored is not None:
+                    if ttl > 0:
+                        self._cache.set(key, stored)
+                    return stored
+            value, cacheable, meta = load()
+            if ttl > 0 and cacheable and value is not None:
+                self._cache.set(key, value, meta=meta)
+            if persist and cacheable and is_complete(key[0], value):
+                self._disk.set(key, key[0], value)
+            return value
+
+        return self._flights.do(key, _load)
+
+    async def _acached(self, key: tuple, url: str, load: Callable[[], Awaitable[Loaded]],
+                       refresh: Optional[Callable[[], Loaded]] = None, persist: bool = False) -> T:
+        """Async counterpart of ``_cached``; shares the same cache and flight registry.
+
+        ``refresh`` is a sync loader used for the background stale-while-revalidate refresh.
+        """
+        ttl = self._ttl_for(url)
+        cached = self._lookup(key, url, refresh if self.max_staleness > 0 else None)
+        if cached is not None:
+            return cached
+
+        async def _load() -> T:
+            if ttl > 0:
+                cached = self._fresh(key, url)
+                if cached is not None:
+                    return cached
+            if persist:
+                stored = await asyncio.to_thread(self._disk.get, key)
+                if stored is not None:
+                    if ttl > 0:
+                        self._cache.set(key, stored)
+                    return stored
+            value, cacheable, meta = await load()
+            if ttl > 0 and cacheable and value is not None:
+                self._cache.set(key, value, meta=meta)
+            if persist and cacheable and is_complete(key[0], value):
+                await asyncio.to_thread(self._disk.set, key, key[0], value)
+            return value
+
+        return await self._flights.ado(key, _load)
+
+    @staticmethod
+    def _parse_list(url: str, resp: Any) -> Tuple[List[TWSEDataItem], bool]:
+        """Parse a list-endpoint response body and normalise it to a list."""
+        try:
+            # Rows become compact records as they are decoded (see utils/records.py).
+            data = resp.json(object_hook=RecordBuilder()) if APIConfig.COMPACT_ROWS else resp.json()
+        except Exception as parse_err:
+            logger.warning(f"Response is not valid JSON for {url}: {parse_err}; returning empty list")
+            return [], False
+        return (data if isinstance(data, list) else ([data] if data else [])), True
+
+    @staticmethod
+    def _parse_json(url: str, resp: Any) -> Tuple[Any, bool]:
+        return resp.json(), True
+
+    @staticmethod
+    def _parse_bytes(url: str, resp: Any) -> Tuple[bytes, bool]:
+        return resp.content, True
+
     def fetch_data(self, endpoint: str, timeout: float = APIConfig.DEFAULT_TIMEOUT) -> List[TWSEDataItem]:
         """Fetch from a TWSE OpenAPI endpoint (base_url-relative) and normalise to a list.
 
-        Results are cached in-memory per endpoint for ``self.cache_ttl`` seconds. OpenAPI
-        list endpoints (company profiles, financials, governance, etc.) change at most daily,
-        but a single prompt often triggers several tools that read the same full list within
-        seconds of each other — the cache turns those into one HTTP round-trip.
+        Results are cached in-memory per endpoint (TTL from the cache policy, ``self.cache_ttl``
+        by default). OpenAPI list endpoints (company profiles, financials, governance, etc.)
+        change at most daily, but a single prompt often triggers several tools that read the
+        same full list within seconds of each other — the cache turns those into one HTTP round-trip.
+
+        Expired lists are served stale for up to ``self.max_staleness`` seconds while a
+        background refresh fetches the new copy, so a multi-MB list is never re-downloaded
+        on the caller's time.
         """
         url = f"{self.base_url}{endpoint}"
+        key = self._cache_key("list", "GET", url)
+        try:
+            return self._cached(
+                key, url, lambda: self._load(key, url, self._parse_list, timeout=timeout),
+                stale_while_revalidate=True,
+            )
+        except Exception as e:
+            logger.error(f"Failed to fetch data from {url}: {e}")
+            raise
 
-        if self.cache_ttl > 0:
-            cached = self._cache.get(url)
-            if cached is not None and time.time() - cached[0] < self.cache_ttl:
-                return cached[1]
-
+    async def afetch_data(self, endpoint: str, timeout: float = APIConfig.DEFAULT_TIMEOUT) -> List[TWSEDataItem]:
+        """Async counterpart of ``fetch_data``; shares the same in-memory cache."""
+        url = f"{self.base_url}{endpoint}"
+        key = self._cache_key("list", "GET", url)
         try:
-            resp = self._request(url, timeout=timeout)
-            try:
-                data = resp.json()
-            except Exception as parse_err:
-                logger.warning(f"Response is not valid JSON for {url}: {parse_err}; returning empty list")
-                return []
-            result = data if isinstance(data, list) else ([data] if data else [])
-            if self.cache_ttl > 0:
-                self._cache[url] = (time.time(), result)
-            return result
+            return await self._acached(
+                key, url, lambda: self._aload(key, url, self._parse_list, timeout=timeout),
+                refresh=lambda: self._load(key, url, self._parse_list, timeout=timeout),
+            )
         except Exception as e:
             logger.error(f"Failed to fetch data from {url}: {e}")
             raise
 
-    def fetch_company_data(self, endpoint: str, code: str, timeout: float = APIConfig.DEFAULT_TIMEOUT) -> Optional[TWSEDataItem]:
-        """Instance method to fetch company data."""
+    def dataset_index(self, dataset: Any, name: str, build: Callable[[Any], T]) -> Optional[T]:
+        """``build(dataset)`` memoised with the cache entry holding ``dataset``.
+
+        ``dataset`` must be the very object a fetch returned; None if it is not cached
+        (caching disabled, entry evicted or replaced), in which case callers scan directly.
+        """
+        key = self._cache.key_of(dataset)
+        if key is None:
+            return None
+        return self._cache.derived(key, dataset, name, build)
+
+    def filter_by_name(self, dataset: Any, field: Union[str, int], needle: str,
+                       rows: Optional[Sequence[Any]] = None) -> List[Any]:
+        """Rows whose ``field`` contains ``needle``, same as a substring scan, in order.
+
+        ``rows`` defaults to ``dataset`` itself (an OpenAPI list); for a TWSE report pass
+        the table inside the fetched response. The n-gram index is built once per cached
+        version of ``dataset``.
+        """
+        rows = dataset if rows is None else rows
+        index = self.dataset_index(dataset, f"names:{field}", lambda _: NameIndex(rows, field))
+        if index is None or index.rows is not rows:
+            return NameIndex.scan(rows, field, needle)
+        return index.filter(needle)
+
+    def columns(self, dataset: Any, rows: Optional[Sequence[Any]] = None,
+                fields: Optional[Sequence[str]] = None) -> ColumnTable:
+        """Typed columns of ``dataset``, parsed once per cached version.
+
+        ``rows`` / ``fields`` default to ``dataset`` itself (an OpenAPI list of dicts);
+        for a TWSE report pass its ``data`` and ``fields``.
+        """
+        rows = dataset if rows is None else rows
+        table = self.dataset_index(dataset, "columns", lambda _: ColumnTable(rows, fields))
+        if table is None or table.rows is not rows:
+            return ColumnTable(rows, fields)
+        return table
+
+    def cached_days(self, scope: tuple, days: Iterable[str]) -> Dict[str, List[Any]]:
+        """Row sets kept by ``store_days`` for ``scope``, by YYYYMMDD day; uncached days are absent.
+
+        Looks in memory first, then in the disk cache (promoting hits to memory).
+        """
+        found: Dict[str, List[Any]] = {}
+        for day in days:
+            key = ("days",) + scope + (day,)
+            entry = self._cache.get(key)
+            if entry is not None:
+                found[day] = entry[1]
+                continue
+            stored = self._disk.get(key) if self._disk is not None else None
+            if stored is not None:
+                if self.cache_ttl > 0:
+                    self._cache.set(key, stored)
+                found[day] = stored
+        return found
+
+    def store_days(self, scope: tuple, rows_by_day: Dict[str, List[Any]]) -> None:
+        """Keep the row sets of closed days (before today, Asia/Taipei) for ``cached_days``.
+
+        A past trading day's rows never change upstream, so they are kept without a TTL,
+        in memory (bounded by the response cache) and on disk when it is enabled. An empty
+        row set records a day without trading. Today and later days are never kept.
+        """
+        today = taipei_today().strftime("%Y%m%d")
+        for day, rows in rows_by_day.items():
+            if day >= today:
+                continue
+            key = ("days",) + scope + (day,)
+            if self.cache_ttl > 0:
+                self._cache.set(key, rows)
+            if self._disk is not None:
+                self._disk.set(key, "json", rows)
+
+    def security(self, code: str) -> Optional[Security]:
+        """Market, name, industry and type of ``code`` from the security master.
+
+        None until the master is first built (it refreshes in the background at most
+        once a day), or if ``code`` is not a TWSE / TPEx symbol; callers then probe.
+        """
+        self.securities.refresh_async(self._fetch_listing)
+        return self.securities.get(code)
+
+    def _fetch_listing(self, url: str) -> List[Any]:
+        return self.fetch_data(url) if url.startswith("/") else self.fetch_json(url)
+
+    def _code_index(self, endpoint: str, data: List[TWSEDataItem]) -> Dict[Any, List[TWSEDataItem]]:
+        """Code → rows index of ``data``, built once per cached version of ``endpoint``'s list."""
+        key = self._cache_key("list", "GET", f"{self.base_url}{endpoint}")
+        return self._cache.derived(key, data, "code", build_code_index)
+
+    def fetch_company_rows(self, endpoint: str, code: str, timeout: float = APIConfig.DEFAULT_TIMEOUT) -> List[TWSEDataItem]:
+        """All rows of ``endpoint``'s list whose 公司代號 / Code / 權證代號 equals ``code``.
+
+        Lookups go through a code index cached with the list, so they are a dict hit
+        instead of a scan.
+        """
         try:
-            data = self.fetch_data(endpoint, timeout)
-            filtered_data = [
-                item for item in data
-                if isinstance(item, dict) and (
-                    item.get("公司代號") == code or
-                    item.get("Code") == code or
-                    item.get("權證代號") == code
-                )
-            ]
-            return filtered_data[0] if filtered_data else None
+            return self._code_index(endpoint, self.fetch_data(endpoint, timeout)).get(code, [])
         except Exception as e:
             logger.error(f"Failed to fetch company data for {code}: {e}")
-            return None
+            return []
+
+    async def afetch_company_rows(self, endpoint: str, code: str, timeout: float = APIConfig.DEFAULT_TIMEOUT) -> List[TWSEDataItem]:
+        """Async counterpart of ``fetch_company_rows``."""
+        try:
+            return self._code_index(endpoint, await self.afetch_data(endpoint, timeout)).get(code, [])
+        except Exception as e:
+            logger.error(f"Failed to fetch company data for {code}: {e}")
+            return []
+
+    def fetch_company_data(self, endpoint: str, code: str, timeout: float = APIConfig.DEFAULT_TIMEOUT) -> Optional[TWSEDataItem]:
+        """Instance method to fetch company data (the first matching row)."""
+        rows = self.fetch_company_rows(endpoint, code, timeout)
+        return rows[0] if rows else None
+
+    async def afetch_company_data(self, endpoint: str, code: str, timeout: float = APIConfig.DEFAULT_TIMEOUT) -> Optional[TWSEDataItem]:
+        """Async counterpart of ``fetch_company_data``."""
+        rows = await self.afetch_company_rows(endpoint, code, timeout)
+        return rows[0] if rows else None
 
     def fetch_latest_market_data(self, endpoint: str, count: Optional[int] = None, timeout: float = APIConfig.DEFAULT_TIMEOUT) -> List[TWSEDataItem]:
         """Instance method to fetch latest market data."""
@@ -133,9 +691,29 @@ class TWSEAPIClient:
 
         Used for legacy TWSE endpoints and external APIs (mis.twse.com.tw,
         tpex.org.tw, taifex.com.tw) where callers supply the complete URL.
+        Parsed responses are cached per URL + query params; callers must not mutate them.
+        Responses for a closed past date are also kept in the disk cache, if enabled.
         """
+        key = self._cache_key("json", "GET", url, params)
         try:
-            return self._request(url, params=params, headers=headers, timeout=timeout).json()
+            return self._cached(
+                key, url,
+                lambda: self._load(key, url, self._parse_json, params=params, headers=headers, timeout=timeout),
+                persist=self._persistent(url, params),
+            )
+        except Exception as e:
+            logger.error(f"Failed to fetch JSON from {url}: {e}")
+            raise
+
+    async def afetch_json(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: float = APIConfig.DEFAULT_TIMEOUT, headers: Optional[Dict[str, str]] = None) -> Any:
+        """Async counterpart of ``fetch_json``."""
+        key = self._cache_key("json", "GET", url, params)
+        try:
+            return await self._acached(
+                key, url,
+                lambda: self._aload(key, url, self._parse_json, params=params, headers=headers, timeout=timeout),
+                persist=self._persistent(url, params),
+            )
         except Exception as e:
             logger.error(f"Failed to fetch JSON from {url}: {e}")
             raise
@@ -153,13 +731,99 @@ class TWSEAPIClient:
 
         Used for HTML-form download endpoints that return non-JSON bodies (e.g. Big5-encoded
         CSV from www.taifex.com.tw's data-download pages), which callers decode themselves.
+        Bodies are cached per method + URL + query params + form data, and on disk when
+        the requested range has closed.
         """
+        key = self._cache_key("bytes", method, url, params, data)
+        try:
+            return self._cached(
+                key, url,
+                lambda: self._load(key, url, self._parse_bytes, params=params, data=data,
+                                   headers=headers, timeout=timeout, method=method),
+                persist=self._persistent(url, params, data),
+            )
+        except Exception as e:
+            logger.error(f"Failed to fetch bytes from {url}: {e}")
+            raise
+
+    async def afetch_bytes(
+        self,
+        url: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = APIConfig.DEFAULT_TIMEOUT,
+        method: str = "GET",
+    ) -> bytes:
+        """Async counterpart of ``fetch_bytes``."""
+        key = self._cache_key("bytes", method, url, params, data)
         try:
-            return self._request(url, params=params, data=data, headers=headers, timeout=timeout, method=method).content
+            return await self._acached(
+                key, url,
+                lambda: self._aload(key, url, self._parse_bytes, params=params, data=data,
+                                    headers=headers, timeout=timeout, method=method),
+                persist=self._persistent(url, params, data),
+            )
         except Exception as e:
             logger.error(f"Failed to fetch bytes from {url}: {e}")
             raise
 
+    def fetch_spooled(
+        self,
+        url: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = APIConfig.DEFAULT_TIMEOUT,
+        method: str = "GET",
+        max_bytes: int = APIConfig.MAX_BODY_BYTES,
+        persist: bool = True,
+    ) -> Body:
+        """Streaming variant of ``fetch_bytes`` for multi-megabyte downloads.
+
+        The body is read in chunks into a ``utils.spool.Spool``: small bodies come back as
+        ``bytes``, larger ones as a read-only ``mmap`` of an unlinked temporary file, so the
+        whole body never exists as one Python object. Bodies over ``max_bytes``
+        (``TWSE_MAX_BODY_BYTES``) raise ``BodyTooLarge``. Cached like ``fetch_bytes``;
+        ``persist=False`` keeps the body out of the disk cache, for callers that store
+        what they parsed from it instead.
+        """
+        key = self._cache_key("spooled", method, url, params, data)
+        try:
+            return self._cached(
+                key, url,
+                lambda: self._load_spooled(key, url, params=params, data=data, headers=headers,
+                                           timeout=timeout, method=method, max_bytes=max_bytes),
+                persist=persist and self._persistent(url, params, data),
+            )
+        except Exception as e:
+            logger.error(f"Failed to fetch spooled body from {url}: {e}")
+            raise
+
+    async def afetch_spooled(
+        self,
+        url: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = APIConfig.DEFAULT_TIMEOUT,
+        method: str = "GET",
+        max_bytes: int = APIConfig.MAX_BODY_BYTES,
+        persist: bool = True,
+    ) -> Body:
+        """Async counterpart of ``fetch_spooled``."""
+        key = self._cache_key("spooled", method, url, params, data)
+        try:
+            return await self._acached(
+                key, url,
+                lambda: self._aload_spooled(key, url, params=params, data=data, headers=headers,
+                                            timeout=timeout, method=method, max_bytes=max_bytes),
+                persist=persist and self._persistent(url, params, data),
+            )
+        except Exception as e:
+            logger.error(f"Failed to fetch spooled body from {url}: {e}")
+            raise
+
     @classmethod
     def get_json(cls, url: str, params: Optional[Dict[str, Any]] = None, timeout: float = APIConfig.DEFAULT_TIMEOUT) -> Any:
         """Static wrapper for fetch_json."""
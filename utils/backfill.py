@@ -0,0 +1,277 @@
+"""Incremental backfill of dated TWSE / TAIFEX history into the local caches.
+
+    python -m utils.backfill                          # resume every dataset up to yesterday
+    python -m utils.backfill --since 20250101         # also fill gaps back to 2025-01-01
+    python -m utils.backfill --datasets T86,MI_INDEX --interval 5
+
+Each dataset is fetched with exactly the request its tool sends, through a
+``TWSEAPIClient`` with the disk cache (``TWSE_DISK_CACHE_PATH``, required), so
+the tools then answer those days locally instead of spending the upstream rate
+budget:
+
+- T86, MI_MARGN, TWT93U, MI_QFIIS, BFIAUU, BFI82U, MI_INDEX: the dated JSON
+  reports, persisted by the disk cache; MI_INDEX also feeds the quote store
+  (``TWSE_QUOTE_STORE_PATH``) when it is enabled;
+- futDataDown (``--futures`` contracts, default TX) and pcRatioDown: the TAIFEX
+  per-day row sets (``TWSEAPIClient.store_days``), fetched a server window at a time.
+
+Progress is kept per dataset and day in a JSON ledger (``TWSE_BACKFILL_STATE_PATH``,
+default ``backfill.json`` next to the disk cache) and written after every step, so
+an interrupted run resumes where it stopped. A run covers trading days (every day for TAIFEX) from
+``--since`` (default: the earliest ledger day, or ``--lookback`` days back) up to
+``--until`` (default: yesterday, Asia/Taipei). The disk cache only keeps closed
+days, so schedule it after midnight (e.g. cron ``30 6 * * 1-6``) to ingest the
+previous trading day. Requests are spaced ``--interval`` seconds apart per host.
+Days that fail are logged and retried by the next run.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .api_client import TWSEAPIClient
+from .config import APIConfig
+from .disk_cache import DiskCache
+from .expiry import HOLIDAY_SCHEDULE_ENDPOINT, taipei_today
+from .quote_store import mi_index_stock_table, twse_quotes
+
+logger = logging.getLogger(__name__)
+
+# Day statuses recorded in the ledger: "ok" (data ingested) or "empty" (no trading /
+# nothing published). Failed days are not recorded and are retried next run.
+OK, EMPTY = "ok", "empty"
+
+# The TWSE ``stat`` of a report with nothing published for the day ("很抱歉，沒有符合條件的資料!").
+# Any other non-OK stat (throttling, "請稍後再試", maintenance) is a failure, not an empty day.
+NO_DATA_STAT = "沒有符合條件的資料"
+
+DEFAULT_LOOKBACK_DAYS = 30
+DEFAULT_INTERVAL = 3.0
+
+Fetch = Callable[[TWSEAPIClient, List[date]], Dict[date, str]]
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """A dated endpoint; ``fetch(client, days)`` ingests ``days`` (at most ``batch``) and returns their statuses.
+
+    ``every_day`` datasets also walk non-trading days, so that ranges spanning
+    weekends are fully cached (their days recorded as empty).
+    """
+
+    name: str
+    fetch: Fetch
+    batch: int = 1
+    every_day: bool = False
+
+
+def _twse_report(url: Callable[[], str], params: Callable[[str], Dict[str, str]],
+                 ingest: Optional[Callable[[TWSEAPIClient, str, dict], None]] = None) -> Fetch:
+    """One dated TWSE JSON report per day; ``url`` is read at call time (tests patch the tool's constant)."""
+    def fetch(client: TWSEAPIClient, days: List[date]) -> Dict[date, str]:
+        day = days[0].strftime("%Y%m%d")
+        resp = client.fetch_json(url(), params=params(day))
+        stat = str(resp.get("stat", "")) if isinstance(resp, dict) else ""
+        if stat != "OK":
+            if NO_DATA_STAT in stat:
+                return {days[0]: EMPTY}
+            raise RuntimeError(f"upstream answered stat={stat or resp!r}")
+        if ingest is not None:
+            ingest(client, day, resp)
+        return {days[0]: OK}
+    return fetch
+
+
+def _store_quotes(client: TWSEAPIClient, day: str, resp: dict) -> None:
+    table = mi_index_stock_table(resp)
+    if client.quotes is not None and table and table.get("data") and not client.quotes.has("tse", day):
+        client.quotes.append("tse", day, twse_quotes(table["data"]))
+
+
+def _taifex_range(url: Callable[[], str], form: Dict[str, str], span_days: int) -> Fetch:
+    """A TAIFEX *Down form over a batch of days, cached per day like the tool's own requests."""
+    from tools.taifex.futures_daily_history import _row_day, fetch_csv_range
+
+    def fetch(client: TWSEAPIClient, days: List[date]) -> Dict[date, str]:
+        start, end = (datetime.combine(d, datetime.min.time()) for d in (days[0], days[-1]))
+        rows = fetch_csv_range(client, url(), form, start, end, span_days)
+        if rows is None:
+            raise RuntimeError("no download window answered")
+        traded = {_row_day(r) for r in rows}
+        return {d: OK if d.strftime("%Y%m%d") in traded else EMPTY for d in days}
+    return fetch
+
+
+def build_datasets(futures: Sequence[str] = ("TX",)) -> List[Dataset]:
+    """The backfilled datasets, in run order, reading the URLs the tools use."""
+    from tools.history import (all_stocks_daily_close, block_trades_detail, foreign_holdings_history,
+                               institutional, institutional_amounts, margin_balance, short_sale_lending)
+    from tools.taifex import futures_daily_history, put_call_ratio_history
+
+    datasets = [
+        Dataset("MI_INDEX", _twse_report(lambda: all_stocks_daily_close.MI_INDEX_URL,
+                                         lambda d: {"response": "json", "date": d, "type": "ALLBUT0999"},
+                                         _store_quotes)),
+        Dataset("T86", _twse_report(lambda: institutional.T86_URL,
+                                    lambda d: {"response": "json", "date": d, "selectType": "ALL"})),
+        Dataset("MI_MARGN", _twse_report(lambda: margin_balance.MI_MARGN_URL,
+                                         lambda d: {"response": "json", "date": d, "selectType": "ALL"})),
+        Dataset("TWT93U", _twse_report(lambda: short_sale_lending.TWT93U_URL,
+                                       lambda d: {"response": "json", "date": d, "selectType": "ALL"})),
+        Dataset("MI_QFIIS", _twse_report(lambda: foreign_holdings_history.MI_QFIIS_URL,
+                                         lambda d: {"response": "json", "date": d, "selectType": "ALLBUT0999"})),
+        Dataset("BFIAUU", _twse_report(lambda: block_trades_detail.BFIAUU_URL,
+                                       lambda d: {"response": "json", "date": d})),
+        Dataset("BFI82U", _twse_report(lambda: institutional_amounts.BFI82U_URL,
+                                       lambda d: {"response": "json", "dayDate": d, "type": "day"})),
+    ]
+    for contract in futures:
+        contract = contract.strip().upper()
+        datasets.append(Dataset(
+            f"futDataDown:{contract}",
+            _taifex_range(lambda: futures_daily_history.FUT_DATA_DOWN_URL,
+                          {"down_type": "1", "commodity_id": contract, "commodity_id2": ""},
+                          futures_daily_history.MAX_SPAN_DAYS),
+            batch=futures_daily_history.MAX_SPAN_DAYS + 1,
+            every_day=True,
+        ))
+    datasets.append(Dataset(
+        "pcRatioDown",
+        _taifex_range(lambda: put_call_ratio_history.PC_RATIO_DOWN_URL, {}, put_call_ratio_history.MAX_SPAN_DAYS),
+        batch=put_call_ratio_history.MAX_SPAN_DAYS + 1,
+        every_day=True,
+    ))
+    return datasets
+
+
+class Ledger:
+    """Per-dataset day statuses, persisted as JSON at ``path`` after every update."""
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        self.days: Dict[str, Dict[str, str]] = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.days = json.load(f).get("datasets", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Starting a new backfill ledger; cannot read {self.path}: {e}")
+
+    def done(self, dataset: str) -> Dict[str, str]:
+        return self.days.setdefault(dataset, {})
+
+    def record(self, dataset: str, statuses: Dict[date, str]) -> None:
+        self.done(dataset).update({d.strftime("%Y%m%d"): status for d, status in statuses.items()})
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"datasets": self.days}, f, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def pending_days(client: TWSEAPIClient, done: Dict[str, str], since: Optional[date], until: date,
+                 lookback: int = DEFAULT_LOOKBACK_DAYS, every_day: bool = False) -> List[date]:
+    """Trading days (or all days) in range not yet in ``done``: gaps since the start plus everything after the last day."""
+    if since is None:
+        since = (datetime.strptime(min(done), "%Y%m%d").date() if done
+                 else until - timedelta(days=lookback))
+    days = []
+    day = since
+    while day <= until:
+        if (every_day or client.calendar.is_trading_day(day)) and day.strftime("%Y%m%d") not in done:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def run(client: TWSEAPIClient, datasets: Sequence[Dataset], ledger: Ledger, since: Optional[date],
+        until: date, lookback: int = DEFAULT_LOOKBACK_DAYS) -> int:
+    """Backfill ``datasets`` over ``since``..``until``; returns the number of failed steps."""
+    failures = 0
+    for dataset in datasets:
+        days = pending_days(client, ledger.done(dataset.name), since, until, lookback, dataset.every_day)
+        if not days:
+            logger.info(f"[{dataset.name}] up to date through {until:%Y%m%d}")
+            continue
+        logger.info(f"[{dataset.name}] {len(days)} days to ingest ({days[0]:%Y%m%d}~{days[-1]:%Y%m%d})")
+        started = time.monotonic()
+        processed = 0
+        while processed < len(days):
+            batch = [days[processed]]
+            # A batch is a run of pending days within one server window.
+            for day in days[processed + 1:]:
+                if len(batch) >= dataset.batch or (day - batch[0]).days >= dataset.batch:
+                    break
+                batch.append(day)
+            processed += len(batch)
+            label = f"{batch[0]:%Y%m%d}" + (f"~{batch[-1]:%Y%m%d}" if len(batch) > 1 else "")
+            try:
+                statuses = dataset.fetch(client, batch)
+            except Exception as e:
+                failures += 1
+                logger.warning(f"[{dataset.name}] {label} failed, will retry next run: {e}")
+                continue
+            ledger.record(dataset.name, statuses)
+            ok = sum(1 for s in statuses.values() if s == OK)
+            logger.info(f"[{dataset.name}] {label}: {ok}/{len(batch)} days with data "
+                        f"({processed}/{len(days)}, {time.monotonic() - started:.0f}s)")
+    return failures
+
+
+def _day(value: str) -> date:
+    return datetime.strptime(value, "%Y%m%d").date()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m utils.backfill", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--datasets", help="comma-separated dataset names (default: all)")
+    parser.add_argument("--since", type=_day, help="first day YYYYMMDD (default: resume from the ledger)")
+    parser.add_argument("--until", type=_day, help="last day YYYYMMDD (default: yesterday)")
+    parser.add_argument("--lookback", type=int, default=DEFAULT_LOOKBACK_DAYS,
+                        help="days back to start a dataset without ledger entries (default %(default)s)")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help="seconds between requests to the same host (default %(default)s)")
+    parser.add_argument("--futures", default="TX", help="futDataDown contracts, comma-separated (default TX)")
+    parser.add_argument("--state", default=APIConfig.BACKFILL_STATE_PATH, help="ledger file (TWSE_BACKFILL_STATE_PATH)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    disk = DiskCache.from_config()
+    if disk is None:
+        logger.error("TWSE_DISK_CACHE_PATH is not set: backfilled history would not be kept")
+        return 2
+    state = args.state or os.path.join(os.path.dirname(disk.path), "backfill.json")
+
+    datasets = build_datasets(args.futures.split(","))
+    if args.datasets:
+        wanted = {name.strip() for name in args.datasets.split(",")}
+        datasets = [d for d in datasets if d.name in wanted or d.name.split(":")[0] in wanted]
+        if not datasets:
+            logger.error(f"No dataset matches {args.datasets!r}")
+            return 2
+
+    client = TWSEAPIClient(request_interval=args.interval, disk_cache=disk)
+    try:
+        client.calendar.load(client.fetch_data(HOLIDAY_SCHEDULE_ENDPOINT))
+    except Exception as e:
+        logger.warning(f"Holiday schedule unavailable, only weekends are skipped: {e}")
+
+    until = args.until or taipei_today() - timedelta(days=1)
+    failures = run(client, datasets, Ledger(state), args.since, until, args.lookback)
+    client.close()
+    logger.info(f"Backfill finished with {failures} failed steps; ledger at {state}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
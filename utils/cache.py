@@ -0,0 +1,325 @@
+"""Thread-safe response cache for TWSEAPIClient.
+
+FastMCP may execute tools concurrently, so the cache is split into lock stripes:
+each key hashes to one stripe whose lock guards that stripe's entries. Lookups
+and stores on different stripes never contend, and each critical section is a
+dict operation, so the cache is also safe to touch from the event loop.
+
+Memory is bounded: entry sizes are estimated on store, and least recently used
+entries are evicted once the total passes ``TWSE_CACHE_MAX_BYTES``.
+
+Concurrent misses on the same key are coalesced by ``utils.single_flight``.
+
+``TTLPolicy`` decides how long each endpoint's responses stay fresh.
+"""
+
+import itertools
+import logging
+import mmap
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+from .config import APIConfig
+from .records import Record
+
+if TYPE_CHECKING:
+    from .expiry import ExpiryPolicy
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def parse_ttl_rules(spec: str) -> List[Tuple[str, float]]:
+    """Parse a ``TWSE_CACHE_TTL_RULES`` string (``<pattern>=<seconds>,...``)."""
+    rules: List[Tuple[str, float]] = []
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        try:
+            pattern, seconds = entry.rsplit("=", 1)
+            rules.append((pattern.strip(), float(seconds)))
+        except ValueError:
+            logger.warning(f"Ignoring malformed TWSE_CACHE_TTL_RULES entry: {entry!r}")
+    return rules
+
+
+class TTLPolicy:
+    """Maps a request URL to the number of seconds its responses stay fresh.
+
+    Rules are ``(pattern, ttl)`` pairs matched as substrings of ``host + path``,
+    longest pattern first. In order of precedence:
+
+    1. ``TWSE_CACHE_TTL_RULES`` overrides (or ``rules``), e.g. ``"futDataDown=600"``;
+    2. the trading-calendar ``expiry`` policy, valid until the next publication;
+    3. built-in rules (a short TTL for realtime MIS quotes);
+    4. ``default_ttl``.
+
+    A TTL of 0 disables caching for matching URLs.
+    """
+
+    DEFAULT_RULES: Tuple[Tuple[str, float], ...] = (
+        ("mis.twse.com.tw", APIConfig.REALTIME_CACHE_TTL),
+    )
+
+    def __init__(self, default_ttl: float = APIConfig.CACHE_TTL,
+                 rules: Optional[List[Tuple[str, float]]] = None,
+                 expiry: Optional["ExpiryPolicy"] = None):
+        self.default_ttl = default_ttl
+        self.expiry = expiry
+        overrides = parse_ttl_rules(APIConfig.CACHE_TTL_RULES) if rules is None else rules
+        self._overrides = sorted(overrides, key=lambda r: len(r[0]), reverse=True)
+        self._defaults = sorted(self.DEFAULT_RULES, key=lambda r: len(r[0]), reverse=True)
+
+    def ttl_for(self, url: str, stored_at: Optional[float] = None) -> float:
+        """TTL for ``url``'s responses; calendar expiry is measured from ``stored_at`` (default now)."""
+        parts = urlsplit(url)
+        target = f"{parts.netloc}{parts.path}"
+        for pattern, ttl in self._overrides:
+            if pattern in target:
+                return ttl
+        if self.expiry is not None:
+            ttl = self.expiry.ttl_for(url, time.time() if stored_at is None else stored_at)
+            if ttl is not None:
+                return ttl
+        for pattern, ttl in self._defaults:
+            if pattern in target:
+                return ttl
+        return self.default_ttl
+
+
+def estimate_size(value: Any, _sample: int = 64) -> int:
+    """Approximate deep size of a cached value in bytes.
+
+    Walks dicts, lists, tuples, strings and bytes; a spooled (memory-mapped) download
+    counts its mapped length. Long sequences (a whole-market
+    table can have tens of thousands of rows) are sampled: ``_sample`` evenly spaced
+    items are measured and the result is scaled to the full length.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, bytearray, int, float, bool)) or value is None:
+        return size
+    if isinstance(value, mmap.mmap):
+        return size + len(value)
+    if isinstance(value, Record):
+        # The schema is shared by every row of the list; only the values are per row.
+        return size + estimate_size(value.values_tuple, _sample)
+    if isinstance(value, dict):
+        items = list(value.items())
+        n = len(items)
+        step = max(1, n // _sample)
+        sampled = items[::step]
+        inner = sum(estimate_size(k, _sample) + estimate_size(v, _sample) for k, v in sampled)
+        return size + (inner * n // len(sampled) if sampled else 0)
+    if isinstance(value, (list, tuple)):
+        n = len(value)
+        step = max(1, n // _sample)
+        sampled = value[::step]
+        inner = sum(estimate_size(v, _sample) for v in sampled)
+        return size + (inner * n // len(sampled) if sampled else 0)
+    return size
+
+
+class _Stripe:
+    __slots__ = ("lock", "entries")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> [stored_at, value, size, last_access_tick, meta, derived]; least recently used first.
+        self.entries: "OrderedDict[Hashable, list]" = OrderedDict()
+
+
+class ResponseCache:
+    """Lock-striped, memory-bounded LRU cache of ``(stored_at, value)`` entries.
+
+    Each entry's size is estimated when stored. When the total exceeds
+    ``max_bytes`` the least recently used entries are evicted; a value larger than
+    ``max_entry_bytes`` is never stored. Either limit set to 0 disables it.
+    """
+
+    def __init__(self,
+                 stripes: int = APIConfig.CACHE_STRIPES,
+                 max_bytes: int = APIConfig.CACHE_MAX_BYTES,
+                 max_entry_bytes: int = APIConfig.CACHE_MAX_ENTRY_BYTES):
+        self._stripes: List[_Stripe] = [_Stripe() for _ in range(max(1, stripes))]
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._ticks = itertools.count()
+        # Guards the global counters below; never held together with a stripe lock.
+        self._lock = threading.Lock()
+        self._bytes = 0
+        # id(value) -> key of the entry holding it, for ``key_of``; ids are only
+        # recorded while the cache keeps the value alive, so they cannot be reused.
+        self._owners: Dict[int, Hashable] = {}
+        self.evictions = 0
+        self.rejected = 0
+
+    def _stripe(self, key: Hashable) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def _add_bytes(self, delta: int) -> None:
+        if delta:
+            with self._lock:
+                self._bytes += delta
+
+    def _own(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._owners[id(value)] = key
+
+    def _disown(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            if self._owners.get(id(value)) == key:
+                del self._owners[id(value)]
+
+    def get(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        """Return ``(stored_at, value)`` for ``key``, or None. Marks the entry recently used."""
+        entry = self.entry(key)
+        return None if entry is None else (entry[0], entry[1])
+
+    def entry(self, key: Hashable) -> Optional[Tuple[float, Any, Optional[Dict[str, Any]]]]:
+        """Return ``(stored_at, value, meta)`` for ``key``, or None. Marks the entry recently used."""
+        stripe = self._stripe(key)
+        with stripe.lock:
+            entry = stripe.entries.get(key)
+            if entry is None:
+                return None
+            entry[3] = next(self._ticks)
+            stripe.entries.move_to_end(key)
+            return entry[0], entry[1], entry[4]
+
+    def get_fresh(self, key: Hashable, ttl: float) -> Optional[Any]:
+        """Return the value for ``key`` if it was stored less than ``ttl`` seconds ago."""
+        entry = self.get(key)
+        if entry is not None and time.time() - entry[0] < ttl:
+            return entry[1]
+        return None
+
+    def set(self, key: Hashable, value: Any, stored_at: Optional[float] = None,
+            meta: Optional[Dict[str, Any]] = None) -> bool:
+        """Store ``value`` (with optional ``meta``, e.g. HTTP validators); return False if it
+        exceeds the per-entry size cap."""
+        size = estimate_size(value)
+        if self.max_entry_bytes > 0 and size > self.max_entry_bytes:
+            logger.debug(f"Not caching {key!r}: ~{size} bytes exceeds the per-entry cap")
+            with self._lock:
+                self.rejected += 1
+            self.pop(key)
+            return False
+        stripe = self._stripe(key)
+        with stripe.lock:
+            old = stripe.entries.pop(key, None)
+            # A renewal that keeps the same value object (e.g. a 304) keeps its derived indexes.
+            derived = old[5] if old is not None and old[1] is value else None
+            stripe.entries[key] = [time.time() if stored_at is None else stored_at, value, size,
+                                   next(self._ticks), meta, derived]
+        if old is not None and old[1] is not value:
+            self._disown(key, old[1])
+        self._own(key, value)
+        self._add_bytes(size - (old[2] if old is not None else 0))
+        self._evict()
+        return True
+
+    def key_of(self, value: Any) -> Optional[Hashable]:
+        """Key of the entry currently holding this very object, or None."""
+        with self._lock:
+            key = self._owners.get(id(value))
+        if key is None:
+            return None
+        stripe = self._stripe(key)
+        with stripe.lock:
+            entry = stripe.entries.get(key)
+            return key if entry is not None and entry[1] is value else None
+
+    def derived(self, key: Hashable, value: Any, name: str, build: Callable[[Any], T]) -> T:
+        """Return ``build(value)``, memoised on ``key``'s entry while it still holds ``value``.
+
+        Used for lookup indexes over cached datasets: built once per dataset version and
+        dropped with the entry when it is replaced or evicted. If ``value`` is not (or no
+        longer) the cached object, the result is built but not kept.
+        """
+        stripe = self._stripe(key)
+        with stripe.lock:
+            entry = stripe.entries.get(key)
+            if entry is not None and entry[1] is value:
+                if entry[5] is not None and name in entry[5]:
+                    return entry[5][name]
+            else:
+                entry = None
+        result = build(value)
+        if entry is not None:
+            with stripe.lock:
+                if stripe.entries.get(key) is entry:
+                    if entry[5] is None:
+                        entry[5] = {}
+                    entry[5][name] = result
+        return result
+
+    def _evict(self) -> None:
+        """Evict globally least recently used entries until the byte budget is met."""
+        while self.max_bytes > 0:
+            with self._lock:
+                if self._bytes <= self.max_bytes:
+                    return
+            # Each stripe's first entry is its LRU; the oldest of those is the global LRU.
+            victim: Optional[Tuple[int, _Stripe, Hashable]] = None
+            for stripe in self._stripes:
+                with stripe.lock:
+                    if stripe.entries:
+                        key, entry = next(iter(stripe.entries.items()))
+                        if victim is None or entry[3] < victim[0]:
+                            victim = (entry[3], stripe, key)
+            if victim is None:
+                return
+            _, stripe, key = victim
+            with stripe.lock:
+                entry = stripe.entries.get(key)
+                # Skip if the entry was touched or replaced since it was picked.
+                if entry is None or entry[3] != victim[0]:
+                    continue
+                del stripe.entries[key]
+            self._disown(key, entry[1])
+            with self._lock:
+                self._bytes -= entry[2]
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            entry = stripe.entries.pop(key, None)
+        if entry is None:
+            return None
+        self._disown(key, entry[1])
+        self._add_bytes(-entry[2])
+        return entry[0], entry[1]
+
+    def clear(self) -> None:
+        for stripe in self._stripes:
+            with stripe.lock:
+                freed = sum(entry[2] for entry in stripe.entries.values())
+                stripe.entries.clear()
+            self._add_bytes(-freed)
+        with self._lock:
+            self._owners.clear()
+
+    def __len__(self) -> int:
+        total = 0
+        for stripe in self._stripes:
+            with stripe.lock:
+                total += len(stripe.entries)
+        return total
+
+    def stats(self) -> Dict[str, int]:
+        entries = len(self)
+        with self._lock:
+            return {
+                "entries": entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "rejected": self.rejected,
+            }
+
+
+__all__ = ["ResponseCache", "TTLPolicy", "estimate_size", "parse_ttl_rules"]
@@ -0,0 +1,192 @@
+"""Typed columnar views of upstream tables, parsed once per dataset version.
+
+TWSE / TPEx / TAIFEX publish every number as a display string ("1,234,567",
+"+12.50", "--", "N/A"). Tools that filter, sort or rank on those values used to
+re-parse them on every call, often inside sort keys. ``ColumnTable`` parses a
+table once into one column per field:
+
+- ``int``: an ``array('q')``, when every value is a whole number;
+- ``float``: an ``array('d')`` with NaN for missing values ("--", "N/A", "");
+- ``text``: a list of interned strings, for identifier fields (codes, names, dates)
+  and anything not numeric.
+
+One stray non-number (a note, a malformed cell) makes a whole column text, so
+tools that filter or rank on a field they know is numeric pass ``numeric=True``:
+the column is then read cell by cell with NaN for anything that does not parse.
+
+Built through ``TWSEAPIClient.columns`` it is memoised with the cached response,
+like the lookup indexes. Tools select and order row positions on the typed
+columns and still render the original rows, so output strings are unchanged.
+"""
+
+import math
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+NAN = float("nan")
+
+# Placeholders upstream uses for "no value".
+MISSING = frozenset({"", "-", "--", "---", "N/A", "NA", "n/a", "null", "None"})
+
+# Field-name fragments of identifier columns, kept as text even when they look numeric
+# (codes like "0050" or "2330", ROC dates like "115/06/01", years, periods).
+TEXT_FIELD_HINTS = ("代號", "代碼", "名稱", "簡稱", "Code", "Name", "日期", "Date", "Contract", "CallPut", "Month")
+
+Number = Union[int, float]
+
+
+def parse_number(value: Any) -> Optional[Number]:
+    """Parse an upstream display number; None for placeholders and non-numbers.
+
+    Accepts thousands separators, a leading "+" and surrounding whitespace. Integers
+    stay ``int`` so share counts keep full precision.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return None if isinstance(value, float) and math.isnan(value) else value
+    if not isinstance(value, str):
+        return None
+    text = value.strip()
+    if text in MISSING:
+        return None
+    text = text.replace(",", "")
+    if text.startswith("+"):
+        text = text[1:]
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    return None if math.isnan(number) or math.isinf(number) else number
+
+
+def _is_text_field(field: str) -> bool:
+    return any(hint in field for hint in TEXT_FIELD_HINTS)
+
+
+class Column:
+    """One typed column: ``kind`` is "int", "float" or "text"."""
+
+    __slots__ = ("kind", "values", "_parsed")
+
+    def __init__(self, kind: str, values: Union[array, List[str]]):
+        self.kind = kind
+        self.values = values
+        self._parsed: Optional[array] = None
+
+    @classmethod
+    def build(cls, raw: Sequence[Any], text: bool = False) -> "Column":
+        if not text:
+            parsed = []
+            for value in raw:
+                number = parse_number(value)
+                if number is None and isinstance(value, str) and value.strip() not in MISSING:
+                    break  # a real non-number: the column is text
+                parsed.append(number)
+            else:
+                if parsed and all(isinstance(n, int) and -2**63 <= n < 2**63 for n in parsed):
+                    return cls("int", array("q", parsed))
+                return cls("float", array("d", (NAN if n is None else float(n) for n in parsed)))
+        return cls("text", [sys.intern(v) if isinstance(v, str) else ("" if v is None else str(v)) for v in raw])
+
+    def number(self, position: int) -> float:
+        """Value at ``position`` as a float (NaN if missing or not a number)."""
+        return float(self.numbers()[position])
+
+    def numbers(self) -> array:
+        """Numeric values; a text column is parsed cell by cell (once) with NaN for non-numbers."""
+        if self.kind != "text":
+            return self.values
+        if self._parsed is None:
+            parsed = (parse_number(v) for v in self.values)
+            self._parsed = array("d", (NAN if n is None else float(n) for n in parsed))
+        return self._parsed
+
+
+class ColumnTable:
+    """A table's rows plus one typed ``Column`` per field.
+
+    ``rows`` may be dicts (OpenAPI lists; fields are the keys) or sequences (TWSE
+    report ``data`` with its ``fields`` list). Short rows read as missing values.
+    """
+
+    def __init__(self, rows: Sequence[Any], fields: Optional[Sequence[str]] = None,
+                 text_fields: Iterable[str] = ()):
+        self.rows = rows
+        forced_text = set(text_fields)
+        dict_rows = bool(rows) and isinstance(rows[0], Mapping)
+        if fields is None:
+            if dict_rows:
+                seen: Dict[str, None] = {}
+                for row in rows:
+                    if isinstance(row, Mapping):
+                        seen.update(dict.fromkeys(row))
+                fields = list(seen)
+            else:
+                fields = [str(i) for i in range(max((len(r) for r in rows), default=0))]
+        self.fields = list(fields)
+        self.columns: Dict[str, Column] = {}
+        for i, field in enumerate(self.fields):
+            if dict_rows:
+                raw = [row.get(field) if isinstance(row, Mapping) else None for row in rows]
+            else:
+                raw = [row[i] if len(row) > i else None for row in rows]
+            self.columns[field] = Column.build(raw, text=field in forced_text or _is_text_field(field))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def column(self, field: Union[str, int]) -> Column:
+        """Column by name, or by position in ``fields``."""
+        if isinstance(field, int):
+            field = self.fields[field]
+        return self.columns[field]
+
+    def numbers(self, field: Union[str, int]) -> array:
+        """Numeric values of ``field`` (NaN for missing or unparseable cells)."""
+        return self.column(field).numbers()
+
+    def text(self, field: Union[str, int]) -> List[str]:
+        column = self.column(field)
+        return column.values if column.kind == "text" else [str(v) for v in column.values]
+
+    def where(self, field: Union[str, int], predicate: Callable[[Any], bool],
+              positions: Optional[Iterable[int]] = None, numeric: bool = False) -> List[int]:
+        """Positions (ascending, within ``positions`` if given) whose value satisfies ``predicate``.
+
+        With ``numeric`` the predicate sees ``numbers(field)`` even if the column is text.
+        """
+        values = self.numbers(field) if numeric else self.column(field).values
+        candidates = range(len(self.rows)) if positions is None else positions
+        return [p for p in candidates if predicate(values[p])]
+
+    def rank(self, field: Union[str, int], descending: bool = False,
+             key: Optional[Callable[[Any], Any]] = None,
+             positions: Optional[Iterable[int]] = None, numeric: bool = False) -> List[int]:
+        """Positions ordered by ``field`` (stable); missing numbers always sort last.
+
+        With ``numeric`` a text column is ranked on ``numbers(field)``, unparseable cells last.
+        """
+        column = self.column(field)
+        values = column.numbers() if numeric else column.values
+        candidates = list(range(len(self.rows)) if positions is None else positions)
+        if column.kind == "float" or (numeric and column.kind == "text"):
+            missing = [p for p in candidates if math.isnan(values[p])]
+            candidates = [p for p in candidates if not math.isnan(values[p])]
+        else:
+            missing = []
+        sort_key = (lambda p: key(values[p])) if key else values.__getitem__
+        return sorted(candidates, key=sort_key, reverse=descending) + missing
+
+    def take(self, positions: Iterable[int]) -> List[Any]:
+        """The original rows at ``positions``."""
+        return [self.rows[p] for p in positions]
+
+
+__all__ = ["Column", "ColumnTable", "MISSING", "NAN", "TEXT_FIELD_HINTS", "parse_number"]
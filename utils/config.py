@@ -28,6 +28,20 @@ class APIConfig:
         '0.5'
     ))
     
+    # Requests a host may burst before REQUEST_INTERVAL spacing kicks in. Each upstream
+    # host (or path group, see RATE_LIMITS) has its own token bucket.
+    RATE_BURST: Final[float] = float(os.getenv(
+        'TWSE_RATE_BURST',
+        '1'
+    ))
+
+    # Per-host / per-path-group overrides: "<host>[/<path>]=<req-per-sec>:<burst>,...",
+    # e.g. "www.taifex.com.tw=0.5:1,mis.twse.com.tw=4:4". See utils/rate_limit.py.
+    RATE_LIMITS: Final[str] = os.getenv(
+        'TWSE_RATE_LIMITS',
+        ''
+    )
+
     # Default timeout for API requests (seconds)
     DEFAULT_TIMEOUT: Final[float] = float(os.getenv(
         'TWSE_API_TIMEOUT',
@@ -40,15 +54,168 @@ class APIConfig:
         'false'
     ).lower() in ('true', '1', 'yes')
 
-    # TTL (seconds) for the in-memory OpenAPI list-response cache in TWSEAPIClient.fetch_data.
-    # A single prompt often triggers several tools that hit the same endpoint (e.g. multiple
-    # company-lookup tools reading the same full company list) within seconds of each other;
-    # this avoids re-downloading the whole list for each one. Set to 0 to disable caching.
+    # Default TTL (seconds) for the in-memory response cache in TWSEAPIClient (fetch_data,
+    # fetch_json and fetch_bytes). A single prompt often triggers several tools that hit the
+    # same endpoint (e.g. multiple company-lookup tools reading the same full company list,
+    # or paging through one T86 table with offset) within seconds of each other; this avoids
+    # re-downloading the whole response for each one. Set to 0 to disable caching.
     CACHE_TTL: Final[float] = float(os.getenv(
         'TWSE_CACHE_TTL',
         '60'
     ))
 
+    # TTL (seconds) for realtime MIS quotes (mis.twse.com.tw), which change every few seconds.
+    REALTIME_CACHE_TTL: Final[float] = float(os.getenv(
+        'TWSE_REALTIME_CACHE_TTL',
+        '5'
+    ))
+
+    # Stale-while-revalidate window (seconds) for OpenAPI list endpoints (fetch_data): an
+    # expired list younger than CACHE_TTL + this is served immediately while a background
+    # refresh downloads the new copy. 0 disables it (expired lists are re-fetched inline).
+    CACHE_MAX_STALENESS: Final[float] = float(os.getenv(
+        'TWSE_CACHE_MAX_STALENESS',
+        '600'
+    ))
+
+    # Expire after-market datasets (STOCK_DAY_ALL, BWIBBU_ALL, T86, ...) at their next
+    # publication window on the TWSE trading calendar instead of after CACHE_TTL, and hold
+    # realtime MIS quotes outside trading hours. See utils/expiry.py.
+    CALENDAR_EXPIRY: Final[bool] = os.getenv(
+        'TWSE_CALENDAR_EXPIRY',
+        'true'
+    ).lower() in ('true', '1', 'yes')
+
+    # Store cached OpenAPI list rows as compact read-only records (shared field schema +
+    # value tuple) instead of one dict per row. See utils/records.py.
+    COMPACT_ROWS: Final[bool] = os.getenv(
+        'TWSE_COMPACT_ROWS',
+        'true'
+    ).lower() in ('true', '1', 'yes')
+
+    # Per-endpoint TTL overrides: "<url-substring>=<seconds>,...", longest match wins and
+    # takes precedence over calendar expiry, e.g. "futDataDown=600,mis.twse.com.tw=2".
+    CACHE_TTL_RULES: Final[str] = os.getenv(
+        'TWSE_CACHE_TTL_RULES',
+        ''
+    )
+
+    # Number of lock stripes in the response cache; keys on different stripes never contend.
+    CACHE_STRIPES: Final[int] = int(os.getenv(
+        'TWSE_CACHE_STRIPES',
+        '16'
+    ))
+
+    # Memory budget (bytes, estimated) for the response cache; least recently used entries
+    # are evicted beyond it. Whole-market tables and TAIFEX CSV downloads are several MB each.
+    CACHE_MAX_BYTES: Final[int] = int(os.getenv(
+        'TWSE_CACHE_MAX_BYTES',
+        str(256 * 1024 * 1024)
+    ))
+
+    # Responses estimated larger than this (bytes) are never cached. 0 disables the cap.
+    CACHE_MAX_ENTRY_BYTES: Final[int] = int(os.getenv(
+        'TWSE_CACHE_MAX_ENTRY_BYTES',
+        str(64 * 1024 * 1024)
+    ))
+
+    # SQLite file for the persistent cache of historical responses (dated requests for a
+    # day/month that has closed, e.g. STOCK_DAY for a past month, TAIFEX *Down CSVs for a
+    # past range). Those never change, so they are kept with no TTL across restarts.
+    # Empty (default) disables the disk cache.
+    DISK_CACHE_PATH: Final[str] = os.getenv(
+        'TWSE_DISK_CACHE_PATH',
+        ''
+    )
+
+    # Size cap (bytes, compressed) for the disk cache; least recently read entries are
+    # evicted beyond it. 0 means unlimited.
+    DISK_CACHE_MAX_BYTES: Final[int] = int(os.getenv(
+        'TWSE_DISK_CACHE_MAX_BYTES',
+        '0'
+    ))
+
+    # JSON ledger of the days ``python -m utils.backfill`` has ingested per dataset.
+    # Empty (default) keeps it as backfill.json next to the disk cache file.
+    BACKFILL_STATE_PATH: Final[str] = os.getenv(
+        'TWSE_BACKFILL_STATE_PATH',
+        ''
+    )
+
+    # JSON file persisting the TWSE + TPEx security master (code -> market, name, industry,
+    # type), rebuilt once per trading day. Lets a restarted server route symbols to the
+    # right market before the first rebuild. Empty (default) keeps it in memory only.
+    SECURITY_MASTER_PATH: Final[str] = os.getenv(
+        'TWSE_SECURITY_MASTER_PATH',
+        ''
+    )
+
+    # Directory of the local columnar store of whole-market daily quotes (TWSE MI_INDEX,
+    # TPEx daily close): one memory-mapped file per market and month, filled as those
+    # tools fetch days and queried by the local quote tools. Empty (default) disables it.
+    QUOTE_STORE_PATH: Final[str] = os.getenv(
+        'TWSE_QUOTE_STORE_PATH',
+        ''
+    )
+
+    # SQLite file archiving latest-only OpenAPI datasets (TPEx daily lists, TAIFEX
+    # daily reports, BWIBBU_ALL) by data date, so their tools' ``date`` parameter can
+    # answer past days. Empty (default) disables it.
+    SNAPSHOT_PATH: Final[str] = os.getenv(
+        'TWSE_SNAPSHOT_PATH',
+        ''
+    )
+
+    # Largest response body (bytes) fetch_spooled will download; bigger ones are aborted
+    # with BodyTooLarge. 0 disables the guard.
+    MAX_BODY_BYTES: Final[int] = int(os.getenv(
+        'TWSE_MAX_BODY_BYTES',
+        str(256 * 1024 * 1024)
+    ))
+
+    # fetch_spooled keeps bodies up to this size (bytes) in memory; larger ones are spilled
+    # to an unlinked temporary file and returned as a read-only memory map.
+    SPOOL_MEMORY_BYTES: Final[int] = int(os.getenv(
+        'TWSE_SPOOL_MEMORY_BYTES',
+        str(1024 * 1024)
+    ))
+
+    # Keep-alive connections kept per upstream host (openapi.twse.com.tw, www.tpex.org.tw, ...).
+    POOL_SIZE: Final[int] = int(os.getenv(
+        'TWSE_POOL_SIZE',
+        '10'
+    ))
+
+    # Seconds an idle pooled connection is kept before it is dropped and re-opened.
+    POOL_IDLE_TIMEOUT: Final[float] = float(os.getenv(
+        'TWSE_POOL_IDLE_TIMEOUT',
+        '60'
+    ))
+
+    # Negotiate HTTP/2 on the async (httpx) path. Requires the optional 'h2' package
+    # (pip install "httpx[http2]"); ignored with a warning when it is missing.
+    HTTP2: Final[bool] = os.getenv(
+        'TWSE_HTTP2',
+        'false'
+    ).lower() in ('true', '1', 'yes')
+
+    # Open a connection to every upstream host when the server starts, so the first tool
+    # call does not pay the TCP+TLS handshake.
+    POOL_WARMUP: Final[bool] = os.getenv(
+        'TWSE_POOL_WARMUP',
+        'true'
+    ).lower() in ('true', '1', 'yes')
+
+    # Upstream hosts warmed up at server start.
+    WARMUP_URLS: Final[tuple[str, ...]] = (
+        'https://openapi.twse.com.tw',
+        'https://www.twse.com.tw',
+        'https://www.tpex.org.tw',
+        'https://openapi.taifex.com.tw',
+        'https://www.taifex.com.tw',
+        'https://mis.twse.com.tw',
+    )
+
 
 class DisplayConfig:
     """Display and formatting configuration."""
@@ -2,6 +2,8 @@
 
 from functools import wraps
 from typing import Callable, TypeVar, ParamSpec
+import asyncio
+import inspect
 import logging
 
 from .constants import MSG_QUERY_FAILED
@@ -12,13 +14,17 @@ P = ParamSpec('P')
 R = TypeVar('R')
 
 
-def handle_api_errors(use_code_param: bool = False):
+def handle_api_errors(use_code_param: bool = False, offload: bool = False):
     """
     Decorator to handle common API errors and logging.
 
     Args:
         use_code_param: If True, expects the function to have a 'code' parameter
                        and includes it in error messages
+        offload: If True, a sync function becomes a coroutine that runs it in a
+                 worker thread (``asyncio.to_thread``). FastMCP calls sync tools
+                 directly on its event loop, so tools making blocking upstream
+                 calls use this to keep other requests moving.
 
     Usage:
         @handle_api_errors()
@@ -28,27 +34,53 @@ def handle_api_errors(use_code_param: bool = False):
         @handle_api_errors(use_code_param=True)
         def get_stock_info(code: str) -> str:
             ...
+
+    Coroutine functions get an async wrapper, so the decorator works unchanged
+    on ``async def`` tools.
     """
     def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        def on_error(e: Exception, args, kwargs) -> str:
+            # Extract code parameter if it exists
+            code = None
+            if use_code_param:
+                # Try to get 'code' from kwargs or first positional arg
+                code = kwargs.get('code')
+                if code is None and len(args) > 0:
+                    code = args[0]
+
+            # Log the error with context
+            error_context = f" for code {code}" if code else ""
+            logger.error(f"Error in {func.__name__}{error_context}: {e}", exc_info=True)
+
+            # Return formatted error message
+            return MSG_QUERY_FAILED.format(error=str(e))
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    return on_error(e, args, kwargs)
+
+            return async_wrapper
+
+        if offload:
+            @wraps(func)
+            async def offloaded_wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+                try:
+                    return await asyncio.to_thread(func, *args, **kwargs)
+                except Exception as e:
+                    return on_error(e, args, kwargs)
+
+            return offloaded_wrapper
+
         @wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                # Extract code parameter if it exists
-                code = None
-                if use_code_param:
-                    # Try to get 'code' from kwargs or first positional arg
-                    code = kwargs.get('code')
-                    if code is None and len(args) > 0:
-                        code = args[0]
-                
-                # Log the error with context
-                error_context = f" for code {code}" if code else ""
-                logger.error(f"Error in {func.__name__}{error_context}: {e}", exc_info=True)
-                
-                # Return formatted error message
-                return MSG_QUERY_FAILED.format(error=str(e))
+                return on_error(e, args, kwargs)
         
         return wrapper
     return decorator
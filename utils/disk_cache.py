@@ -0,0 +1,213 @@
+"""Persistent on-disk cache for immutable historical responses.
+
+Once a trading day (or month, for monthly reports) is closed, TWSE's dated
+endpoints (``STOCK_DAY`` for a past month, ``T86`` / ``MI_MARGN`` / ``MI_QFIIS``
+for a past date, ...) and TAIFEX ``*Down`` CSVs for a past range never change.
+Those responses are written to a SQLite file with no TTL, so repeated analyses
+and server restarts read them locally instead of going back upstream. The
+per-day TAIFEX row sets of ``TWSEAPIClient.store_days`` are kept here too.
+
+Enabled by setting ``TWSE_DISK_CACHE_PATH``; ``TWSE_DISK_CACHE_MAX_BYTES``
+optionally caps the file, evicting least recently read entries first.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Hashable, Mapping, Optional
+from urllib.parse import urlsplit
+
+from .config import APIConfig
+from .expiry import taipei_today
+from .spool import deflate, inflate, spool
+
+logger = logging.getLogger(__name__)
+
+# Endpoints whose ``date`` parameter selects a whole month or year rather than one day.
+# The response is only final once that whole period has passed.
+PERIOD_ENDPOINTS: Dict[str, str] = {
+    "STOCK_DAY": "month",
+    "STOCK_DAY_AVG": "month",
+    "FMTQIK": "month",
+    "MI_5MINS_HIST": "month",
+    "FMSRFK": "year",
+    # FMNPTK returns every year up to the current one regardless of ``date``.
+    "FMNPTK": "never",
+}
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    text = str(value).strip()
+    for fmt in ("%Y%m%d", "%Y/%m/%d", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _period_end(day: date, period: str) -> date:
+    if period == "year":
+        return date(day.year, 12, 31)
+    if period == "month":
+        first_of_next = date(day.year + day.month // 12, day.month % 12 + 1, 1)
+        return first_of_next - timedelta(days=1)
+    return day
+
+
+def is_historical(url: str, params: Optional[Mapping[str, Any]] = None,
+                  data: Optional[Mapping[str, Any]] = None, today: Optional[date] = None) -> bool:
+    """True if the request asks for a period that ended strictly before today (Asia/Taipei).
+
+    The period comes from ``date`` / ``dayDate`` (TWSE, YYYYMMDD) or ``queryEndDate`` (TAIFEX
+    download forms, YYYY/MM/DD). Requests without a date parameter are latest-only and never
+    historical.
+    """
+    today = today or taipei_today()
+    period = PERIOD_ENDPOINTS.get(urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1], "day")
+    if period == "never":
+        return False
+    fields = {**(params or {}), **(data or {})}
+    raw = fields.get("queryEndDate") or fields.get("date") or fields.get("dayDate")
+    day = _parse_date(raw) if raw else None
+    return day is not None and _period_end(day, period) < today
+
+
+def is_complete(kind: str, value: Any) -> bool:
+    """Whether a response body is a real answer worth persisting forever.
+
+    TWSE returns ``stat != "OK"`` (e.g. "很抱歉，沒有符合條件的資料!") while a day is not yet
+    published or when it is overloaded, and the TAIFEX download pages answer errors with
+    an HTML page; neither must be pinned to disk.
+    """
+    if kind == "json":
+        if isinstance(value, dict):
+            stat = value.get("stat")
+            return stat is None or str(stat).upper() == "OK"
+        return bool(value)
+    if kind == "bytes":
+        return bool(value) and not value.lstrip()[:1] == b"<"
+    if kind == "spooled":
+        # Possibly a memory map: only look at the head instead of copying the body.
+        return len(value) > 0 and not bytes(value[:1024]).lstrip()[:1] == b"<"
+    return False
+
+
+class DiskCache:
+    """SQLite-backed store of zlib-compressed response bodies keyed by request identity."""
+
+    def __init__(self, path: str, max_bytes: int = APIConfig.DISK_CACHE_MAX_BYTES):
+        self.path = os.path.expanduser(path)
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, kind TEXT NOT NULL, body BLOB NOT NULL,"
+            " size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_config(cls) -> Optional["DiskCache"]:
+        """Build the cache from ``TWSE_DISK_CACHE_PATH``; None when it is unset or unusable."""
+        if not APIConfig.DISK_CACHE_PATH:
+            return None
+        try:
+            return cls(APIConfig.DISK_CACHE_PATH)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Disk cache disabled, cannot open {APIConfig.DISK_CACHE_PATH}: {e}")
+            return None
+
+    @staticmethod
+    def _encode(kind: str, value: Any) -> bytes:
+        if kind == "spooled":
+            # Possibly a memory map of a large download: compress it a chunk at a time.
+            return deflate(value)
+        raw = value if kind == "bytes" else json.dumps(value, ensure_ascii=False).encode("utf-8")
+        return zlib.compress(raw)
+
+    @staticmethod
+    def _decode(kind: str, body: bytes) -> Any:
+        if kind == "spooled":
+            return spool(inflate(body))
+        raw = zlib.decompress(body)
+        return raw if kind == "bytes" else json.loads(raw.decode("utf-8"))
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT kind, body FROM responses WHERE key = ?", (repr(key),)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), repr(key)))
+        try:
+            return self._decode(row[0], row[1])
+        except (zlib.error, ValueError) as e:
+            logger.warning(f"Dropping corrupt disk cache entry {key!r}: {e}")
+            self.pop(key)
+            return None
+
+    def set(self, key: Hashable, kind: str, value: Any) -> None:
+        body = self._encode(kind, value)
+        if self.max_bytes > 0 and len(body) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, kind, body, size, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (repr(key), kind, body, len(body), now, now),
+            )
+            if self.max_bytes > 0:
+                self._evict()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (repr(key),))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            return {
+                "path": self.path,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = ["DiskCache", "is_complete", "is_historical"]
@@ -0,0 +1,186 @@
+"""Trading-calendar-aware cache expiry keyed to TWSE publication times.
+
+A flat TTL is wrong in both directions. After-market datasets (``STOCK_DAY_ALL``,
+``BWIBBU_ALL``, ``T86``, ...) change once per trading day, inside a known
+publication window after the close, and never on weekends or market holidays;
+realtime MIS quotes change every few seconds, but only while the market is open.
+
+``ExpiryPolicy`` computes "valid until the next publication" per endpoint from
+the Asia/Taipei clock and a ``TradingCalendar`` built from the OpenAPI
+``/holidaySchedule/holidaySchedule`` list. Inside a publication window (or a
+trading session, for realtime data) it returns None so the caller falls back to
+its short TTL, because upstream may update at any moment there.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+from urllib.parse import urlsplit
+
+from .date_helper import roc_to_ad
+
+logger = logging.getLogger(__name__)
+
+# Taiwan has no daylight saving time, so a fixed offset is exact.
+TAIPEI_TZ = timezone(timedelta(hours=8), "Asia/Taipei")
+
+HOLIDAY_SCHEDULE_ENDPOINT = "/holidaySchedule/holidaySchedule"
+
+
+def taipei_today() -> date:
+    return datetime.now(TAIPEI_TZ).date()
+
+
+def _parse_schedule_date(value: str) -> Optional[date]:
+    """Parse a holiday-schedule date, ROC ("1150101", "115/01/01") or AD ("20260101")."""
+    text = str(value).strip()
+    try:
+        if len(text.replace("/", "").replace("-", "")) == 8:
+            return datetime.strptime(text.replace("/", "").replace("-", ""), "%Y%m%d").date()
+        return date.fromisoformat(roc_to_ad(text))
+    except (ValueError, IndexError):
+        return None
+
+
+class TradingCalendar:
+    """Weekends plus the TWSE holiday schedule.
+
+    The schedule also lists trading days around holidays ("農曆春節前最後交易日",
+    "...開始交易日"); only the other entries are treated as closures. Until the
+    schedule is loaded only weekends are closed, which makes expiry conservative
+    (an entry expires on a holiday and is simply fetched again), never wrong.
+    """
+
+    def __init__(self, holidays: Iterable[date] = ()):
+        self._holidays: Set[date] = set(holidays)
+        self._lock = threading.Lock()
+        self._loaded_on: Optional[date] = None
+        self._last_attempt = 0.0
+
+    @staticmethod
+    def holidays_from_schedule(rows: Iterable[Dict[str, Any]]) -> Set[date]:
+        holidays: Set[date] = set()
+        for row in rows:
+            name = str(row.get("Name", ""))
+            if "開始交易" in name or "最後交易" in name:
+                continue
+            day = _parse_schedule_date(row.get("Date", ""))
+            if day is not None:
+                holidays.add(day)
+        return holidays
+
+    def load(self, rows: Iterable[Dict[str, Any]]) -> None:
+        holidays = self.holidays_from_schedule(rows)
+        if not holidays:
+            raise ValueError("holiday schedule is empty")
+        with self._lock:
+            self._holidays = holidays
+            self._loaded_on = taipei_today()
+        logger.info(f"Trading calendar loaded: {len(holidays)} market holidays")
+
+    def refresh_async(self, loader: Callable[[], Iterable[Dict[str, Any]]], retry_after: float = 3600.0) -> None:
+        """Load the schedule on a daemon thread if it was not loaded today.
+
+        Failures are logged and retried at most once per ``retry_after`` seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded_on == taipei_today() or now - self._last_attempt < retry_after:
+                return
+            self._last_attempt = now
+
+        def _run() -> None:
+            try:
+                self.load(loader())
+            except Exception as e:
+                logger.warning(f"Could not load the TWSE holiday schedule: {e}")
+
+        threading.Thread(target=_run, daemon=True, name="twse-calendar-load").start()
+
+    def is_trading_day(self, day: date) -> bool:
+        if day.weekday() >= 5:
+            return False
+        with self._lock:
+            return day not in self._holidays
+
+    def next_trading_day(self, day: date) -> date:
+        """First trading day strictly after ``day``."""
+        day += timedelta(days=1)
+        for _ in range(60):
+            if self.is_trading_day(day):
+                return day
+            day += timedelta(days=1)
+        return day
+
+
+@dataclass(frozen=True)
+class Window:
+    """Daily Asia/Taipei time window on trading days during which data may change."""
+
+    start: dtime
+    end: dtime
+
+
+# Publication windows of after-market datasets (generous: upstream is often late).
+QUOTES_WINDOW = Window(dtime(13, 30), dtime(18, 0))
+INSTITUTIONAL_WINDOW = Window(dtime(14, 30), dtime(22, 0))
+# Realtime MIS data moves from pre-open matching through the afternoon odd-lot session.
+REALTIME_SESSION = Window(dtime(8, 30), dtime(14, 35))
+
+# Endpoint (last URL path segment, or host for realtime) -> window.
+ENDPOINT_WINDOWS: Dict[str, Window] = {
+    **dict.fromkeys((
+        "STOCK_DAY_ALL", "STOCK_DAY_AVG_ALL", "STOCK_DAY", "STOCK_DAY_AVG", "BWIBBU_ALL",
+        "BWIBBU_d", "MI_INDEX", "MI_INDEX20", "MI_INDEX4", "FMTQIK", "MI_5MINS",
+        "MI_5MINS_HIST", "TWT84U", "TWT85U",
+    ), QUOTES_WINDOW),
+    **dict.fromkeys((
+        "T86", "BFI82U", "MI_QFIIS", "MI_QFIIS_cat", "MI_QFIIS_sort_20", "MI_MARGN",
+        "TWT93U", "TWTASU", "BFIAUU", "BFIAUU_d", "BFI84U",
+    ), INSTITUTIONAL_WINDOW),
+    "mis.twse.com.tw": REALTIME_SESSION,
+}
+
+
+class ExpiryPolicy:
+    """Seconds until an endpoint's cached response can next change, per the calendar."""
+
+    def __init__(self, calendar: TradingCalendar, windows: Optional[Dict[str, Window]] = None):
+        self.calendar = calendar
+        self.windows = ENDPOINT_WINDOWS if windows is None else windows
+
+    def window_for(self, url: str) -> Optional[Window]:
+        parts = urlsplit(url)
+        return self.windows.get(parts.netloc) or self.windows.get(parts.path.rstrip("/").rsplit("/", 1)[-1])
+
+    def valid_until(self, window: Window, stored_at: float) -> Optional[datetime]:
+        """Start of the next window after ``stored_at``, or None if stored inside a window."""
+        moment = datetime.fromtimestamp(stored_at, TAIPEI_TZ)
+        day = moment.date()
+        if self.calendar.is_trading_day(day):
+            if window.start <= moment.time() < window.end:
+                return None
+            if moment.time() < window.start:
+                return datetime.combine(day, window.start, TAIPEI_TZ)
+        return datetime.combine(self.calendar.next_trading_day(day), window.start, TAIPEI_TZ)
+
+    def ttl_for(self, url: str, stored_at: float) -> Optional[float]:
+        """TTL measured from ``stored_at``; None if the endpoint is unknown or inside its window."""
+        window = self.window_for(url)
+        if window is None:
+            return None
+        until = self.valid_until(window, stored_at)
+        return None if until is None else until.timestamp() - stored_at
+
+
+__all__ = [
+    "ExpiryPolicy",
+    "HOLIDAY_SCHEDULE_ENDPOINT",
+    "TAIPEI_TZ",
+    "TradingCalendar",
+    "Window",
+    "taipei_today",
+]
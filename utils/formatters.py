@@ -1,5 +1,6 @@
 """Data formatting utilities."""
 
+from collections.abc import Mapping
 from typing import List, Union, Sequence
 from .constants import MSG_TOTAL_RECORDS, DEFAULT_DISPLAY_LIMIT
 from .types import TWSEDataItem, DataFormatter
@@ -36,7 +37,7 @@ def format_multiple_records(records: List[TWSEDataItem], separator: str = "-" *
     
     formatted_items = []
     for record in records:
-        if isinstance(record, dict):
+        if isinstance(record, Mapping):
             formatted_item = format_properties_with_values_multiline(record)
             formatted_items.append(formatted_item)
             formatted_items.append(separator)
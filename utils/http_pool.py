@@ -0,0 +1,227 @@
+"""Per-host keep-alive connection pools for TWSEAPIClient.
+
+Every tool talks to one of a handful of upstream hosts (openapi.twse.com.tw,
+www.twse.com.tw, www.tpex.org.tw, openapi.taifex.com.tw, mis.twse.com.tw, ...).
+Opening a fresh TCP+TLS connection per call makes the handshake dominate tool
+latency, so each host gets one long-lived ``requests.Session`` (sync path) and
+one ``httpx.AsyncClient`` per event loop (async path) whose connections are reused.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Set, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import APIConfig
+
+logger = logging.getLogger(__name__)
+
+
+def host_key(url: str) -> str:
+    """Return the ``scheme://host[:port]`` part of a URL, used to key pools."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class HostPools:
+    """Owns one sync session and one async client per upstream host."""
+
+    def __init__(self,
+                 verify_ssl: bool = APIConfig.VERIFY_SSL,
+                 pool_size: int = APIConfig.POOL_SIZE,
+                 idle_timeout: float = APIConfig.POOL_IDLE_TIMEOUT,
+                 http2: bool = APIConfig.HTTP2):
+        self.verify_ssl = verify_ssl
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("TWSE_HTTP2 is enabled but the 'h2' package is not installed; falling back to HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._last_used: Dict[str, float] = {}
+        # Requests currently sent through each session, and replaced sessions that are
+        # closed once their last request returns.
+        self._in_flight: Dict[requests.Session, int] = {}
+        self._retired: Set[requests.Session] = set()
+        # httpx.AsyncClient pools are bound to the event loop that created them, so the
+        # async clients are kept per loop and host, and closed when their loop shuts down.
+        self._async_clients: Dict[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]] = {}
+        # Per-loop async generators whose finalizer (run by the loop's shutdown_asyncgens,
+        # as asyncio.run does) closes that loop's clients.
+        self._loop_guards: Dict[asyncio.AbstractEventLoop, Any] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, host: str, name: str) -> None:
+        counters = self._counters.setdefault(
+            host, {"requests": 0, "async_requests": 0, "sessions_opened": 0, "idle_recycles": 0})
+        counters[name] += 1
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        session.verify = self.verify_ssl
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @contextmanager
+    def lease(self, url: str) -> Iterator[requests.Session]:
+        """Use the pooled session for ``url``'s host for one request.
+
+        urllib3 has no idle timeout of its own; a session left unused for longer than
+        ``idle_timeout`` is replaced rather than risking connections the server has
+        already dropped. The old session is closed as soon as no request is being sent
+        through it. (A streamed body still being read keeps its connection: urllib3
+        only closes it when the response releases it back to the closed pool.)
+        """
+        host = host_key(url)
+        now = time.monotonic()
+        stale = None
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is not None and self.idle_timeout > 0 and now - self._last_used[host] > self.idle_timeout:
+                if self._in_flight.get(session):
+                    self._retired.add(session)
+                else:
+                    stale = session
+                session = None
+                self._count(host, "idle_recycles")
+            if session is None:
+                session = self._sessions[host] = self._new_session()
+                self._count(host, "sessions_opened")
+            self._last_used[host] = now
+            self._in_flight[session] = self._in_flight.get(session, 0) + 1
+            self._count(host, "requests")
+        if stale is not None:
+            stale.close()
+        try:
+            yield session
+        finally:
+            self._release(session)
+
+    def _release(self, session: requests.Session) -> None:
+        with self._lock:
+            remaining = self._in_flight[session] - 1
+            if remaining:
+                self._in_flight[session] = remaining
+                return
+            del self._in_flight[session]
+            if session not in self._retired:
+                return
+            self._retired.discard(session)
+        session.close()
+
+    def async_client(self, url: str) -> httpx.AsyncClient:
+        """Return the pooled httpx.AsyncClient for ``url``'s host on the running loop."""
+        host = host_key(url)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for stale in [lp for lp in self._async_clients if lp.is_closed()]:
+                # Closed without shutting down its async generators: nothing can run there.
+                del self._async_clients[stale]
+                self._loop_guards.pop(stale, None)
+            clients = self._async_clients.setdefault(loop, {})
+            if loop not in self._loop_guards:
+                guard = self._loop_guards[loop] = self._close_on_shutdown(loop)
+                asyncio.ensure_future(guard.__anext__())
+            client = clients.get(host)
+            if client is None or client.is_closed:
+                client = clients[host] = httpx.AsyncClient(
+                    verify=self.verify_ssl,
+                    http2=self.http2,
+                    follow_redirects=True,
+                    limits=httpx.Limits(
+                        max_connections=self.pool_size,
+                        max_keepalive_connections=self.pool_size,
+                        keepalive_expiry=self.idle_timeout or None,
+                    ),
+                )
+            self._count(host, "async_requests")
+        return client
+
+    async def _close_on_shutdown(self, loop: asyncio.AbstractEventLoop) -> AsyncIterator[None]:
+        try:
+            yield
+        finally:
+            with self._lock:
+                clients = self._async_clients.pop(loop, {})
+                self._loop_guards.pop(loop, None)
+            for client in clients.values():
+                await client.aclose()
+
+    def warm_up(self, urls: Iterable[str], timeout: float = 5.0) -> Dict[str, bool]:
+        """Open a connection to each host ahead of the first real request.
+
+        Sends a HEAD to each host root through its pooled session so the TCP+TLS
+        handshake is already done when the first tool call arrives. Failures are
+        logged and reported, never raised.
+        """
+        hosts = sorted({host_key(url) for url in urls})
+
+        def _one(host: str) -> Tuple[str, bool]:
+            try:
+                with self.lease(host) as session:
+                    session.head(f"{host}/", timeout=timeout, allow_redirects=False)
+                return host, True
+            except Exception as e:
+                logger.warning(f"Connection warm-up failed for {host}: {e}")
+                return host, False
+
+        if not hosts:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(hosts)) as pool:
+            results = dict(pool.map(_one, hosts))
+        logger.info(f"Connection warm-up: {sum(results.values())}/{len(results)} hosts ready")
+        return results
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host pool statistics from the pool's own counters (no urllib3/httpx internals).
+
+        ``requests`` / ``async_requests`` count requests sent, ``sessions_opened`` and
+        ``idle_recycles`` count sync sessions created and replaced, ``in_flight`` the requests
+        currently being sent and ``async_clients`` the event loops holding a client.
+        """
+        with self._lock:
+            result: Dict[str, Dict[str, Any]] = {}
+            for host, counters in self._counters.items():
+                entry: Dict[str, Any] = dict(counters)
+                session = self._sessions.get(host)
+                if session is not None:
+                    entry["in_flight"] = self._in_flight.get(session, 0)
+                    entry["idle_seconds"] = round(time.monotonic() - self._last_used[host], 1)
+                clients = [c[host] for c in self._async_clients.values() if host in c and not c[host].is_closed]
+                if clients:
+                    entry["async_clients"] = len(clients)
+                result[host] = entry
+            return result
+
+    def close(self) -> None:
+        """Close all sync sessions."""
+        with self._lock:
+            for session in [*self._sessions.values(), *self._retired]:
+                session.close()
+            self._sessions.clear()
+            self._retired.clear()
+
+    async def aclose(self) -> None:
+        """Close the async clients created on the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            mine = self._async_clients.pop(loop, {})
+        for client in mine.values():
+            await client.aclose()
+
+
+__all__ = ["HostPools", "host_key"]
@@ -0,0 +1,154 @@
+"""Lookup indexes over cached datasets.
+
+Indexes are built lazily, once per dataset version, through
+``ResponseCache.derived`` so they live and die with the cached list they index.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, List, Sequence, Union
+
+from .types import TWSEDataItem
+
+# Fields that identify a security / company across OpenAPI datasets.
+CODE_FIELDS = ("公司代號", "Code", "權證代號")
+
+
+def build_code_index(rows: Sequence[Any], fields: Sequence[str] = CODE_FIELDS) -> Dict[Any, List[TWSEDataItem]]:
+    """Map each code value to the rows carrying it, in dataset order.
+
+    A row matches a code if any of ``fields`` equals it, exactly like a linear scan
+    comparing every field, so ``index.get(code, [])`` returns the same rows a scan would.
+    """
+    index: Dict[Any, List[TWSEDataItem]] = {}
+    for row in rows:
+        if not isinstance(row, Mapping):
+            continue
+        seen = set()
+        for field in fields:
+            value = row.get(field)
+            if value is None:
+                continue
+            try:
+                if value in seen:
+                    continue
+                index.setdefault(value, []).append(row)
+                seen.add(value)
+            except TypeError:
+                # Unhashable values can never equal a string code.
+                continue
+    return index
+
+
+# 產業別 keyword -> suffix of the matching financial statement endpoints
+# (t187ap06_L_ci, t187ap07_X_basi, ...). Checked in order; anything else is 一般業.
+STATEMENT_FAMILIES = (
+    ("金融業", "_basi"),
+    ("證券期貨業", "_bd"),
+    ("金控業", "_fh"),
+    ("保險業", "_ins"),
+    ("異業", "_mim"),
+    ("一般業", "_ci"),
+)
+DEFAULT_STATEMENT_FAMILY = "_ci"
+
+
+def statement_family(industry: str) -> str:
+    """Statement endpoint suffix for a company profile's 產業別."""
+    for keyword, suffix in STATEMENT_FAMILIES:
+        if keyword in industry:
+            return suffix
+    return DEFAULT_STATEMENT_FAMILY
+
+
+def build_statement_families(rows: Sequence[Any], fields: Sequence[str] = CODE_FIELDS) -> Dict[Any, str]:
+    """Map each code in the company profiles (t187ap03_L) to its statement suffix.
+
+    The first profile carrying a code wins, as with ``fetch_company_data``. Each
+    distinct 產業別 is classified once.
+    """
+    families: Dict[Any, str] = {}
+    by_industry: Dict[str, str] = {}
+    for row in rows:
+        if not isinstance(row, Mapping):
+            continue
+        industry = str(row.get("產業別", "") or "")
+        family = by_industry.get(industry)
+        if family is None:
+            family = by_industry[industry] = statement_family(industry)
+        for field in fields:
+            value = row.get(field)
+            if value is None:
+                continue
+            try:
+                families.setdefault(value, family)
+            except TypeError:
+                continue
+    return families
+
+
+class NameIndex:
+    """Character n-gram inverted index for substring search over one name field.
+
+    Every name is split into its characters and character bigrams, which suits CJK
+    names (no word boundaries, most keywords two or three characters) as well as
+    Latin ones. A one-character query reads its character's posting list; a longer
+    query takes the rarest of its bigrams' posting lists as candidates and confirms
+    each with ``needle in name``, so results are exactly those of a linear substring
+    scan, in dataset order.
+
+    ``field`` is a key for dict rows or a column position for list rows; missing or
+    non-string names never match.
+    """
+
+    def __init__(self, rows: Sequence[Any], field: Union[str, int]):
+        self.rows = rows
+        self.names: List[str] = [self._name(row, field) for row in rows]
+        self.postings: Dict[str, List[int]] = {}
+        for position, name in enumerate(self.names):
+            grams = set(name)
+            grams.update(name[i:i + 2] for i in range(len(name) - 1))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(position)
+
+    @staticmethod
+    def _name(row: Any, field: Union[str, int]) -> str:
+        try:
+            value = row.get(field) if isinstance(row, Mapping) else row[field]
+        except (IndexError, KeyError, TypeError):
+            return ""
+        return value if isinstance(value, str) else ""
+
+    @classmethod
+    def scan(cls, rows: Sequence[Any], field: Union[str, int], needle: str) -> List[Any]:
+        """The linear scan the index replaces, for datasets not worth indexing."""
+        return [row for row in rows if needle in cls._name(row, field)]
+
+    def search(self, needle: str) -> List[int]:
+        """Ascending positions of the rows whose name contains ``needle``."""
+        if not needle:
+            return list(range(len(self.rows)))
+        if len(needle) == 1:
+            return list(self.postings.get(needle, ()))
+        candidates = None
+        for i in range(len(needle) - 1):
+            posting = self.postings.get(needle[i:i + 2])
+            if posting is None:
+                return []
+            if candidates is None or len(posting) < len(candidates):
+                candidates = posting
+        return [p for p in candidates if needle in self.names[p]]
+
+    def filter(self, needle: str) -> List[Any]:
+        """Rows whose name contains ``needle``, in dataset order."""
+        return [self.rows[p] for p in self.search(needle)]
+
+
+__all__ = [
+    "CODE_FIELDS",
+    "DEFAULT_STATEMENT_FAMILY",
+    "NameIndex",
+    "STATEMENT_FAMILIES",
+    "build_code_index",
+    "build_statement_families",
+    "statement_family",
+]
@@ -0,0 +1,142 @@
+"""Multi-month range queries over TWSE's one-month-per-call report endpoints.
+
+``STOCK_DAY``, ``STOCK_DAY_AVG``, ``FMTQIK`` and ``MI_5MINS_HIST`` return one
+calendar month per request (the day in ``date`` is ignored). ``fetch_month_range``
+splits a date range into months and fetches them concurrently through
+``fetch_json``, so every month goes through the per-host rate limiter, the
+response cache and, for closed months, the disk cache: a past month is
+downloaded once and reused by every later range that covers it.
+``merge_daily_rows`` turns the monthly tables into one date-ordered series.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from .date_helper import roc_to_ad
+from .expiry import taipei_today
+
+if TYPE_CHECKING:
+    from .api_client import TWSEAPIClient
+
+# Longest range served in one call (months).
+MAX_RANGE_MONTHS = 36
+
+# Months fetched at once; the per-host rate limiter still spaces the requests.
+MAX_WORKERS = 6
+
+
+@dataclass
+class MonthResult:
+    """One month of a range: the upstream response if it had data, else why not."""
+
+    month: date
+    resp: Optional[Dict[str, Any]] = None
+    error: str = ""
+
+    @property
+    def rows(self) -> List[List[Any]]:
+        return (self.resp or {}).get("data") or []
+
+
+@dataclass
+class MonthRange:
+    start: date
+    end: date
+    months: List[MonthResult] = field(default_factory=list)
+
+    @property
+    def title(self) -> str:
+        """``title`` of the first month with data (upstream titles name the stock)."""
+        return next((m.resp.get("title", "") for m in self.months if m.resp), "")
+
+    @property
+    def missing(self) -> List[date]:
+        """Months that returned no data or failed."""
+        return [m.month for m in self.months if not m.rows]
+
+
+def parse_day(value: str) -> date:
+    return datetime.strptime(value.strip(), "%Y%m%d").date()
+
+
+def month_starts(start: date, end: date) -> List[date]:
+    """First day of every calendar month from ``start``'s to ``end``'s, inclusive."""
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(date(year, month, 1))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def check_range(start_date: str, end_date: str) -> Tuple[Optional[Tuple[date, date]], str]:
+    """Validate a YYYYMMDD range: ``((start, end), "")`` or ``(None, message)`` for the tool to return."""
+    try:
+        start, end = parse_day(start_date), parse_day(end_date)
+    except ValueError:
+        return None, f"日期格式錯誤，請使用 YYYYMMDD 格式（例如 20250101），收到：{start_date}～{end_date}"
+    if start > end:
+        return None, f"起始日期 {start_date} 不可晚於結束日期 {end_date}"
+    end = min(end, taipei_today())
+    if start > end:
+        return None, f"起始日期 {start_date} 晚於今日，尚無資料"
+    if len(month_starts(start, end)) > MAX_RANGE_MONTHS:
+        return None, f"查詢區間不可超過 {MAX_RANGE_MONTHS} 個月，請縮小 {start_date}～{end_date} 範圍後重試"
+    return (start, end), ""
+
+
+def fetch_month_range(client: "TWSEAPIClient", url: str, params: Dict[str, Any],
+                      start: date, end: date, date_param: str = "date") -> MonthRange:
+    """Fetch every month touching ``start``..``end`` concurrently, in month order.
+
+    A failed or empty month is reported in the result instead of failing the range.
+    """
+    def _one(month: date) -> MonthResult:
+        try:
+            resp = client.fetch_json(url, params={**params, date_param: month.strftime("%Y%m%d")})
+        except Exception as e:
+            return MonthResult(month, error=str(e))
+        if not resp or resp.get("stat") != "OK" or not resp.get("data"):
+            return MonthResult(month, error=str((resp or {}).get("stat", "")))
+        return MonthResult(month, resp)
+
+    months = month_starts(start, end)
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(months))) as pool:
+        return MonthRange(start, end, list(pool.map(_one, months)))
+
+
+def row_date(value: Any) -> Optional[date]:
+    """The date of an upstream row's ROC date cell ("115/06/01"), or None for summary rows."""
+    try:
+        return date.fromisoformat(roc_to_ad(str(value)))
+    except (ValueError, IndexError):
+        return None
+
+
+def merge_daily_rows(result: MonthRange, date_col: int = 0) -> List[Sequence[Any]]:
+    """Dated rows of every month, restricted to the range, de-duplicated by date and sorted.
+
+    Rows without a parseable date (per-month summary lines) are left out.
+    """
+    by_day: Dict[date, Sequence[Any]] = {}
+    for month in result.months:
+        for row in month.rows:
+            day = row_date(row[date_col]) if len(row) > date_col else None
+            if day is not None and result.start <= day <= result.end:
+                by_day.setdefault(day, row)
+    return [by_day[day] for day in sorted(by_day)]
+
+
+def missing_note(result: MonthRange) -> str:
+    """Trailing line naming the months without data; "" when every month had data."""
+    if not result.missing:
+        return ""
+    return f"\n（查無資料的月份：{'、'.join(f'{m:%Y-%m}' for m in result.missing)}）"
+
+
+__all__ = [
+    "MAX_RANGE_MONTHS", "MonthRange", "MonthResult", "check_range", "fetch_month_range",
+    "merge_daily_rows", "missing_note", "month_starts", "parse_day", "row_date",
+]
@@ -0,0 +1,345 @@
+"""Local columnar store of whole-market daily quotes (dates × securities).
+
+``get_all_stocks_daily_close`` (TWSE ``MI_INDEX``) and ``get_otc_daily`` (TPEx
+daily close) each return one day of the whole market; a multi-day cross-sectional
+question used to refetch every day. ``QuoteStore`` keeps every day those tools
+fetch in append-only, month-partitioned column files under ``TWSE_QUOTE_STORE_PATH``:
+
+    <root>/<market>/<YYYYMM>.cols      market: "tse" (TWSE) or "otc" (TPEx)
+
+A partition file is a fixed header (magic, JSON length), a JSON header (dates,
+security codes and names, field order) and one float64 block per field (native
+byte order), each laid out date-major: ``values[day * len(codes) + code]``, NaN where
+a security did not trade. Partitions are memory-mapped and read through
+``memoryview`` casts, so a query only touches the pages of the columns it reads.
+
+Appending a day rewrites its month partition (a few MB) to a temporary file and
+renames it into place: readers never see a partial file, and a stored day is never
+rewritten.
+"""
+
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+from array import array
+from dataclasses import astuple, dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from .columns import NAN, parse_number
+from .config import APIConfig
+from .date_helper import roc_to_ad
+
+logger = logging.getLogger(__name__)
+
+MARKETS: Tuple[str, ...] = ("tse", "otc")
+
+FIELDS: Tuple[str, ...] = ("open", "high", "low", "close", "change", "volume", "value")
+
+MAGIC = b"TWQS0001"
+_HEADER = struct.Struct("<8sQ")
+_PARTITION = re.compile(r"^(\d{6})\.cols$")
+
+# MI_INDEX returns several tables; the per-stock quotes are the one titled "每日收盤行情".
+# Located by title in case TWSE reorders the tables.
+MI_INDEX_STOCK_TABLE = "每日收盤行情"
+
+
+@dataclass(frozen=True)
+class Quote:
+    """One security's quote for one day; prices in TWD, volume in shares, value in TWD."""
+
+    code: str
+    name: str
+    open: float = NAN
+    high: float = NAN
+    low: float = NAN
+    close: float = NAN
+    change: float = NAN
+    volume: float = NAN
+    value: float = NAN
+
+
+def _number(value: Any) -> float:
+    number = parse_number(value)
+    return NAN if number is None else float(number)
+
+
+def mi_index_stock_table(resp: Any) -> Optional[Dict[str, Any]]:
+    """The per-stock table of a TWSE ``MI_INDEX`` response, or None."""
+    if not isinstance(resp, Mapping):
+        return None
+    return next((t for t in resp.get("tables") or [] if MI_INDEX_STOCK_TABLE in (t.get("title") or "")), None)
+
+
+def twse_quotes(rows: Iterable[Sequence[Any]]) -> List[Quote]:
+    """Quotes from ``MI_INDEX`` per-stock rows.
+
+    Row layout: 證券代號, 證券名稱, 成交股數, 成交筆數, 成交金額, 開盤價, 最高價, 最低價,
+    收盤價, 漲跌(+/-) (an HTML fragment), 漲跌價差 (unsigned), ...
+    """
+    quotes = []
+    for row in rows:
+        if len(row) < 11 or not str(row[0]).strip():
+            continue
+        change = _number(row[10])
+        if "-" in str(row[9]) and not math.isnan(change):
+            change = -change
+        quotes.append(Quote(str(row[0]).strip(), str(row[1]).strip(), _number(row[5]), _number(row[6]),
+                            _number(row[7]), _number(row[8]), change, _number(row[2]), _number(row[4])))
+    return quotes
+
+
+def tpex_quotes(rows: Iterable[Mapping[str, Any]]) -> Tuple[Optional[str], List[Quote]]:
+    """Trading day (YYYYMMDD, from the rows' ROC ``Date``) and quotes of TPEx daily close rows."""
+    day: Optional[str] = None
+    quotes = []
+    for row in rows:
+        if not isinstance(row, Mapping):
+            continue
+        code = str(row.get("SecuritiesCompanyCode") or "").strip()
+        if not code:
+            continue
+        if day is None and row.get("Date"):
+            try:
+                day = roc_to_ad(str(row["Date"])).replace("-", "")
+            except (ValueError, IndexError):
+                pass
+        quotes.append(Quote(code, str(row.get("CompanyName") or "").strip(), _number(row.get("Open")),
+                            _number(row.get("High")), _number(row.get("Low")), _number(row.get("Close")),
+                            _number(row.get("Change")), _number(row.get("TradingShares")),
+                            _number(row.get("TransactionAmount"))))
+    return day, quotes
+
+
+class Partition:
+    """One market-month partition, memory-mapped read-only."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, length = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"not a quote store partition: {path}")
+        header = json.loads(self._mm[_HEADER.size:_HEADER.size + length].decode("utf-8"))
+        self.dates: List[str] = header["dates"]
+        self.codes: List[str] = header["codes"]
+        self.names: List[str] = header["names"]
+        self.date_pos = {d: i for i, d in enumerate(self.dates)}
+        self.code_pos = {c: i for i, c in enumerate(self.codes)}
+        width = len(self.dates) * len(self.codes)
+        offset = _HEADER.size + length
+        if offset + width * 8 * len(header["fields"]) > len(self._mm):
+            raise ValueError(f"truncated quote store partition: {path}")
+        view = memoryview(self._mm)
+        self.columns: Dict[str, memoryview] = {}
+        for field in header["fields"]:
+            self.columns[field] = view[offset:offset + width * 8].cast("d")
+            offset += width * 8
+
+    def row(self, field: str, position: int) -> memoryview:
+        """``field`` of every code (in ``codes`` order) on ``dates[position]``."""
+        n = len(self.codes)
+        return self.columns[field][position * n:(position + 1) * n]
+
+
+def _write_partition(path: str, dates: List[str], codes: List[str], names: List[str],
+                     columns: Mapping[str, array]) -> None:
+    header = json.dumps({"dates": dates, "codes": codes, "names": names, "fields": list(FIELDS)},
+                        ensure_ascii=False).encode("utf-8")
+    header += b" " * (-len(header) % 8)  # keep the float blocks 8-byte aligned
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(header)))
+        f.write(header)
+        for field in FIELDS:
+            columns[field].tofile(f)
+    os.replace(tmp, path)
+
+
+class QuoteStore:
+    """Append-only daily quote store under ``root``; see the module docstring for the layout."""
+
+    def __init__(self, root: str):
+        self.root = os.path.expanduser(root)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        # (market, month) -> ((mtime_ns, size), Partition); reloaded when the file changes.
+        self._partitions: Dict[Tuple[str, str], Tuple[Tuple[int, int], Partition]] = {}
+
+    @classmethod
+    def from_config(cls) -> Optional["QuoteStore"]:
+        """The store at ``TWSE_QUOTE_STORE_PATH``; None when it is unset."""
+        return cls(APIConfig.QUOTE_STORE_PATH) if APIConfig.QUOTE_STORE_PATH else None
+
+    def _path(self, market: str, month: str) -> str:
+        return os.path.join(self.root, market, f"{month}.cols")
+
+    def months(self, market: str) -> List[str]:
+        """Stored months (YYYYMM) of ``market``, ascending."""
+        try:
+            names = os.listdir(os.path.join(self.root, market))
+        except OSError:
+            return []
+        return sorted(m.group(1) for m in map(_PARTITION.match, names) if m)
+
+    def partition(self, market: str, month: str) -> Optional[Partition]:
+        """The current ``market`` / ``month`` partition, or None if nothing is stored for it."""
+        path = self._path(market, month)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        version = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._partitions.get((market, month))
+            if cached is not None and cached[0] == version:
+                return cached[1]
+        try:
+            part = Partition(path)
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            logger.warning(f"Ignoring unreadable quote store partition {path}: {e}")
+            return None
+        with self._lock:
+            self._partitions[(market, month)] = (version, part)
+        return part
+
+    def has(self, market: str, day: str) -> bool:
+        """Whether ``market``'s quotes for ``day`` (YYYYMMDD) are stored."""
+        part = self.partition(market, day[:6])
+        return part is not None and day in part.date_pos
+
+    def days(self, market: str, start: str = "", end: str = "") -> List[str]:
+        """Stored trading days (YYYYMMDD) of ``market`` within ``start``..``end`` (inclusive)."""
+        return [day for day, _codes, _values in self.rows(market, start, end, fields=())]
+
+    def append(self, market: str, day: str, quotes: Sequence[Quote]) -> bool:
+        """Store ``market``'s quotes for ``day`` (YYYYMMDD).
+
+        False (and nothing written) when the day is already stored or ``quotes`` is
+        empty. I/O errors are logged, never raised: the store is an optimisation.
+        """
+        if market not in MARKETS:
+            raise ValueError(f"unknown market {market!r}; expected one of {MARKETS}")
+        if not quotes or not re.fullmatch(r"\d{8}", day):
+            return False
+        month = day[:6]
+        with self._write_lock:
+            part = self.partition(market, month)
+            if part is not None and day in part.date_pos:
+                return False
+            names: Dict[str, str] = dict(zip(part.codes, part.names)) if part is not None else {}
+            for q in quotes:
+                names[q.code] = q.name or names.get(q.code, "")
+            dates = sorted((part.dates if part is not None else []) + [day])
+            codes = sorted(names)
+            date_pos = {d: i for i, d in enumerate(dates)}
+            code_pos = {c: i for i, c in enumerate(codes)}
+            n = len(codes)
+            columns = {field: array("d", [NAN]) * (len(dates) * n) for field in FIELDS}
+            if part is not None:
+                same_codes = part.codes == codes
+                moved = [(code_pos[c], i) for i, c in enumerate(part.codes)]
+                for old_d, d in enumerate(part.dates):
+                    base = date_pos[d] * n
+                    for field in FIELDS:
+                        target, source = columns[field], part.row(field, old_d)
+                        if same_codes:
+                            target[base:base + n] = array("d", source.tobytes())
+                            continue
+                        for new_c, old_c in moved:
+                            target[base + new_c] = source[old_c]
+            base = date_pos[day] * n
+            for q in quotes:
+                values = astuple(q)[2:]
+                for field, value in zip(FIELDS, values):
+                    columns[field][base + code_pos[q.code]] = value
+            path = self._path(market, month)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                _write_partition(path, dates, codes, [names[c] for c in codes], columns)
+            except OSError as e:
+                logger.warning(f"Could not store {market} quotes for {day} in {path}: {e}")
+                return False
+        logger.info(f"Quote store: {market} {day} stored ({len(quotes)} securities)")
+        return True
+
+    def rows(self, market: str, start: str = "", end: str = "", fields: Sequence[str] = ("close",),
+             reverse: bool = False) -> Iterator[Tuple[str, List[str], List[memoryview]]]:
+        """``(day, codes, [values per field])`` for each stored day in ``start``..``end``, in date order.
+
+        ``values[i]`` belongs to ``codes[i]``; both are views into the partition, valid
+        while it is referenced. ``reverse`` walks from the latest day back.
+        """
+        months = [m for m in self.months(market) if (not start or m >= start[:6]) and (not end or m <= end[:6])]
+        for month in reversed(months) if reverse else months:
+            part = self.partition(market, month)
+            if part is None:
+                continue
+            positions = [i for i, d in enumerate(part.dates) if (not start or d >= start) and (not end or d <= end)]
+            for i in reversed(positions) if reverse else positions:
+                yield part.dates[i], part.codes, [part.row(field, i) for field in fields]
+
+    def blocks(self, market: str, start: str = "", end: str = "", fields: Sequence[str] = ("close",)
+               ) -> Iterator[Tuple[List[str], List[str], List[memoryview]]]:
+        """``(days, codes, [values per field])`` per stored month overlapping ``start``..``end``.
+
+        ``values`` covers exactly ``days`` (date-major, ``values[d * len(codes) + c]``), so
+        ``values[c::len(codes)]`` is one code's series for the month without copying.
+        """
+        for month in self.months(market):
+            if (start and month < start[:6]) or (end and month > end[:6]):
+                continue
+            part = self.partition(market, month)
+            if part is None:
+                continue
+            positions = [i for i, d in enumerate(part.dates) if (not start or d >= start) and (not end or d <= end)]
+            if not positions:
+                continue
+            n = len(part.codes)
+            lo, hi = positions[0] * n, (positions[-1] + 1) * n
+            yield ([part.dates[i] for i in positions], part.codes,
+                   [part.columns[field][lo:hi] for field in fields])
+
+    def series(self, market: str, code: str, start: str = "", end: str = "") -> List[Tuple[str, Quote]]:
+        """``(day, Quote)`` for every stored day in ``start``..``end`` on which ``code`` traded."""
+        code = code.strip()
+        result: List[Tuple[str, Quote]] = []
+        for month in self.months(market):
+            if (start and month < start[:6]) or (end and month > end[:6]):
+                continue
+            part = self.partition(market, month)
+            c = part.code_pos.get(code) if part is not None else None
+            if c is None:
+                continue
+            n = len(part.codes)
+            for i, d in enumerate(part.dates):
+                if (start and d < start) or (end and d > end):
+                    continue
+                values = [part.columns[field][i * n + c] for field in FIELDS]
+                if all(math.isnan(v) for v in values):
+                    continue
+                result.append((d, Quote(code, part.names[c], *values)))
+        return result
+
+    def name(self, market: str, code: str) -> str:
+        """``code``'s name in the latest partition that lists it ("" if none)."""
+        for month in reversed(self.months(market)):
+            part = self.partition(market, month)
+            c = part.code_pos.get(code) if part is not None else None
+            if c is not None:
+                return part.names[c]
+        return ""
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.root, "days": {market: len(self.days(market)) for market in MARKETS}}
+
+
+__all__ = [
+    "FIELDS", "MARKETS", "MI_INDEX_STOCK_TABLE", "Partition", "Quote", "QuoteStore",
+    "mi_index_stock_table", "tpex_quotes", "twse_quotes",
+]
@@ -0,0 +1,169 @@
+"""Per-host token-bucket rate limiting for TWSEAPIClient.
+
+TWSE, TPEx, TAIFEX and the MIS realtime service are separate upstreams with
+separate limits, so each gets its own bucket: a slow TAIFEX download no longer
+delays a TPEx quote. Buckets are keyed by host, or by ``host/path-prefix`` when
+a group is configured for part of a host (e.g. ``www.twse.com.tw/rwd``).
+
+Rates are configured through ``TWSE_RATE_LIMITS``, a comma-separated list of
+``<host>[/<path-prefix>]=<requests-per-second>:<burst>`` entries, e.g.::
+
+    TWSE_RATE_LIMITS="www.taifex.com.tw=0.5:1,mis.twse.com.tw=4:4"
+
+Anything not listed gets ``1 / TWSE_REQUEST_INTERVAL`` requests per second with a
+burst of ``TWSE_RATE_BURST``.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .config import APIConfig
+
+logger = logging.getLogger(__name__)
+
+
+def parse_rate_limits(spec: str) -> Dict[str, Tuple[float, float]]:
+    """Parse a ``TWSE_RATE_LIMITS`` string into ``{group: (rate, burst)}``."""
+    limits: Dict[str, Tuple[float, float]] = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        try:
+            group, value = entry.split("=", 1)
+            rate, _, burst = value.partition(":")
+            limits[group.strip().rstrip("/")] = (float(rate), float(burst or 1))
+        except ValueError:
+            logger.warning(f"Ignoring malformed TWSE_RATE_LIMITS entry: {entry!r}")
+    return limits
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations.
+
+    ``reserve`` always succeeds immediately and returns how long the caller must
+    wait before its request may go out, so the bucket can be shared by threads and
+    by coroutines without holding a lock while sleeping. ``rate <= 0`` disables
+    limiting.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.max_waiting = 0
+        self.acquired = 0
+        self.total_wait = 0.0
+
+    def reserve(self) -> float:
+        """Take one token and return the seconds to wait before using it."""
+        with self._lock:
+            self.acquired += 1
+            if self.rate <= 0:
+                return 0.0
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            if wait > 0:
+                self.total_wait += wait
+            return wait
+
+    def _enter_queue(self) -> None:
+        with self._lock:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def _leave_queue(self) -> None:
+        with self._lock:
+            self.waiting -= 1
+
+    def acquire(self) -> float:
+        """Block until a token is available; return the time waited."""
+        wait = self.reserve()
+        if wait > 0:
+            self._enter_queue()
+            try:
+                time.sleep(wait)
+            finally:
+                self._leave_queue()
+        return wait
+
+    async def aacquire(self) -> float:
+        """Async counterpart of ``acquire``; yields to the event loop while waiting."""
+        wait = self.reserve()
+        if wait > 0:
+            self._enter_queue()
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._leave_queue()
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "queue_depth": self.waiting,
+                "max_queue_depth": self.max_waiting,
+                "acquired": self.acquired,
+                "total_wait_seconds": round(self.total_wait, 3),
+            }
+
+
+class RateLimiter:
+    """Maps request URLs to per-host (or per-path-group) token buckets."""
+
+    def __init__(self,
+                 request_interval: float = APIConfig.REQUEST_INTERVAL,
+                 burst: float = APIConfig.RATE_BURST,
+                 limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.default_rate = 1.0 / request_interval if request_interval > 0 else 0.0
+        self.default_burst = burst
+        self.limits = parse_rate_limits(APIConfig.RATE_LIMITS) if limits is None else limits
+        # Longest prefix first so "www.twse.com.tw/rwd" wins over "www.twse.com.tw".
+        self._groups = sorted(self.limits, key=len, reverse=True)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def group_for(self, url: str) -> str:
+        parts = urlsplit(url)
+        target = f"{parts.netloc}{parts.path}"
+        for group in self._groups:
+            if target == group or target.startswith(group + "/") or (
+                    "/" not in group and parts.netloc == group):
+                return group
+        return parts.netloc
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        group = self.group_for(url)
+        with self._lock:
+            bucket = self._buckets.get(group)
+            if bucket is None:
+                rate, burst = self.limits.get(group, (self.default_rate, self.default_burst))
+                bucket = self._buckets[group] = TokenBucket(rate, burst)
+            return bucket
+
+    def acquire(self, url: str) -> None:
+        wait = self.bucket_for(url).acquire()
+        if wait > 0:
+            logger.debug(f"Rate limiting {self.group_for(url)}: waited {wait:.2f} seconds")
+
+    async def aacquire(self, url: str) -> None:
+        wait = await self.bucket_for(url).aacquire()
+        if wait > 0:
+            logger.debug(f"Rate limiting {self.group_for(url)}: waited {wait:.2f} seconds")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {group: bucket.stats() for group, bucket in buckets.items()}
+
+
+__all__ = ["TokenBucket", "RateLimiter", "parse_rate_limits"]
@@ -0,0 +1,113 @@
+"""Compact, read-only row storage for cached OpenAPI lists.
+
+``json.loads`` gives every row of a list endpoint its own dict, each with a
+hash table sized for keys like "稅後純益率(%)(稅後純益)/(營業收入)"; a 1,000-row
+ESG or warrant list spends most of its memory on those tables. ``RecordBuilder``
+(a ``json.loads`` object hook) and ``compact_rows`` store each row as a ``Record``:
+a ``__slots__`` object holding a shared ``Schema`` (field → position, one per
+distinct field list) and a tuple of values.
+Repeated string values within a list ("N/A", report dates, industry names) are
+stored once.
+
+``Record`` is a read-only ``Mapping``: ``row["公司代號"]``, ``row.get(...)``,
+``.items()``, iteration and ``==`` against dicts work as before, so formatters
+and tools take records unchanged. Cached rows are shared between callers and
+must not be mutated anyway; ``dict(row)`` gives a private mutable copy.
+"""
+
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+
+class Schema:
+    """Field names of a row shape and their positions, shared by every row with that shape."""
+
+    __slots__ = ("fields", "index")
+
+    def __init__(self, fields: Tuple[str, ...]):
+        self.fields = fields
+        self.index: Dict[str, int] = {field: i for i, field in enumerate(fields)}
+
+
+_schemas: Dict[Tuple[str, ...], Schema] = {}
+_schemas_lock = threading.Lock()
+
+
+def schema_for(fields: Tuple[str, ...]) -> Schema:
+    """The process-wide ``Schema`` for ``fields`` (same field order, same object)."""
+    schema = _schemas.get(fields)
+    if schema is None:
+        with _schemas_lock:
+            schema = _schemas.setdefault(fields, Schema(fields))
+    return schema
+
+
+class Record(Mapping):
+    """Read-only dict-compatible row backed by a shared schema and a value tuple."""
+
+    __slots__ = ("_schema", "_values")
+
+    def __init__(self, schema: Schema, values: Tuple[Any, ...]):
+        self._schema = schema
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        i = self._schema.index.get(key)
+        if i is None:
+            raise KeyError(key)
+        return self._values[i]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        i = self._schema.index.get(key)
+        return default if i is None else self._values[i]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._schema.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._schema.fields)
+
+    def __len__(self) -> int:
+        return len(self._schema.fields)
+
+    def __repr__(self) -> str:
+        return repr(dict(zip(self._schema.fields, self._values)))
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(zip(self._schema.fields, self._values))
+
+    def __reduce__(self):
+        return (Record, (self._schema, self._values))
+
+    @property
+    def values_tuple(self) -> Tuple[Any, ...]:
+        return self._values
+
+
+class RecordBuilder:
+    """``json.loads`` ``object_hook`` that builds ``Record``s while parsing.
+
+    Each object becomes a record as soon as it is decoded, so the per-row dicts are
+    freed immediately and never all alive at once. One builder per document: it
+    also de-duplicates equal string values across rows.
+    """
+
+    __slots__ = ("_shared",)
+
+    def __init__(self):
+        self._shared: Dict[str, str] = {}
+
+    def __call__(self, row: Dict[str, Any]) -> "Record":
+        shared = self._shared
+        values = tuple(shared.setdefault(v, v) if type(v) is str else v for v in row.values())
+        return Record(schema_for(tuple(row)), values)
+
+
+def compact_rows(rows: Sequence[Any]) -> List[Any]:
+    """Convert already-parsed dict rows to ``Record``s; anything else is kept as is."""
+    build = RecordBuilder()
+    return [build(row) if type(row) is dict else row for row in rows]
+
+
+__all__ = ["Record", "RecordBuilder", "Schema", "compact_rows", "schema_for"]
@@ -0,0 +1,191 @@
+"""Security master: every TWSE- and TPEx-traded symbol with its market.
+
+MIS realtime quotes (and several report endpoints) need to know whether a code
+trades on TWSE (``tse``) or TPEx (``otc``); guessing costs a wasted round trip
+for every OTC symbol. The master merges the TWSE company / daily-quote / warrant
+lists with the TPEx company and daily-quote lists into one
+code → ``Security(market, name, industry, type)`` table.
+
+It is rebuilt at most once per Asia/Taipei day on a daemon thread, like the
+trading calendar, and written to ``TWSE_SECURITY_MASTER_PATH`` (when set) so a
+restarted server routes correctly before the first rebuild finishes. Until it
+is loaded, lookups return None and callers fall back to probing.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import astuple, dataclass
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .config import APIConfig
+from .expiry import taipei_today
+
+logger = logging.getLogger(__name__)
+
+TPEX_OPENAPI = "https://www.tpex.org.tw/openapi/v1"
+
+
+@dataclass(frozen=True)
+class Security:
+    code: str
+    market: str  # "tse" (TWSE listed) or "otc" (TPEx)
+    name: str = ""
+    industry: str = ""
+    type: str = "stock"  # "stock", "etf" or "warrant"
+
+
+@dataclass(frozen=True)
+class Source:
+    """One upstream list feeding the master.
+
+    ``url`` is an OpenAPI endpoint (relative to the TWSE base URL) or an absolute
+    TPEx URL. ``type`` None means inferred from the code (ETFs start with "00").
+    """
+
+    url: str
+    market: str
+    code_field: str
+    name_fields: Tuple[str, ...]
+    industry_field: Optional[str] = None
+    type: Optional[str] = None
+
+
+# Earlier sources win a code's market and type; later ones only fill missing fields.
+SOURCES: Tuple[Source, ...] = (
+    Source("/opendata/t187ap03_L", "tse", "公司代號", ("公司簡稱", "公司名稱"), "產業別", "stock"),
+    Source("/exchangeReport/STOCK_DAY_ALL", "tse", "Code", ("Name",)),
+    Source("/opendata/t187ap37_L", "tse", "權證代號", ("權證簡稱", "權證名稱"), type="warrant"),
+    Source(f"{TPEX_OPENAPI}/mopsfin_t187ap03_O", "otc", "SecuritiesCompanyCode",
+           ("CompanyAbbreviation", "CompanyName"), "SecuritiesIndustryCode", "stock"),
+    Source(f"{TPEX_OPENAPI}/tpex_mainboard_daily_close_quotes", "otc", "SecuritiesCompanyCode", ("CompanyName",)),
+)
+
+
+def _text(row: Mapping, *fields: str) -> str:
+    for field in fields:
+        value = row.get(field)
+        if value is not None and str(value).strip():
+            return str(value).strip()
+    return ""
+
+
+def build_securities(datasets: Iterable[Tuple[Source, Sequence[Any]]]) -> Dict[str, Security]:
+    """Merge source lists, in order, into a code → Security table."""
+    table: Dict[str, Security] = {}
+    for source, rows in datasets:
+        for row in rows:
+            if not isinstance(row, Mapping):
+                continue
+            code = _text(row, source.code_field)
+            if not code:
+                continue
+            name = _text(row, *source.name_fields)
+            industry = _text(row, source.industry_field) if source.industry_field else ""
+            known = table.get(code)
+            if known is None:
+                kind = source.type or ("etf" if code.startswith("00") else "stock")
+                table[code] = Security(code, source.market, name, industry, kind)
+            elif (not known.name and name) or (not known.industry and industry):
+                table[code] = Security(code, known.market, known.name or name,
+                                       known.industry or industry, known.type)
+    return table
+
+
+class SecurityMaster:
+    """Thread-safe code → Security table, refreshed daily and persisted to ``path``."""
+
+    def __init__(self, path: str = ""):
+        self.path = os.path.expanduser(path) if path else ""
+        self._lock = threading.Lock()
+        self._table: Dict[str, Security] = {}
+        self._loaded_on: Optional[date] = None
+        self._last_attempt = 0.0
+        if self.path:
+            self._read()
+
+    @classmethod
+    def from_config(cls) -> "SecurityMaster":
+        return cls(APIConfig.SECURITY_MASTER_PATH)
+
+    def _read(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stored = json.load(f)
+            table = {row[0]: Security(*row) for row in stored["securities"]}
+            loaded_on = date.fromisoformat(stored["date"])
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable security master {self.path}: {e}")
+            return
+        with self._lock:
+            self._table = table
+            self._loaded_on = loaded_on
+
+    def _write(self, table: Dict[str, Security], loaded_on: date) -> None:
+        directory = os.path.dirname(self.path)
+        tmp = f"{self.path}.tmp"
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"date": loaded_on.isoformat(),
+                           "securities": [astuple(s) for s in table.values()]}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist the security master to {self.path}: {e}")
+
+    def load(self, table: Dict[str, Security]) -> None:
+        if not table:
+            raise ValueError("security master is empty")
+        loaded_on = taipei_today()
+        with self._lock:
+            self._table = table
+            self._loaded_on = loaded_on
+        if self.path:
+            self._write(table, loaded_on)
+        logger.info(f"Security master loaded: {len(table)} symbols")
+
+    def refresh(self, fetch: Callable[[str], Sequence[Any]], sources: Sequence[Source] = SOURCES) -> None:
+        """Rebuild from ``sources`` now; a failing source is skipped, not fatal."""
+        datasets: List[Tuple[Source, Sequence[Any]]] = []
+        for source in sources:
+            try:
+                rows = fetch(source.url)
+            except Exception as e:
+                logger.warning(f"Security master source {source.url} failed: {e}")
+                continue
+            datasets.append((source, rows if isinstance(rows, list) else []))
+        self.load(build_securities(datasets))
+
+    def refresh_async(self, fetch: Callable[[str], Sequence[Any]], retry_after: float = 3600.0) -> None:
+        """``refresh`` on a daemon thread if not loaded today; retried at most once per ``retry_after``."""
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded_on == taipei_today() or now - self._last_attempt < retry_after:
+                return
+            self._last_attempt = now
+
+        def _run() -> None:
+            try:
+                self.refresh(fetch)
+            except Exception as e:
+                logger.warning(f"Could not build the security master: {e}")
+
+        threading.Thread(target=_run, daemon=True, name="twse-security-master").start()
+
+    def get(self, code: str) -> Optional[Security]:
+        with self._lock:
+            return self._table.get(code.strip())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._table)
+
+
+__all__ = ["SOURCES", "Security", "SecurityMaster", "Source", "build_securities"]
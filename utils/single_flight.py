@@ -0,0 +1,140 @@
+"""Single-flight coalescing of identical in-flight upstream requests.
+
+When an LLM fans out several tools at once, many of them miss the cache for the
+same key at the same moment. The first caller for a key (the *leader*) performs
+the request; every caller that arrives while it is in flight (a *follower*)
+waits for the leader's result, or exception, instead of issuing its own. A
+cancelled async leader does not pass its cancellation on: its followers retry,
+and one of them becomes the new leader.
+
+Sync callers and coroutines share one registry, so a thread and a coroutine
+asking for the same key are coalesced as well.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "abandoned", "loop", "waiters")
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        # Set when the leader was cancelled: followers retry instead of taking an outcome.
+        self.abandoned = False
+        # Event loop of an async leader (None for a sync leader).
+        self.loop = loop
+        self.waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def outcome(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class SingleFlight:
+    """Registry of in-flight calls keyed by request identity."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _join(self, key: Hashable, loop: Optional[asyncio.AbstractEventLoop]) -> Tuple[_Call, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                return call, False
+            call = self._calls[key] = _Call(loop)
+            self.leaders += 1
+            return call, True
+
+    def _finish(self, key: Hashable, call: _Call, result: Any, error: Optional[BaseException],
+                abandoned: bool = False) -> None:
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+            call.result, call.error, call.abandoned = result, error, abandoned
+            call.done.set()
+            waiters, call.waiters = call.waiters, []
+        for loop, future in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_wake, future)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run ``fn`` for ``key`` unless an identical call is already in flight."""
+        loop = _running_loop()
+        with self._lock:
+            call = self._calls.get(key)
+            # A sync caller running on an event loop thread must not block waiting for an
+            # async leader on that same loop: the leader could never resume. Fetch directly.
+            bypass = call is not None and loop is not None and call.loop is loop
+        if bypass:
+            return fn()
+
+        call, leader = self._join(key, None)
+        while not leader:
+            call.done.wait()
+            if not call.abandoned:
+                return call.outcome()
+            call, leader = self._join(key, None)
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, call, None, e)
+            raise
+        self._finish(key, call, result, None)
+        return result
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async counterpart of ``do``; followers await the leader without blocking the loop."""
+        loop = asyncio.get_running_loop()
+        call, leader = self._join(key, loop)
+        while not leader:
+            with self._lock:
+                future = None
+                if not call.done.is_set():
+                    future = loop.create_future()
+                    call.waiters.append((loop, future))
+            if future is not None:
+                await future
+            if not call.abandoned:
+                return call.outcome()
+            call, leader = self._join(key, loop)
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # Only this caller was cancelled: let the followers retry rather than fail.
+            self._finish(key, call, None, None, abandoned=True)
+            raise
+        except BaseException as e:
+            self._finish(key, call, None, e)
+            raise
+        self._finish(key, call, result, None)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"in_flight": len(self._calls), "leaders": self.leaders, "coalesced": self.coalesced}
+
+
+__all__ = ["SingleFlight"]
@@ -0,0 +1,288 @@
+"""Dated archive of latest-only OpenAPI datasets.
+
+TPEx ``tpex_mainboard_*`` / ``tpex_3insti_daily_trading``, TAIFEX ``DailyMarketReport*``,
+``OpenInterestOfLargeTraders*`` and ``DailyOptionsDelta``, and TWSE OpenAPI
+``BWIBBU_ALL`` only ever return the latest trading day. Every payload their tools
+fetch is captured here under the data date found in its rows, so the tools' ``date``
+parameter can answer past days.
+
+Payloads are stored column-wise (field names once, then value rows), zlib-compressed,
+in a SQLite file keyed by content digest: recapturing an unchanged day writes
+nothing, and identical payloads are kept once. A later capture of the same day
+with different content (an upstream correction) replaces it.
+
+Enabled by setting ``TWSE_SNAPSHOT_PATH``. Tools capture as they are called;
+``python -m utils.snapshots`` captures every source at once, for a daily cron
+entry after the evening publications (e.g. ``0 21 * * 1-5``).
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .config import APIConfig
+
+logger = logging.getLogger(__name__)
+
+# Row fields carrying the data date, in ROC ("1150601", "115/06/01") or AD form.
+DATE_FIELDS = ("Date", "日期")
+
+SNAPSHOTS_DISABLED = "歷史快照未啟用，請設定環境變數 TWSE_SNAPSHOT_PATH 後，查詢過的最新資料即會依資料日期保存"
+
+
+def snapshot_day(value: Any) -> Optional[str]:
+    """A data date as YYYYMMDD: "1150601", "115/06/01", "20260601", "2026/06/01" or "2026-06-01"."""
+    text = str(value).strip()
+    parts = text.replace("-", "/").split("/")
+    if len(parts) == 3 and all(p.isdigit() for p in parts):
+        year, month, day = (int(p) for p in parts)
+    elif text.isdigit() and len(text) in (6, 7, 8):
+        year, month, day = int(text[:-4]), int(text[-4:-2]), int(text[-2:])
+    else:
+        return None
+    if year < 1911:
+        year += 1911
+    try:
+        return datetime(year, month, day).strftime("%Y%m%d")
+    except ValueError:
+        return None
+
+
+def data_day(rows: Sequence[Any]) -> Optional[str]:
+    """The data date of a latest-only list, read from its first row's date field (dicts or ``Record`` rows)."""
+    if not rows or not isinstance(rows[0], Mapping):
+        return None
+    for field in DATE_FIELDS:
+        if field in rows[0]:
+            return snapshot_day(rows[0][field])
+    return None
+
+
+def _encode(rows: Sequence[Mapping]) -> bytes:
+    """Column-wise JSON: the field names once, then each row's values (absent fields as null)."""
+    fields: Dict[str, None] = {}
+    for row in rows:
+        fields.update(dict.fromkeys(row))
+    names = list(fields)
+    body = {"fields": names, "rows": [[row.get(name) for name in names] for row in rows]}
+    return json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _decode(raw: bytes) -> List[Dict[str, Any]]:
+    body = json.loads(raw.decode("utf-8"))
+    names = body["fields"]
+    return [{name: value for name, value in zip(names, values) if value is not None} for values in body["rows"]]
+
+
+class SnapshotArchive:
+    """SQLite store of latest-only payloads by (dataset, data date), deduplicated by content."""
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS payloads (digest TEXT PRIMARY KEY, body BLOB NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            " dataset TEXT NOT NULL, day TEXT NOT NULL, digest TEXT NOT NULL,"
+            " rows INTEGER NOT NULL, captured_at REAL NOT NULL, PRIMARY KEY (dataset, day))"
+        )
+        # dataset -> (last list captured, its day): the client hands back the same cached
+        # object until it refreshes, so repeated tool calls skip re-encoding it.
+        self._seen: Dict[str, Tuple[Any, str]] = {}
+        self.captured = 0
+        self.unchanged = 0
+
+    @classmethod
+    def from_config(cls) -> Optional["SnapshotArchive"]:
+        """The archive at ``TWSE_SNAPSHOT_PATH``; None when it is unset or unusable."""
+        if not APIConfig.SNAPSHOT_PATH:
+            return None
+        try:
+            return cls(APIConfig.SNAPSHOT_PATH)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Snapshot archive disabled, cannot open {APIConfig.SNAPSHOT_PATH}: {e}")
+            return None
+
+    def capture(self, dataset: str, rows: Any) -> Optional[str]:
+        """Store ``rows`` under their data date; returns that date (None when it has none)."""
+        if not isinstance(rows, list) or not rows:
+            return None
+        with self._lock:
+            seen = self._seen.get(dataset)
+        if seen is not None and seen[0] is rows:
+            return seen[1]
+        day = data_day(rows)
+        if day is None:
+            logger.debug(f"Not capturing {dataset}: no data date in its rows")
+            return None
+        raw = _encode(rows)
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            current = self._conn.execute(
+                "SELECT digest FROM snapshots WHERE dataset = ? AND day = ?", (dataset, day)).fetchone()
+            if current is not None and current[0] == digest:
+                self.unchanged += 1
+            else:
+                body = zlib.compress(raw, 9)
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.execute("INSERT OR IGNORE INTO payloads (digest, body, size) VALUES (?, ?, ?)",
+                                       (digest, body, len(body)))
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO snapshots (dataset, day, digest, rows, captured_at) VALUES (?, ?, ?, ?, ?)",
+                        (dataset, day, digest, len(rows), time.time()))
+                    if current is not None:
+                        self._conn.execute(
+                            "DELETE FROM payloads WHERE digest = ? AND NOT EXISTS"
+                            " (SELECT 1 FROM snapshots WHERE digest = ?)", (current[0], current[0]))
+                    self._conn.execute("COMMIT")
+                except sqlite3.Error:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self.captured += 1
+                logger.info(f"Captured {dataset} snapshot for {day} ({len(rows)} rows, {len(body)} bytes)")
+            self._seen[dataset] = (rows, day)
+        return day
+
+    def get(self, dataset: str, day: str) -> Optional[List[Dict[str, Any]]]:
+        """The rows captured for ``dataset`` on ``day`` (YYYYMMDD); None when there are none."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT p.body FROM snapshots s JOIN payloads p ON p.digest = s.digest"
+                " WHERE s.dataset = ? AND s.day = ?", (dataset, day)).fetchone()
+        if row is None:
+            return None
+        try:
+            return _decode(zlib.decompress(row[0]))
+        except (zlib.error, ValueError, KeyError) as e:
+            logger.warning(f"Unreadable {dataset} snapshot for {day}: {e}")
+            return None
+
+    def days(self, dataset: str) -> List[str]:
+        """Captured days (YYYYMMDD) of ``dataset``, ascending."""
+        with self._lock:
+            return [day for (day,) in self._conn.execute(
+                "SELECT day FROM snapshots WHERE dataset = ? ORDER BY day", (dataset,))]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            datasets = dict(self._conn.execute("SELECT dataset, COUNT(*) FROM snapshots GROUP BY dataset"))
+            payloads, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM payloads").fetchone()
+        return {"path": self.path, "days": datasets, "payloads": payloads, "bytes": size,
+                "captured": self.captured, "unchanged": self.unchanged}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def snapshot_rows(client: Any, dataset: str, date: str,
+                  fetch: Callable[[], Any]) -> Tuple[Optional[List[Dict[str, Any]]], str]:
+    """Rows for a latest-only tool: ``(rows, "")``, or ``(None, message)`` to return instead.
+
+    Without ``date`` the live list is fetched (and captured, if the archive is enabled).
+    With ``date`` the snapshot of that day is read; the live list is only fetched for
+    a day after the last captured one, and used when it is that day's data.
+    """
+    archive = client.snapshots
+    if not date:
+        rows = fetch()
+        if archive is not None:
+            archive.capture(dataset, rows)
+        return rows, ""
+    if archive is None:
+        return None, SNAPSHOTS_DISABLED
+    day = snapshot_day(date)
+    if day is None:
+        return None, f"日期格式錯誤：{date}，請使用 YYYYMMDD"
+    rows = archive.get(dataset, day)
+    if rows is not None:
+        return rows, ""
+    days = archive.days(dataset)
+    if not days or day > days[-1]:
+        live = fetch()
+        if archive.capture(dataset, live) == day:
+            return live, ""
+        days = archive.days(dataset)
+    if not days:
+        return None, f"尚未保存任何 {dataset} 快照，查無 {day} 的資料"
+    return None, f"查無 {day} 的 {dataset} 快照，已保存 {len(days)} 日：{'、'.join(days[-10:])}{'（最近 10 日）' if len(days) > 10 else ''}"
+
+
+def build_sources() -> Dict[str, Callable[[Any], Any]]:
+    """dataset -> fetch(client) for every archived source, using the tools' URLs."""
+    from tools.otc import daily_close, institutional, margin_balance
+    from tools.taifex import daily_market_report, large_traders_oi, options_analytics
+    from tools.taifex.futures_position import TAIFEX_HEADERS
+
+    return {
+        "tpex_mainboard_daily_close_quotes": lambda c: c.fetch_json(daily_close.TPEX_DAILY_CLOSE_URL),
+        "tpex_3insti_daily_trading": lambda c: c.fetch_json(institutional.TPEX_3INSTI_URL),
+        "tpex_mainboard_margin_balance": lambda c: c.fetch_json(margin_balance.TPEX_MARGIN_URL),
+        "DailyMarketReportFut": lambda c: c.fetch_json(daily_market_report.TAIFEX_FUT_REPORT_URL,
+                                                       headers=TAIFEX_HEADERS),
+        "DailyMarketReportOpt": lambda c: c.fetch_json(daily_market_report.TAIFEX_OPT_REPORT_URL,
+                                                       headers=TAIFEX_HEADERS),
+        "OpenInterestOfLargeTradersFutures": lambda c: large_traders_oi._fetch_json_with_csv_fallback(
+            c, large_traders_oi.TAIFEX_LT_FUT_URL, TAIFEX_HEADERS),
+        "OpenInterestOfLargeTradersOptions": lambda c: c.fetch_json(large_traders_oi.TAIFEX_LT_OPT_URL,
+                                                                    headers=TAIFEX_HEADERS),
+        "DailyOptionsDelta": lambda c: c.fetch_json(options_analytics._DELTA_URL, headers=TAIFEX_HEADERS),
+        "BWIBBU_ALL": lambda c: c.fetch_data("/exchangeReport/BWIBBU_ALL"),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m utils.snapshots",
+                                     description="Capture today's latest-only datasets into the snapshot archive.")
+    parser.add_argument("--list", action="store_true", help="only list the captured days per dataset")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    archive = SnapshotArchive.from_config()
+    if archive is None:
+        logger.error("TWSE_SNAPSHOT_PATH is not set: there is no snapshot archive")
+        return 2
+    sources = build_sources()
+    if args.list:
+        for dataset in sources:
+            days = archive.days(dataset)
+            logger.info(f"{dataset}: {len(days)} days" + (f" ({days[0]}~{days[-1]})" if days else ""))
+        return 0
+
+    from .api_client import TWSEAPIClient
+
+    client = TWSEAPIClient(snapshots=archive)
+    failures = 0
+    for dataset, fetch in sources.items():
+        try:
+            day = archive.capture(dataset, fetch(client))
+        except Exception as e:
+            failures += 1
+            logger.warning(f"{dataset}: capture failed: {e}")
+            continue
+        logger.info(f"{dataset}: {day or 'no data date'}")
+    client.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
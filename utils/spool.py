@@ -0,0 +1,130 @@
+"""Spooling of large download bodies off the Python heap.
+
+TAIFEX ``*Down`` CSV downloads run to tens of megabytes for a month of options.
+``requests``' ``resp.content`` (and ``fetch_bytes``) hold the whole body as one
+``bytes`` object before parsing starts. ``Spool`` takes the body chunk by chunk
+instead: small bodies stay in memory, larger ones go to an unlinked temporary
+file that is returned as a read-only ``mmap``. Either result is a bytes-like
+``Body`` that parsers walk with ``chunks_of`` without copying it whole.
+"""
+
+import hashlib
+import mmap
+import tempfile
+import zlib
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Union
+
+from .config import APIConfig
+
+# Bytes read from the network (or decompressed) per step.
+CHUNK_SIZE = 64 * 1024
+
+Body = Union[bytes, mmap.mmap]
+
+
+class BodyTooLarge(ValueError):
+    """A response body exceeded ``TWSE_MAX_BODY_BYTES``."""
+
+    def __init__(self, size: int, max_bytes: int):
+        super().__init__(f"response body of {size} bytes exceeds the {max_bytes}-byte limit (TWSE_MAX_BODY_BYTES)")
+        self.size = size
+        self.max_bytes = max_bytes
+
+
+class Spool:
+    """Collects a body chunk by chunk; ``finish`` returns it as bytes or a read-only mmap.
+
+    ``digest`` hashes the body as it arrives (for change detection without re-reading it).
+    """
+
+    def __init__(self, max_bytes: int = APIConfig.MAX_BODY_BYTES,
+                 memory_limit: int = APIConfig.SPOOL_MEMORY_BYTES):
+        self.max_bytes = max_bytes
+        self.memory_limit = memory_limit
+        self.size = 0
+        self._chunks: List[bytes] = []
+        self._file: Optional[BinaryIO] = None
+        self.digest = hashlib.blake2b(digest_size=16)
+
+    def check(self, size: int) -> None:
+        """Raise ``BodyTooLarge`` if ``size`` bytes (e.g. a Content-Length) exceed the limit."""
+        if self.max_bytes > 0 and size > self.max_bytes:
+            raise BodyTooLarge(size, self.max_bytes)
+
+    def write(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        self.size += len(chunk)
+        self.check(self.size)
+        self.digest.update(chunk)
+        if self._file is None and self.size > self.memory_limit:
+            self._file = tempfile.TemporaryFile()
+            for pending in self._chunks:
+                self._file.write(pending)
+            self._chunks = []
+        if self._file is not None:
+            self._file.write(chunk)
+        else:
+            self._chunks.append(chunk)
+
+    def finish(self) -> Body:
+        if self._file is None:
+            body = b"".join(self._chunks)
+            self._chunks = []
+            return body
+        try:
+            self._file.flush()
+            # The map keeps its own handle; the unlinked file goes away once it is closed.
+            return mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self._chunks = []
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def spool(chunks: Iterable[bytes], max_bytes: int = APIConfig.MAX_BODY_BYTES,
+          memory_limit: int = APIConfig.SPOOL_MEMORY_BYTES) -> Body:
+    """Collect ``chunks`` into a ``Body`` (see ``Spool``)."""
+    target = Spool(max_bytes, memory_limit)
+    try:
+        for chunk in chunks:
+            target.write(chunk)
+        return target.finish()
+    finally:
+        target.close()
+
+
+def chunks_of(body: Union[Body, bytearray, memoryview, Iterable[bytes]], size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Iterate a body in ``size``-byte slices; an iterable of chunks is passed through."""
+    if not isinstance(body, (bytes, bytearray, memoryview, mmap.mmap)):
+        yield from body
+        return
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def deflate(body: Union[Body, Iterable[bytes]], size: int = CHUNK_SIZE) -> bytes:
+    """zlib-compress a body ``size`` bytes at a time; only the compressed result is held whole."""
+    compressor = zlib.compressobj()
+    out = [compressor.compress(chunk) for chunk in chunks_of(body, size)]
+    out.append(compressor.flush())
+    return b"".join(out)
+
+
+def inflate(compressed: bytes, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Decompress a zlib stream incrementally, ``size`` output bytes at a time."""
+    decompressor = zlib.decompressobj()
+    data = compressed
+    while data:
+        yield decompressor.decompress(data, size)
+        data = decompressor.unconsumed_tail
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+__all__ = ["Body", "BodyTooLarge", "CHUNK_SIZE", "Spool", "chunks_of", "deflate", "inflate", "spool"]
@@ -1,17 +1,27 @@
 """Factory functions for creating MCP tools with reduced boilerplate."""
 
-from typing import Callable, Optional
+from typing import Awaitable, Callable, Optional
 from fastmcp import FastMCP
 from utils import (
     TWSEAPIClient,
     MSG_NO_DATA,
     DEFAULT_DISPLAY_LIMIT,
     format_list_response,
+    format_multiple_records,
     format_properties_with_values_multiline,
 )
 from utils.decorators import handle_api_errors
 from utils.types import DataFormatter
 
+def _render_rows(rows) -> str:
+    """One matching row as properties; several (e.g. one per period) as separated records."""
+    if not rows:
+        return ""
+    if len(rows) == 1:
+        return format_properties_with_values_multiline(rows[0])
+    return format_multiple_records(rows)
+
+
 def create_company_tool(mcp: FastMCP, endpoint: str, name: str, docstring: str, client: Optional[TWSEAPIClient] = None) -> Callable[[str], str]:
     """
     Create and register a standard company data query tool.
@@ -29,8 +39,7 @@ def create_company_tool(mcp: FastMCP, endpoint: str, name: str, docstring: str,
     _client = client or TWSEAPIClient.get_instance()
 
     def tool_fn(code: str) -> str:
-        data = _client.fetch_company_data(endpoint, code)
-        return format_properties_with_values_multiline(data) if data else ""
+        return _render_rows(_client.fetch_company_rows(endpoint, code))
 
     tool_fn.__name__ = name
     decorated = handle_api_errors(use_code_param=True)(tool_fn)
@@ -38,6 +47,44 @@ def create_company_tool(mcp: FastMCP, endpoint: str, name: str, docstring: str,
     return decorated
 
 
+def create_async_company_tool(mcp: FastMCP, endpoint: str, name: str, docstring: str, client: Optional[TWSEAPIClient] = None) -> Callable[[str], Awaitable[str]]:
+    """
+    Async variant of ``create_company_tool``.
+
+    The registered tool awaits ``afetch_company_rows``, so FastMCP can multiplex
+    concurrent calls on its event loop instead of blocking it on a download.
+    Arguments and return value are the same as ``create_company_tool``.
+    """
+    _client = client or TWSEAPIClient.get_instance()
+
+    async def tool_fn(code: str) -> str:
+        return _render_rows(await _client.afetch_company_rows(endpoint, code))
+
+    tool_fn.__name__ = name
+    decorated = handle_api_errors(use_code_param=True)(tool_fn)
+    mcp.tool(name=name, description=docstring)(decorated)
+    return decorated
+
+
+def _render_list(
+    client: TWSEAPIClient,
+    data,
+    filter_field: Optional[str],
+    filter_value: str,
+    label: str,
+    empty_data_type: str,
+    formatter: DataFormatter,
+    limit: int,
+    offset: int,
+) -> str:
+    """Shared "optional name filter → paginate" step of the list-tool factories."""
+    if not data:
+        return MSG_NO_DATA.format(data_type=empty_data_type)
+    if filter_field and filter_value:
+        data = client.filter_by_name(data, filter_field, filter_value)
+    return format_list_response(data, label, formatter, limit=limit, offset=offset)
+
+
 def create_list_tool(
     mcp: FastMCP,
     endpoint: str,
@@ -66,7 +113,8 @@ def create_list_tool(
             source returns no rows at all
         formatter: Per-item rendering function (the Strategy)
         filter_field: When set, the tool exposes a ``name`` keyword that
-            substring-filters rows on this field; when None, the tool only
+            substring-filters rows on this field (via ``filter_by_name``'s cached
+            n-gram index); when None, the tool only
             exposes ``limit``/``offset``
         client: TWSEAPIClient instance for dependency injection
 
@@ -76,11 +124,7 @@ def create_list_tool(
     _client = client or TWSEAPIClient.get_instance()
 
     def _render(data, filter_value: str, limit: int, offset: int) -> str:
-        if not data:
-            return MSG_NO_DATA.format(data_type=empty_data_type)
-        if filter_field and filter_value:
-            data = [d for d in data if filter_value in d.get(filter_field, "")]
-        return format_list_response(data, label, formatter, limit=limit, offset=offset)
+        return _render_list(_client, data, filter_field, filter_value, label, empty_data_type, formatter, limit, offset)
 
     if filter_field:
         def tool_fn(name: str = "", limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
@@ -94,3 +138,38 @@ def create_list_tool(
     decorated = handle_api_errors()(tool_fn)
     mcp.tool(name=name, description=docstring)(decorated)
     return decorated
+
+
+def create_async_list_tool(
+    mcp: FastMCP,
+    endpoint: str,
+    name: str,
+    docstring: str,
+    label: str,
+    empty_data_type: str,
+    formatter: DataFormatter,
+    filter_field: Optional[str] = None,
+    client: Optional[TWSEAPIClient] = None,
+) -> Callable[..., Awaitable[str]]:
+    """
+    Async variant of ``create_list_tool``.
+
+    Identical arguments and rendering; the registered tool awaits ``afetch_data``.
+    """
+    _client = client or TWSEAPIClient.get_instance()
+
+    def _render(data, filter_value: str, limit: int, offset: int) -> str:
+        return _render_list(_client, data, filter_field, filter_value, label, empty_data_type, formatter, limit, offset)
+
+    if filter_field:
+        async def tool_fn(name: str = "", limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
+            return _render(await _client.afetch_data(endpoint), name, limit, offset)
+    else:
+        async def tool_fn(limit: int = DEFAULT_DISPLAY_LIMIT, offset: int = 0) -> str:
+            return _render(await _client.afetch_data(endpoint), "", limit, offset)
+
+    tool_fn.__name__ = name
+    tool_fn.__doc__ = docstring
+    decorated = handle_api_errors()(tool_fn)
+    mcp.tool(name=name, description=docstring)(decorated)
+    return decorated